@@ -0,0 +1,105 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the response size and latency of the change requests made by
+query_changes and get_change_details with the options they used to request
+and with the options derived from their field masks.
+
+This talks to a real Gerrit host, using the server's configuration. Run from
+the repository root:
+
+    python -m benchmarks.bench_field_masks --query "status:merged" --change 12345
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List, Optional
+from urllib.parse import quote
+
+from gerrit_mcp_server import main
+
+
+async def measure(url: str, base_url: str, repeat: int) -> tuple:
+    """Returns the response size in bytes and the best of `repeat` latencies."""
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(await main._exec_curl([url], base_url))
+        timings.append(time.perf_counter() - start)
+    return size, min(timings)
+
+
+def option_params(options) -> str:
+    return "".join(f"&o={option}" for option in options)
+
+
+async def run(base_url: str, query: str, limit: int, change: Optional[str], repeat: int):
+    cases: List[tuple] = [
+        (
+            f"query_changes ({limit} changes)",
+            f"{base_url}/changes/?q={quote(query)}&n={limit}",
+            f"{base_url}/changes/?q={quote(query)}&n={limit}"
+            + option_params(main._QUERY_CHANGES_FIELDS.options()),
+        ),
+        (
+            f"sync_local_change_index ({limit} changes)",
+            f"{base_url}/changes/?q={quote(query)}&n={limit}"
+            + option_params(("CURRENT_REVISION", "CURRENT_COMMIT", "DETAILED_ACCOUNTS")),
+            f"{base_url}/changes/?q={quote(query)}&n={limit}"
+            + option_params(main._CHANGE_INDEX_FIELDS.options()),
+        ),
+    ]
+    if change:
+        cases.append(
+            (
+                f"get_change_details ({change})",
+                f"{base_url}/changes/{change}/detail?"
+                + option_params(("CURRENT_REVISION", "CURRENT_COMMIT", "DETAILED_LABELS"))[1:],
+                f"{base_url}/changes/{change}?"
+                + option_params(main._CHANGE_DETAILS_FIELDS.options())[1:],
+            )
+        )
+
+    print(f"{'request':<40} {'before (B)':>11} {'after (B)':>10} {'saved':>6} {'before (ms)':>12} {'after (ms)':>11}")
+    for name, before_url, after_url in cases:
+        before_size, before_time = await measure(before_url, base_url, repeat)
+        after_size, after_time = await measure(after_url, base_url, repeat)
+        saved = 1 - after_size / before_size if before_size else 0.0
+        print(
+            f"{name:<40} {before_size:>11} {after_size:>10} {saved:>6.0%} "
+            f"{before_time * 1000:>12.1f} {after_time * 1000:>11.1f}"
+        )
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--gerrit-base-url", default=None)
+    parser.add_argument("--query", default="status:merged")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--change", default=None, help="A change to fetch details of.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    config = main.load_gerrit_config()
+    base_url = main._normalize_gerrit_url(
+        main._get_gerrit_base_url(args.gerrit_base_url), config.get("gerrit_hosts", [])
+    )
+    asyncio.run(run(base_url, args.query, args.limit, args.change, args.repeat))
+
+
+if __name__ == "__main__":
+    main_benchmark()
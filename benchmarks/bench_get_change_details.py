@@ -0,0 +1,117 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmarks the reviewer/vote rendering of get_change_details on synthetic CLs
+with large reviewer lists and many labels.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_get_change_details
+"""
+
+import asyncio
+import json
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+os.environ.setdefault("GERRIT_CONFIG_PATH", "tests/test_config.json")
+
+from gerrit_mcp_server import main  # noqa: E402
+
+
+def make_change(reviewers: int, labels: int) -> dict:
+    """Builds a ChangeInfo where every reviewer voted on every label."""
+    accounts = [
+        {"_account_id": 1000 + i, "email": f"reviewer{i}@example.com"}
+        for i in range(reviewers)
+    ]
+    return {
+        "_number": 1,
+        "subject": "Synthetic change",
+        "owner": {"_account_id": 1, "email": "owner@example.com"},
+        "status": "NEW",
+        "reviewers": {"REVIEWER": accounts},
+        "labels": {
+            f"Label-{j}": {
+                "all": [
+                    {"_account_id": a["_account_id"], "value": (i + j) % 5 - 2}
+                    for i, a in enumerate(accounts)
+                ]
+            }
+            for j in range(labels)
+        },
+    }
+
+
+def nested_loop_votes(details: dict) -> list:
+    """The reviewer x label x vote scan that _index_votes_by_account replaced."""
+    rendered = []
+    for reviewer in details["reviewers"]["REVIEWER"]:
+        votes = []
+        for label, info in details["labels"].items():
+            for vote in info.get("all", []):
+                if vote.get("_account_id") == reviewer.get("_account_id"):
+                    value = vote.get("value", 0)
+                    votes.append(f"{label}: {f'+{value}' if value > 0 else value}")
+        rendered.append(votes)
+    return rendered
+
+
+def indexed_votes(details: dict) -> list:
+    votes_by_account = main._index_votes_by_account(details["labels"])
+    return [
+        votes_by_account.get(r["_account_id"], [])
+        for r in details["reviewers"]["REVIEWER"]
+    ]
+
+
+def best_of(func, *args, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def time_tool(details: dict, repeat: int = 5) -> float:
+    payload = json.dumps(details)
+    timings = []
+    with patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock) as mock_run_curl:
+        mock_run_curl.return_value = payload
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await main.get_change_details("1", gerrit_base_url="https://bench.example.com")
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main_benchmark():
+    print(f"{'reviewers':>9} {'labels':>6} {'nested (ms)':>12} {'indexed (ms)':>13} {'tool (ms)':>10}")
+    for reviewers, labels in [(10, 5), (100, 12), (300, 24), (500, 40)]:
+        details = make_change(reviewers, labels)
+        assert nested_loop_votes(details) == indexed_votes(details)
+        nested = best_of(nested_loop_votes, details, repeat=3)
+        indexed = best_of(indexed_votes, details)
+        tool = asyncio.run(time_tool(details))
+        print(
+            f"{reviewers:>9} {labels:>6} {nested * 1000:>12.2f} "
+            f"{indexed * 1000:>13.2f} {tool * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main_benchmark()
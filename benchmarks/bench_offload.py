@@ -0,0 +1,119 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures how long the event loop stalls while a large response is parsed,
+base64-decoded or rendered inline, in a thread pool and in a process pool.
+
+A ticker that should wake up every millisecond runs next to the work; its
+longest delay is how long every other session would have waited. Run from
+the repository root:
+
+    python -m benchmarks.bench_offload --changes 20000
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import time
+
+os.environ.setdefault("GERRIT_CONFIG_PATH", "tests/test_config.json")
+
+from gerrit_mcp_server import json_codec, main  # noqa: E402
+from gerrit_mcp_server.offload import Offloader  # noqa: E402
+
+
+def make_changes(count: int) -> list:
+    return [
+        {
+            "_number": n,
+            "subject": f"Change {n} " + "x" * 60,
+            "work_in_progress": n % 7 == 0,
+            "updated": "2025-01-01 00:00:00.000000000",
+            "owner": {"_account_id": 1000 + n % 50},
+        }
+        for n in range(count)
+    ]
+
+
+async def worst_stall(work) -> tuple:
+    """Runs work next to a 1 ms ticker; returns its duration and the ticker's longest delay."""
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stall = max(stall, time.perf_counter() - before - 0.001)
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticking
+    return elapsed, stall
+
+
+async def run(count: int):
+    changes = make_changes(count)
+    body = (")]}'\n" + json.dumps(changes)).encode("utf-8")
+    encoded = base64.b64encode(body).decode("ascii")
+    cases = [
+        ("parse", body, json_codec.loads),
+        ("decode", encoded, json_codec.decode_base64_text),
+    ]
+    print(f"{'work':<8} {'size (KiB)':>10} {'mode':<8} {'time (ms)':>10} {'stall (ms)':>11}")
+    for mode in ("inline", "thread", "process"):
+        offloader = Offloader(
+            threshold_bytes=1 << 62 if mode == "inline" else 0,
+            executor="thread" if mode == "inline" else mode,
+            max_workers=1,
+        )
+        # Start the pool outside the measurement.
+        await offloader.run("parse", 2, json_codec.loads, "{}")
+        try:
+            for kind, data, func in cases:
+                elapsed, stall = await worst_stall(lambda: offloader.run(kind, len(data), func, data))
+                print(
+                    f"{kind:<8} {len(data) // 1024:>10} {mode:<8} "
+                    f"{elapsed * 1000:>10.1f} {stall * 1000:>11.1f}"
+                )
+            if mode != "process":
+                # The renderers live in the server module and run on threads.
+                elapsed, stall = await worst_stall(
+                    lambda: offloader.run("render", len(body), main._format_change_list, changes, "q")
+                )
+                print(
+                    f"{'render':<8} {len(body) // 1024:>10} {mode:<8} "
+                    f"{elapsed * 1000:>10.1f} {stall * 1000:>11.1f}"
+                )
+        finally:
+            offloader.shutdown()
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--changes", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.changes))
+
+
+if __name__ == "__main__":
+    main_benchmark()
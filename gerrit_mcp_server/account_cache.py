@@ -0,0 +1,195 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module caches Gerrit accounts per host so that tools can render names and
+emails for accounts that a response only references by `_account_id`.
+
+The cache is seeded from every response that contains account information and
+fills the remaining gaps with a single batched lookup. With a SharedStore, the
+accounts learned by one server worker are visible to every other worker.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from gerrit_mcp_server.shared_store import SharedStore
+
+FetchAccounts = Callable[[str, List[int]], Awaitable[List[Dict[str, Any]]]]
+
+_IDENTITY_FIELDS = ("name", "email", "username", "display_name")
+
+
+def iter_accounts(payload: Any) -> Iterable[Dict[str, Any]]:
+    """Yields every AccountInfo-like dict nested anywhere in a response."""
+    stack = [payload]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if "_account_id" in item:
+                yield item
+            stack.extend(v for v in item.values() if isinstance(v, (dict, list)))
+        elif isinstance(item, list):
+            stack.extend(v for v in item if isinstance(v, (dict, list)))
+
+
+class AccountCache:
+    """Accounts per host, looked up by `_account_id`, email or username."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600.0,
+        max_entries_per_host: int = 10000,
+        store: Optional[SharedStore] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_host = max_entries_per_host
+        self.store = store
+        self._accounts: Dict[str, Dict[int, tuple]] = {}
+        self._aliases: Dict[str, Dict[str, int]] = {}
+        self._in_flight: Dict[tuple, asyncio.Future] = {}
+
+    def put(self, host: str, account: Dict[str, Any]):
+        """Stores an account, merging it with what is already known about it."""
+        merged = self._put(host, account)
+        if merged is not None and self.store is not None:
+            self.store.set(_namespace(host), str(merged["_account_id"]), merged, self.ttl_seconds)
+
+    def _put(self, host: str, account: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Stores an account in memory; returns it if anything new was learned."""
+        account_id = account.get("_account_id")
+        if account_id is None or not any(account.get(f) for f in _IDENTITY_FIELDS):
+            return None
+        accounts = self._accounts.setdefault(host, {})
+        aliases = self._aliases.setdefault(host, {})
+        known = self._lookup(host, account_id)
+        merged = dict(known) if known else {}
+        merged["_account_id"] = account_id
+        merged.update({f: account[f] for f in _IDENTITY_FIELDS if account.get(f)})
+        accounts[account_id] = (time.monotonic() + self.ttl_seconds, merged)
+        for field in ("email", "username"):
+            if merged.get(field):
+                aliases[merged[field].lower()] = account_id
+        if len(accounts) > self.max_entries_per_host:
+            # Dicts keep insertion order, so the first entry is the oldest.
+            oldest = next(iter(accounts))
+            del accounts[oldest]
+        return merged if merged != known else None
+
+    def seed(self, host: str, payload: Any):
+        """Caches every account found in a Gerrit response."""
+        learned = {}
+        for account in iter_accounts(payload):
+            merged = self._put(host, account)
+            if merged is not None:
+                learned[str(merged["_account_id"])] = merged
+        if learned and self.store is not None:
+            self.store.set_many(_namespace(host), learned, self.ttl_seconds)
+
+    def get(self, host: str, key: Union[int, str]) -> Optional[Dict[str, Any]]:
+        """Looks up an account by `_account_id`, email or username."""
+        if isinstance(key, str):
+            if key.isdigit():
+                key = int(key)
+            else:
+                key = self._aliases.get(host, {}).get(key.lower())
+                if key is None:
+                    return None
+        return self._lookup(host, key)
+
+    def _lookup(self, host: str, account_id: int) -> Optional[Dict[str, Any]]:
+        entry = self._accounts.get(host, {}).get(account_id)
+        if entry is None:
+            return None
+        expires, account = entry
+        if time.monotonic() > expires:
+            del self._accounts[host][account_id]
+            return None
+        return account
+
+    async def resolve(
+        self, host: str, account_ids: Iterable[int], fetch: FetchAccounts
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Returns the accounts for the given IDs, fetching all cache misses in a
+        single batch. Lookups already in flight for another caller are shared.
+        """
+        wanted = set(account_ids)
+        resolved = {}
+        waiting = []
+        missing = []
+        for account_id in wanted:
+            account = self._lookup(host, account_id)
+            if account is not None:
+                resolved[account_id] = account
+            elif (host, account_id) in self._in_flight:
+                waiting.append(self._in_flight[(host, account_id)])
+            else:
+                missing.append(account_id)
+
+        if missing and self.store is not None:
+            # Another worker may already have looked these accounts up.
+            shared = self.store.get_many(_namespace(host), [str(a) for a in missing])
+            for account in shared.values():
+                self._put(host, account)
+            missing = [a for a in missing if str(a) not in shared]
+
+        if missing:
+            future = asyncio.get_running_loop().create_future()
+            for account_id in missing:
+                self._in_flight[(host, account_id)] = future
+            try:
+                try:
+                    self.seed(host, await fetch(host, sorted(missing)))
+                except Exception:
+                    # Unresolved accounts are rendered with what the response had.
+                    pass
+            finally:
+                for account_id in missing:
+                    self._in_flight.pop((host, account_id), None)
+                future.set_result(None)
+        if waiting:
+            await asyncio.gather(*waiting)
+
+        for account_id in wanted:
+            account = self._lookup(host, account_id)
+            if account is not None:
+                resolved[account_id] = account
+        return resolved
+
+    async def fill_in(self, host: str, payload: Any, fetch: FetchAccounts):
+        """
+        Seeds the cache from a response and then completes, in place, every
+        account in it that only carries an `_account_id`.
+        """
+        accounts = list(iter_accounts(payload))
+        self.seed(host, accounts)
+        lean = [a for a in accounts if not any(a.get(f) for f in _IDENTITY_FIELDS)]
+        if not lean:
+            return
+        resolved = await self.resolve(host, [a["_account_id"] for a in lean], fetch)
+        for account in lean:
+            for field, value in resolved.get(account["_account_id"], {}).items():
+                account.setdefault(field, value)
+
+    def invalidate_host(self, host: str):
+        self._accounts.pop(host, None)
+        self._aliases.pop(host, None)
+        if self.store is not None:
+            self.store.delete_namespace(_namespace(host))
+
+
+def _namespace(host: str) -> str:
+    return f"accounts:{host}"
@@ -0,0 +1,125 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module limits how much work the server takes on at once.
+
+Every tool call is admitted against a shared capacity according to its cost,
+so that a burst of agent traffic queues up instead of spawning an unbounded
+number of curl processes. Calls are admitted in arrival order. When the queue
+is full, or a call has waited too long, it fails fast with an `Overloaded`
+error that tells the caller to retry.
+"""
+
+import asyncio
+import collections
+import contextlib
+import time
+from typing import AsyncIterator, Deque, Optional, Tuple
+
+from gerrit_mcp_server import metrics
+
+
+class Overloaded(Exception):
+    """Raised when a call cannot be admitted; the call can be retried later."""
+
+    def __init__(self, reason: str, retry_after_seconds: float):
+        super().__init__(
+            f"The server is overloaded ({reason}). This is temporary: "
+            f"retry the call in {retry_after_seconds:g} seconds."
+        )
+        self.retry_after_seconds = retry_after_seconds
+
+
+class AdmissionController:
+    """A weighted, first-come first-served limit on concurrent work."""
+
+    def __init__(
+        self,
+        capacity: int = 16,
+        max_queue: int = 64,
+        queue_timeout_seconds: Optional[float] = 30.0,
+        retry_after_seconds: float = 5.0,
+    ):
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.in_use = 0
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = collections.deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @contextlib.asynccontextmanager
+    async def admit(self, name: str, cost: int = 1) -> AsyncIterator[None]:
+        """Holds `cost` units of capacity for the duration of the block."""
+        # A call costlier than the whole capacity still runs, just on its own.
+        cost = max(1, min(cost, self.capacity))
+        start = time.monotonic()
+        await self._acquire(name, cost)
+        waited = time.monotonic() - start
+        metrics.observe("admission.queue_wait", waited)
+        metrics.observe(f"admission.queue_wait.{name}", waited)
+        metrics.increment("admission.admitted")
+        try:
+            yield
+        finally:
+            self._release(cost)
+
+    async def _acquire(self, name: str, cost: int):
+        if not self._waiters and self.in_use + cost <= self.capacity:
+            self.in_use += cost
+            self._update_gauges()
+            return
+        if len(self._waiters) >= self.max_queue:
+            metrics.increment("admission.rejected")
+            metrics.increment(f"admission.rejected.{name}")
+            raise Overloaded("the request queue is full", self.retry_after_seconds)
+
+        entry = (cost, asyncio.get_running_loop().create_future())
+        self._waiters.append(entry)
+        self._update_gauges()
+        try:
+            await asyncio.wait_for(entry[1], self.queue_timeout_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if entry[1].done() and not entry[1].cancelled():
+                # Capacity was granted just as the wait ended; hand it back.
+                self._release(cost)
+            else:
+                self._waiters.remove(entry)
+                self._wake()
+            if isinstance(e, asyncio.TimeoutError):
+                metrics.increment("admission.rejected")
+                metrics.increment(f"admission.rejected.{name}")
+                raise Overloaded("timed out waiting in the queue", self.retry_after_seconds)
+            raise
+
+    def _release(self, cost: int):
+        self.in_use -= cost
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_use + self._waiters[0][0] <= self.capacity:
+            cost, future = self._waiters.popleft()
+            if future.done():
+                continue
+            self.in_use += cost
+            future.set_result(None)
+        self._update_gauges()
+
+    def _update_gauges(self):
+        metrics.set_gauge("admission.in_use", self.in_use)
+        metrics.set_gauge("admission.queued", len(self._waiters))
@@ -0,0 +1,315 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module applies one action to many changes: abandoning stale CLs, setting
+a topic across a stack, marking a batch WIP or ready, voting on all of them or
+adding the same reviewers to each.
+
+Actions describe the Gerrit request for one change and how to read its
+response. The engine sends them in batches of bounded size, each through a
+single curl process, behind a per-host rate limiter. It records every
+outcome in a checkpoint file after each batch, so that running the same job
+again only retries the changes that did not succeed.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from gerrit_mcp_server import json_codec, reviewer_batch
+
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+ExecuteBatch = Callable[[List[str]], Awaitable[List[Tuple[bool, str]]]]
+
+
+class BulkAction:
+    """How to apply an action to one change and how to judge the response."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        request: Callable[[str, str, Dict[str, Any]], Request],
+        check: Callable[[str], Optional[str]],
+        required: Tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.description = description
+        self.request = request
+        self.check = check
+        self.required = required
+
+
+def _parse(response: str) -> Any:
+    try:
+        return json_codec.loads(response) if response else None
+    except json_codec.JSONDecodeError:
+        return response
+
+
+def _expect_empty(response: str) -> Optional[str]:
+    return None if not response else f"Response: {response}"
+
+
+def _check_abandoned(response: str) -> Optional[str]:
+    info = _parse(response)
+    if isinstance(info, dict) and info.get("status") == "ABANDONED":
+        return None
+    return f"Response: {response}"
+
+
+def _check_topic(response: str) -> Optional[str]:
+    return None if not response or isinstance(_parse(response), str) else f"Response: {response}"
+
+
+def _check_review(response: str) -> Optional[str]:
+    info = _parse(response)
+    if isinstance(info, dict) and "error" not in info:
+        return None
+    return f"Response: {response}"
+
+
+def _review_payload(params: Dict[str, Any]) -> Dict[str, Any]:
+    payload = {}
+    if params.get("message"):
+        payload["message"] = params["message"]
+    if params.get("labels"):
+        payload["labels"] = params["labels"]
+    if not payload:
+        raise ValueError("a message or labels are required.")
+    return payload
+
+
+def _message_payload(params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return {"message": params["message"]} if params.get("message") else None
+
+
+ACTIONS: Dict[str, BulkAction] = {}
+
+
+def register_action(action: BulkAction):
+    ACTIONS[action.name] = action
+
+
+register_action(
+    BulkAction(
+        "abandon",
+        "Abandon",
+        lambda base, change, params: ("POST", f"{base}/changes/{change}/abandon", _message_payload(params)),
+        _check_abandoned,
+    )
+)
+register_action(
+    BulkAction(
+        "set_topic",
+        "Set the topic of",
+        lambda base, change, params: ("PUT", f"{base}/changes/{change}/topic", {"topic": params["topic"]}),
+        _check_topic,
+        required=("topic",),
+    )
+)
+register_action(
+    BulkAction(
+        "set_work_in_progress",
+        "Mark as work-in-progress",
+        lambda base, change, params: ("POST", f"{base}/changes/{change}/wip", _message_payload(params)),
+        _expect_empty,
+    )
+)
+register_action(
+    BulkAction(
+        "set_ready_for_review",
+        "Mark as ready for review",
+        lambda base, change, params: ("POST", f"{base}/changes/{change}/ready", _message_payload(params)),
+        _expect_empty,
+    )
+)
+register_action(
+    BulkAction(
+        "review",
+        "Post a review on",
+        lambda base, change, params: (
+            "POST",
+            f"{base}/changes/{change}/revisions/current/review",
+            _review_payload(params),
+        ),
+        _check_review,
+    )
+)
+register_action(
+    BulkAction(
+        "add_reviewers",
+        "Add reviewers to",
+        lambda base, change, params: (
+            "POST",
+            f"{base}/changes/{change}/revisions/current/review",
+            reviewer_batch.review_input(params.get("reviewers"), params.get("ccs"), params.get("notify")),
+        ),
+        lambda response: reviewer_batch.check_result(_parse(response)),
+    )
+)
+
+
+def job_id_for(base_url: str, action: str, params: Dict[str, Any], selector: Dict[str, Any]) -> str:
+    """Returns a stable identifier of a bulk job, used to find its checkpoint."""
+    key = json.dumps([base_url, action, params, selector], sort_keys=True)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+class RateLimiter:
+    """A token bucket that spaces out requests to one host."""
+
+    def __init__(self, rate_per_second: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+
+
+class RateLimiters:
+    """Rate limiters by host, created on first use with shared settings."""
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._limiters: Dict[str, RateLimiter] = {}
+
+    def get(self, host: str) -> RateLimiter:
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = RateLimiter(self.rate_per_second, self.burst)
+            self._limiters[host] = limiter
+        return limiter
+
+
+class Checkpoint:
+    """The targets and per-change outcomes of a bulk job, kept in a JSON file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.targets: Optional[List[str]] = None
+        self.outcomes: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                state = json.load(f)
+            self.targets = state.get("targets")
+            self.outcomes = state.get("outcomes", {})
+
+    def record(self, change_id: str, ok: bool, detail: str):
+        self.record_many([(change_id, ok, detail)])
+
+    def record_many(self, outcomes: List[Tuple[str, bool, str]]):
+        """Records the outcomes of several changes and saves them once."""
+        for change_id, ok, detail in outcomes:
+            self.outcomes[change_id] = {"ok": ok, "detail": detail}
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"targets": self.targets, "outcomes": self.outcomes}, f)
+        os.replace(temp_path, self.path)
+
+    def delete(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Outcome:
+    def __init__(self, change_id: str, ok: bool, detail: str, resumed: bool = False):
+        self.change_id = change_id
+        self.ok = ok
+        self.detail = detail
+        self.resumed = resumed
+
+
+async def run_bulk(
+    targets: List[str],
+    execute_batch: ExecuteBatch,
+    batch_size: int = 4,
+    checkpoint: Optional[Checkpoint] = None,
+) -> List[Outcome]:
+    """
+    Runs execute_batch for the targets, at most `batch_size` at a time, and
+    returns the outcomes in target order. execute_batch returns whether each
+    change succeeded and why not. Targets that already succeeded according to
+    the checkpoint are not run again.
+    """
+    outcomes: Dict[str, Outcome] = {}
+    pending = []
+    for change_id in targets:
+        done = checkpoint.outcomes.get(change_id) if checkpoint else None
+        if done and done.get("ok"):
+            outcomes[change_id] = Outcome(change_id, True, done.get("detail", ""), resumed=True)
+        else:
+            pending.append(change_id)
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start : start + batch_size]
+        try:
+            results = await execute_batch(batch)
+        except Exception as e:
+            results = [(False, str(e))] * len(batch)
+        recorded = [(change_id, ok, detail) for change_id, (ok, detail) in zip(batch, results)]
+        for change_id, ok, detail in recorded:
+            outcomes[change_id] = Outcome(change_id, ok, detail)
+        if checkpoint is not None:
+            checkpoint.record_many(recorded)
+    return [outcomes[change_id] for change_id in targets]
+
+
+def format_plan(action: BulkAction, changes: List[Dict[str, Any]], job_id: str) -> str:
+    output = f"Dry run of bulk job {job_id}: {action.description} {len(changes)} CL(s).\n"
+    for change in changes:
+        output += f"- {change.get('_number')}: {change.get('subject', '')}\n"
+    return output
+
+
+def format_outcomes(action: BulkAction, outcomes: List[Outcome], job_id: str) -> str:
+    succeeded = sum(1 for o in outcomes if o.ok and not o.resumed)
+    resumed = sum(1 for o in outcomes if o.resumed)
+    failed = sum(1 for o in outcomes if not o.ok)
+    output = (
+        f"Bulk job {job_id}: {action.description} {len(outcomes)} CL(s). "
+        f"{succeeded} succeeded, {failed} failed, {resumed} already done.\n"
+    )
+    for outcome in outcomes:
+        if outcome.resumed:
+            status = "OK (already done)"
+        elif outcome.ok:
+            status = "OK"
+        else:
+            status = f"FAILED: {outcome.detail}"
+        output += f"- {outcome.change_id}: {status}\n"
+    if failed:
+        output += "Run the same job again to retry the failed CLs.\n"
+    return output
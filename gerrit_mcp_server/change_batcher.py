@@ -0,0 +1,133 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module merges concurrent single-change lookups into one change query.
+
+Lookups for the same host and options that arrive within a short window are
+collected and sent as a single `change:A OR change:B ...` query; the results
+are then handed back to each waiting caller. A change the query does not
+return unambiguously is looked up on its own, so callers see the same result
+(or error) they would have seen without batching.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+ChangeInfo = Dict[str, Any]
+BatchKey = Tuple[str, Tuple[str, ...], bool]
+FetchBatch = Callable[[str, List[str], Tuple[str, ...], bool], Awaitable[List[ChangeInfo]]]
+FetchOne = Callable[[str, str, Tuple[str, ...], bool], Awaitable[ChangeInfo]]
+
+
+def matches(change_id: str, change: ChangeInfo) -> bool:
+    """Returns True if a ChangeInfo is the change a change identifier names."""
+    if change_id.isdigit():
+        return str(change.get("_number")) == change_id
+    if "~" in change_id:
+        parts = change_id.split("~")
+        if len(parts) == 2 and parts[1].isdigit():
+            return change.get("project") == parts[0] and str(change.get("_number")) == parts[1]
+        return change.get("id") == change_id
+    return change.get("change_id") == change_id
+
+
+class _Batch:
+    def __init__(self):
+        self.waiters: Dict[str, List[asyncio.Future]] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class ChangeBatcher:
+    """Collects single-change lookups and resolves them with batched queries."""
+
+    def __init__(
+        self,
+        fetch_batch: FetchBatch,
+        fetch_one: FetchOne,
+        window_seconds: float = 0.005,
+        max_batch_size: int = 25,
+    ):
+        self._fetch_batch = fetch_batch
+        self._fetch_one = fetch_one
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[BatchKey, _Batch] = {}
+        self._tasks = set()
+
+    async def get(
+        self, host: str, change_id: str, options: Tuple[str, ...] = (), detail: bool = False
+    ) -> ChangeInfo:
+        """Returns the ChangeInfo of one change, possibly fetched in a batch."""
+        key = (host, tuple(sorted(set(options))), detail)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _Batch()
+            self._pending[key] = batch
+            batch.timer = asyncio.get_running_loop().call_later(
+                self.window_seconds, self._start_flush, key, batch
+            )
+        future = asyncio.get_running_loop().create_future()
+        batch.waiters.setdefault(change_id, []).append(future)
+        if len(batch.waiters) >= self.max_batch_size:
+            self._start_flush(key, batch)
+        return await future
+
+    def _start_flush(self, key: BatchKey, batch: _Batch):
+        if self._pending.get(key) is not batch:
+            return
+        del self._pending[key]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._flush(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, key: BatchKey, batch: _Batch):
+        host, options, detail = key
+        change_ids = list(batch.waiters)
+        found: Dict[str, ChangeInfo] = {}
+        if len(change_ids) > 1:
+            try:
+                changes = await self._fetch_batch(host, change_ids, options, detail)
+            except Exception as e:
+                for futures in batch.waiters.values():
+                    _resolve(futures, exception=e)
+                return
+            for change_id in change_ids:
+                candidates = [c for c in changes if matches(change_id, c)]
+                if len(candidates) == 1:
+                    found[change_id] = candidates[0]
+
+        async def fetch_alone(change_id: str):
+            try:
+                _resolve(batch.waiters[change_id], await self._fetch_one(host, change_id, options, detail))
+            except Exception as e:
+                _resolve(batch.waiters[change_id], exception=e)
+
+        for change_id, change in found.items():
+            _resolve(batch.waiters[change_id], change)
+        # Not found, or ambiguous (e.g. a Change-Id on several branches): ask
+        # for these one by one, which also yields Gerrit's own error.
+        await asyncio.gather(*(fetch_alone(c) for c in change_ids if c not in found))
+
+
+def _resolve(futures: List[asyncio.Future], result: Any = None, exception: Optional[Exception] = None):
+    for future in futures:
+        if future.done():
+            continue
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
@@ -0,0 +1,211 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module caches the graph around a change: its relation chain, the changes
+that would be submitted together with it and the other changes of its topic.
+
+The edges of a change are keyed by its current revision. Whenever a member of
+a cached group is seen at a new revision (a rebase or a new patch set may
+reorder the chain), every group containing it is dropped and fetched again.
+Edges also expire after a TTL, since changes join or leave a topic or the
+submitted-together set without any revision changing.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class StackEdges:
+    """The changes a change is connected to, by change number."""
+
+    def __init__(
+        self,
+        related: List[str],
+        submitted_together: List[str],
+        topic: List[str],
+        non_visible: int = 0,
+        outdated: Optional[List[str]] = None,
+    ):
+        # The relation chain, from the bottom of the stack up.
+        self.related = related
+        self.submitted_together = submitted_together
+        self.topic = topic
+        self.non_visible = non_visible
+        # Members whose relation chain entry is not their current patch set.
+        self.outdated = outdated or []
+
+    def members(self) -> List[str]:
+        """All connected changes, in chain order first, without duplicates."""
+        return list(dict.fromkeys(self.related + self.submitted_together + self.topic))
+
+
+def parse_related(response: Any) -> Tuple[List[str], List[str]]:
+    """
+    Returns the relation chain of a /related response from the bottom up, and
+    the members whose listed patch set is not their current one.
+    """
+    entries = response.get("changes", []) if isinstance(response, dict) else []
+    chain = []
+    outdated = []
+    for entry in reversed(entries):
+        number = entry.get("_change_number")
+        if number is None:
+            continue
+        chain.append(str(number))
+        current = entry.get("_current_revision_number")
+        if current is not None and entry.get("_revision_number") != current:
+            outdated.append(str(number))
+    return chain, outdated
+
+
+def parse_submitted_together(response: Any) -> Tuple[List[Dict[str, Any]], int]:
+    """Returns the changes and the number of non-visible changes of a /submitted_together response."""
+    if isinstance(response, dict):
+        return response.get("changes", []), response.get("non_visible_changes", 0)
+    return response or [], 0
+
+
+class ChangeGraph:
+    """Cached stack edges per (host, change number), least recently used first."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        max_revisions: int = 4096,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_revisions = max_revisions
+        self._clock = clock
+        self._edges: "OrderedDict[Hashable, Tuple[str, float, StackEdges]]" = OrderedDict()
+        # The last seen revision of every change, least recently seen first. A
+        # change that is forgotten only misses an early invalidation; its
+        # groups still expire after the TTL.
+        self._revisions: "OrderedDict[Hashable, str]" = OrderedDict()
+
+    def get(self, host: str, number: str, revision: Optional[str]) -> Optional[StackEdges]:
+        """Returns the unexpired cached edges of a change, if they were computed at this revision."""
+        key = (host, number)
+        entry = self._edges.get(key)
+        if entry is None or entry[0] != revision:
+            return None
+        if entry[1] <= self._clock():
+            del self._edges[key]
+            return None
+        self._edges.move_to_end(key)
+        return entry[2]
+
+    def put(self, host: str, number: str, revision: str, edges: StackEdges):
+        self._edges[(host, number)] = (revision, self._clock() + self.ttl_seconds, edges)
+        self._edges.move_to_end((host, number))
+        while len(self._edges) > self.max_entries:
+            self._edges.popitem(last=False)
+
+    def observe(self, host: str, number: str, revision: Optional[str]) -> bool:
+        """
+        Records the current revision of a change. Returns True, after dropping
+        every cached group that contains the change, if it moved to a new
+        revision since it was last seen.
+        """
+        if revision is None:
+            return False
+        key = (host, number)
+        known = self._revisions.pop(key, None)
+        self._revisions[key] = revision
+        while len(self._revisions) > self.max_revisions:
+            self._revisions.popitem(last=False)
+        if known is None or known == revision:
+            return False
+        for edge_key, (_, _, edges) in list(self._edges.items()):
+            if edge_key[0] == host and (edge_key[1] == number or number in edges.members()):
+                del self._edges[edge_key]
+        return True
+
+    def invalidate_host(self, host: str):
+        for key in [k for k in self._edges if k[0] == host]:
+            del self._edges[key]
+        for key in [k for k in self._revisions if k[0] == host]:
+            del self._revisions[key]
+
+
+def _label_states(change: Dict[str, Any]) -> List[Tuple[str, str]]:
+    states = []
+    for name, label in sorted((change.get("labels") or {}).items()):
+        if label.get("rejected"):
+            states.append((name, "rejected"))
+        elif label.get("approved"):
+            states.append((name, "approved"))
+        elif not label.get("optional"):
+            states.append((name, "missing"))
+    return states
+
+
+def _blockers(change: Dict[str, Any], outdated: bool) -> List[str]:
+    blockers = [f"{name} {state}" for name, state in _label_states(change) if state != "approved"]
+    if change.get("work_in_progress"):
+        blockers.append("work in progress")
+    if outdated:
+        blockers.append("needs rebase")
+    if not blockers and change.get("submittable") is False:
+        blockers.append("not submittable")
+    return blockers
+
+
+def format_stack(
+    change_id: str, edges: StackEdges, changes: Dict[str, Dict[str, Any]], topic: Optional[str] = None
+) -> str:
+    """Renders every member's state and whether the whole stack is ready."""
+    members = edges.members() or [change_id]
+    output = (
+        f"Stack of {len(members)} CL(s) around CL {change_id} "
+        f"(relation chain: {len(edges.related)}, submitted together: "
+        f"{len(edges.submitted_together)}"
+    )
+    if topic:
+        output += f", topic '{topic}': {len(edges.topic)}"
+    output += "):\n"
+    blocking = []
+    open_count = 0
+    for number in members:
+        change = changes.get(number)
+        if change is None:
+            output += f"- {number}: not visible\n"
+            continue
+        status = change.get("status", "UNKNOWN")
+        line = f"- {number} [{status}] {change.get('subject', '')}"
+        if status == "NEW":
+            open_count += 1
+            labels = ", ".join(f"{name} {state}" for name, state in _label_states(change))
+            if labels:
+                line += f": {labels}"
+            blockers = _blockers(change, number in edges.outdated)
+            if blockers:
+                blocking.append(f"{number} ({', '.join(blockers)})")
+                line += f"; blocked: {', '.join(blockers)}"
+            else:
+                line += "; ready"
+        output += line + "\n"
+    if edges.non_visible:
+        output += f"Plus {edges.non_visible} changes that are not visible to you.\n"
+    if not open_count:
+        output += "No open CLs in the stack.\n"
+    elif blocking:
+        output += f"{open_count - len(blocking)} of {open_count} open CL(s) are ready. Blocking: {'; '.join(blocking)}\n"
+    else:
+        output += f"All {open_count} open CL(s) are approved and ready.\n"
+    return output
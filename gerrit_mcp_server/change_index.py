@@ -0,0 +1,221 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module maintains an optional local SQLite index of change metadata so that
+date-range queries over settled history can be answered without Gerrit.
+
+The index is synced incrementally per host: each sync only fetches the changes
+updated since the newest `updated` timestamp seen by the previous sync. A long
+sync saves its cursor as it goes, so that it can be resumed and the history
+it already fetched can be served before it finishes. Commit
+messages and subjects are searchable through FTS5 when the SQLite build
+supports it, and through LIKE otherwise.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Statuses whose changes are no longer expected to move between date ranges.
+SETTLED_STATUSES = {
+    "merged": ("MERGED",),
+    "abandoned": ("ABANDONED",),
+    "closed": ("MERGED", "ABANDONED"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    host TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    project TEXT,
+    branch TEXT,
+    subject TEXT,
+    message TEXT,
+    owner TEXT,
+    status TEXT,
+    created TEXT,
+    updated TEXT,
+    work_in_progress INTEGER,
+    PRIMARY KEY (host, number)
+);
+CREATE INDEX IF NOT EXISTS changes_by_updated ON changes (host, updated);
+CREATE TABLE IF NOT EXISTS sync_state (
+    host TEXT PRIMARY KEY,
+    sync_since TEXT NOT NULL,
+    cursor TEXT,
+    synced_at REAL
+);
+"""
+
+
+def change_row(host: str, change: Dict[str, Any]) -> Dict[str, Any]:
+    """Flattens a ChangeInfo (with CURRENT_COMMIT) into an index row."""
+    message = ""
+    revision = change.get("revisions", {}).get(change.get("current_revision", ""), {})
+    if "commit" in revision:
+        message = revision["commit"].get("message", "")
+    owner = change.get("owner", {})
+    return {
+        "host": host,
+        "number": change["_number"],
+        "project": change.get("project"),
+        "branch": change.get("branch"),
+        "subject": change.get("subject", ""),
+        "message": message or change.get("subject", ""),
+        "owner": owner.get("email") or owner.get("username") or str(owner.get("_account_id", "")),
+        "status": change.get("status"),
+        "created": change.get("created"),
+        "updated": change.get("updated", ""),
+        "work_in_progress": 1 if change.get("work_in_progress") else 0,
+    }
+
+
+class LocalChangeIndex:
+    """A SQLite-backed index of change metadata for one or more hosts."""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+            try:
+                self._db.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS changes_fts USING fts5("
+                    "host UNINDEXED, number UNINDEXED, subject, message)"
+                )
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                self.has_fts = False
+
+    def close(self):
+        self._db.close()
+
+    def sync_state(self, host: str) -> Optional[Dict[str, Any]]:
+        row = self._db.execute(
+            "SELECT sync_since, cursor, synced_at FROM sync_state WHERE host = ?", (host,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def upsert_changes(self, host: str, changes: List[Dict[str, Any]]):
+        rows = [change_row(host, change) for change in changes]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO changes VALUES (:host, :number, :project, :branch, "
+                ":subject, :message, :owner, :status, :created, :updated, :work_in_progress)",
+                rows,
+            )
+            if self.has_fts:
+                self._db.executemany(
+                    "DELETE FROM changes_fts WHERE host = :host AND number = :number", rows
+                )
+                self._db.executemany(
+                    "INSERT INTO changes_fts (host, number, subject, message) "
+                    "VALUES (:host, :number, :subject, :message)",
+                    rows,
+                )
+
+    def save_cursor(self, host: str, sync_since: str, cursor: str):
+        """
+        Records the progress of a sync that is still running: every change
+        updated up to the cursor is indexed. The time of the last completed
+        sync is kept.
+        """
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO sync_state (host, sync_since, cursor) VALUES (?, ?, ?) "
+                "ON CONFLICT (host) DO UPDATE SET sync_since = excluded.sync_since, "
+                "cursor = excluded.cursor",
+                (host, sync_since, cursor),
+            )
+
+    def finish_sync(self, host: str, sync_since: str, cursor: Optional[str]):
+        """Records a completed sync; the cursor is the newest `updated` seen so far."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                (host, sync_since, cursor, time.time()),
+            )
+
+    def covers(self, host: str, status: str, start: str, end: str) -> bool:
+        """
+        Returns True if every change with the given status updated in [start, end)
+        is known locally: the range lies inside the synced window and the status
+        is a settled one.
+        """
+        state = self.sync_state(host)
+        if status.lower() not in SETTLED_STATUSES or not state or not state["cursor"]:
+            return False
+        return state["sync_since"] <= start and end <= state["cursor"]
+
+    def query(
+        self,
+        host: str,
+        status: str,
+        start: str,
+        end: str,
+        project: Optional[str] = None,
+        message_substring: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Returns matching changes as ChangeInfo-like dicts, newest first."""
+        statuses = SETTLED_STATUSES[status.lower()]
+        sql = (
+            "SELECT c.* FROM changes c WHERE c.host = ? AND c.updated >= ? AND c.updated < ? "
+            f"AND c.status IN ({', '.join('?' for _ in statuses)})"
+        )
+        params: List[Any] = [host, start, end, *statuses]
+        if project:
+            sql += " AND c.project = ?"
+            params.append(project)
+        if message_substring:
+            if self.has_fts:
+                phrase = message_substring.replace('"', '""')
+                sql += (
+                    " AND c.number IN (SELECT number FROM changes_fts "
+                    "WHERE changes_fts MATCH ? AND host = ?)"
+                )
+                params.extend([f'message : "{phrase}"', host])
+            else:
+                sql += " AND c.message LIKE ? ESCAPE '\\'"
+                escaped = (
+                    message_substring.replace("\\", "\\\\")
+                    .replace("%", "\\%")
+                    .replace("_", "\\_")
+                )
+                params.append(f"%{escaped}%")
+        sql += " ORDER BY c.updated DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [
+            {
+                "_number": row["number"],
+                "project": row["project"],
+                "branch": row["branch"],
+                "subject": row["subject"],
+                "owner": {"email": row["owner"]},
+                "status": row["status"],
+                "created": row["created"],
+                "updated": row["updated"],
+                "work_in_progress": bool(row["work_in_progress"]),
+            }
+            for row in self._db.execute(sql, params)
+        ]
@@ -0,0 +1,198 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module polls Gerrit on behalf of watchers of changes or queries, so that
+agents waiting for a vote or a reply are notified instead of busy-polling.
+
+Every distinct (host, query) pair has exactly one poller no matter how many
+sessions watch it. Pollers only ask Gerrit for changes updated since their
+last poll (`-age:`), back off while nothing happens and stop once their last
+subscriber is gone.
+"""
+
+import asyncio
+import hashlib
+import math
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+PollFunction = Callable[[str, str], Awaitable[List[Dict[str, Any]]]]
+NotifyFunction = Callable[[Any, str], Awaitable[None]]
+
+WATCH_URI_PREFIX = "gerrit-watch://"
+
+
+def watch_id_for(base_url: str, query: str) -> str:
+    """Returns a stable identifier for a (host, query) pair."""
+    return hashlib.sha1(f"{base_url}\n{query}".encode("utf-8")).hexdigest()[:16]
+
+
+class Watch:
+    """The shared polling state of one (host, query) pair."""
+
+    def __init__(self, base_url: str, query: str, min_interval: float):
+        self.id = watch_id_for(base_url, query)
+        self.uri = f"{WATCH_URI_PREFIX}{self.id}"
+        self.base_url = base_url
+        self.query = query
+        self.snapshot: Dict[int, Dict[str, Any]] = {}
+        self.subscribers = weakref.WeakSet()
+        self.interval = min_interval
+        self.polls = 0
+        self.last_polled: Optional[float] = None
+        self.last_changed: List[int] = []
+        self.last_error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class ChangeWatcher:
+    """Registers watches and runs one background poller per watch."""
+
+    def __init__(
+        self,
+        poll: PollFunction,
+        notify: NotifyFunction,
+        min_interval: float = 30.0,
+        max_interval: float = 600.0,
+        full_refresh_every: int = 10,
+    ):
+        self._poll = poll
+        self._notify = notify
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.full_refresh_every = full_refresh_every
+        self._watches: Dict[str, Watch] = {}
+
+    def get(self, watch_id: str) -> Optional[Watch]:
+        return self._watches.get(watch_id)
+
+    def watches(self) -> List[Watch]:
+        return list(self._watches.values())
+
+    async def watch(self, base_url: str, query: str, subscriber: Any) -> Watch:
+        """Subscribes to a query, starting its poller if this is the first watcher."""
+        watch_id = watch_id_for(base_url, query)
+        watch = self._watches.get(watch_id)
+        if watch is None:
+            watch = Watch(base_url, query, self.min_interval)
+            self._watches[watch_id] = watch
+            try:
+                await self.poll_once(watch)
+            except Exception:
+                del self._watches[watch_id]
+                raise
+            watch.task = asyncio.create_task(self._run(watch))
+        watch.subscribers.add(subscriber)
+        return watch
+
+    def unwatch(self, watch_id: str, subscriber: Any) -> bool:
+        """Removes a subscriber, stopping the poller once nobody is left."""
+        watch = self._watches.get(watch_id)
+        if watch is None or subscriber not in watch.subscribers:
+            return False
+        watch.subscribers.discard(subscriber)
+        if not watch.subscribers:
+            self._stop(watch)
+        return True
+
+    async def poll_once(self, watch: Watch) -> List[int]:
+        """
+        Polls Gerrit once and returns the numbers of the changes that were added,
+        updated or dropped out of the query since the previous poll.
+        """
+        first_poll = watch.last_polled is None
+        full_refresh = first_poll or watch.polls % self.full_refresh_every == 0
+        query = watch.query
+        if not full_refresh:
+            # Only ask for changes updated since the previous poll (plus slack).
+            elapsed = math.ceil(time.monotonic() - watch.last_polled) + 5
+            query = f"({watch.query}) -age:{elapsed}s"
+
+        polled_at = time.monotonic()
+        changes = await self._poll(watch.base_url, query)
+        watch.polls += 1
+        watch.last_polled = polled_at
+
+        changed = []
+        seen = set()
+        for change in changes:
+            number = change.get("_number")
+            seen.add(number)
+            previous = watch.snapshot.get(number)
+            if previous is None or previous.get("updated") != change.get("updated"):
+                changed.append(number)
+            watch.snapshot[number] = change
+        if full_refresh:
+            for number in [n for n in watch.snapshot if n not in seen]:
+                del watch.snapshot[number]
+                changed.append(number)
+        if first_poll:
+            changed = []
+
+        watch.last_changed = changed
+        return changed
+
+    async def _run(self, watch: Watch):
+        while watch.subscribers:
+            await asyncio.sleep(watch.interval)
+            if not watch.subscribers:
+                break
+            try:
+                changed = await self.poll_once(watch)
+                watch.last_error = None
+            except Exception as e:
+                watch.last_error = str(e)
+                watch.interval = min(watch.interval * 2, self.max_interval)
+                continue
+
+            if not changed:
+                watch.interval = min(watch.interval * 2, self.max_interval)
+                continue
+            watch.interval = self.min_interval
+            for subscriber in list(watch.subscribers):
+                try:
+                    await self._notify(subscriber, watch.uri)
+                except Exception:
+                    # The session is gone; stop notifying it.
+                    watch.subscribers.discard(subscriber)
+        self._stop(watch)
+
+    def _stop(self, watch: Watch):
+        self._watches.pop(watch.id, None)
+        if watch.task is not None and watch.task is not asyncio.current_task():
+            watch.task.cancel()
+
+    def stop_all(self):
+        for watch in list(self._watches.values()):
+            self._stop(watch)
+
+
+def format_watch(watch: Watch) -> str:
+    """Renders the latest known state of the changes a watch covers."""
+    output = f"Watch {watch.id} on {watch.base_url} for query: {watch.query}\n"
+    output += f"Resource: {watch.uri}\n"
+    if watch.last_error:
+        output += f"Last poll failed: {watch.last_error}\n"
+    if not watch.snapshot:
+        output += "No matching changes.\n"
+    for number, change in sorted(watch.snapshot.items(), key=lambda item: item[0]):
+        marker = "*" if number in watch.last_changed else "-"
+        wip_prefix = "[WIP] " if change.get("work_in_progress") else ""
+        output += (
+            f"{marker} {number}: {wip_prefix}{change.get('subject', '')} "
+            f"[{change.get('status', 'UNKNOWN')}] updated {change.get('updated', 'unknown')}\n"
+        )
+    return output
@@ -0,0 +1,152 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module stops the server from hammering a Gerrit host that is down.
+
+Each host URL has a circuit breaker. After several consecutive transport
+failures, or a high failure rate over the recent requests, the breaker opens
+and requests to the host fail at once instead of each waiting for curl to give
+up. After a cool-down the breaker lets a single probe request through; its
+outcome closes the breaker again or keeps it open for another cool-down.
+"""
+
+import collections
+import time
+from typing import Callable, Deque, Dict
+
+from gerrit_mcp_server import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host that is considered down."""
+
+
+class CircuitBreaker:
+    """The failure tracking and state of one host."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        error_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 10,
+        reset_timeout_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_calls = min_calls
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._clock = clock
+        self._outcomes: Deque[bool] = collections.deque(maxlen=window_size)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._publish()
+
+    def check(self):
+        """
+        Raises CircuitOpenError if a request would be rejected now, without
+        taking the probe of a half-open breaker.
+        """
+        if self.state == OPEN:
+            remaining = self.opened_at + self.reset_timeout_seconds - self._clock()
+            if remaining > 0:
+                self._reject(f"retrying in {remaining:.0f} seconds")
+        elif self.state == HALF_OPEN and self._probe_in_flight:
+            self._reject("a probe request is in progress")
+
+    def before_call(self):
+        """Raises CircuitOpenError unless a request may be sent now."""
+        if self.state == OPEN:
+            remaining = self.opened_at + self.reset_timeout_seconds - self._clock()
+            if remaining > 0:
+                self._reject(f"retrying in {remaining:.0f} seconds")
+            self.state = HALF_OPEN
+            self._publish()
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self._reject("a probe request is in progress")
+            self._probe_in_flight = True
+
+    def record_success(self):
+        self._probe_in_flight = False
+        self._outcomes.append(True)
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self._outcomes.clear()
+            self._publish()
+
+    def record_failure(self):
+        self._probe_in_flight = False
+        self._outcomes.append(False)
+        self.consecutive_failures += 1
+        failures = self._outcomes.count(False)
+        if (
+            self.state == HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+            or (
+                len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.error_rate_threshold
+            )
+        ):
+            self._open()
+
+    def record_abandoned(self):
+        """Records a request that ended without an outcome, e.g. on cancellation."""
+        self._probe_in_flight = False
+
+    def _open(self):
+        if self.state != OPEN:
+            metrics.increment(f"circuit_breaker.{self.name}.opened")
+        self.state = OPEN
+        self.opened_at = self._clock()
+        self._publish()
+
+    def _reject(self, detail: str):
+        metrics.increment(f"circuit_breaker.{self.name}.rejected")
+        raise CircuitOpenError(
+            f"Gerrit host {self.name} is unavailable after {self.consecutive_failures} "
+            f"consecutive failed requests; failing fast ({detail})."
+        )
+
+    def _publish(self):
+        metrics.set_gauge(f"circuit_breaker.{self.name}.state", self.state)
+
+
+class CircuitBreakers:
+    """Circuit breakers by host, created on first use with shared settings."""
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, **self.settings)
+            self._breakers[host] = breaker
+        return breaker
+
+    def reset(self, host: str):
+        self._breakers.pop(host, None)
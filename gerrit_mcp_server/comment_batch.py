@@ -0,0 +1,109 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module validates a batch of inline comments and turns them into the
+CommentInput entities Gerrit expects.
+
+Every comment is checked before anything is sent, so a batch with a mistake
+in its 40th comment fails as a whole with a message naming that comment
+instead of leaving 39 comments posted.
+"""
+
+from typing import Any, Dict, List
+
+_RANGE_FIELDS = ("start_line", "start_character", "end_line", "end_character")
+
+
+class CommentBatchError(ValueError):
+    """Raised when a comment of a batch is invalid."""
+
+
+def _positive_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def comment_input(comment: Dict[str, Any], default_unresolved: bool = True) -> Dict[str, Any]:
+    """
+    Returns the CommentInput for one comment, given as a dict with `file_path`,
+    `message` and optionally `line_number` (omit it for a file comment), the
+    four range fields, `suggestion`, `in_reply_to` and `unresolved`.
+    """
+    file_path = comment.get("file_path")
+    if not isinstance(file_path, str) or not file_path:
+        raise CommentBatchError("file_path is required")
+    message = comment.get("message")
+    if not isinstance(message, str) or not message.strip():
+        raise CommentBatchError("message is required")
+    suggestion = comment.get("suggestion")
+    if suggestion is not None:
+        message = message + f"\n```suggestion\n{suggestion}\n```"
+
+    result: Dict[str, Any] = {
+        "path": file_path,
+        "message": message,
+        "unresolved": comment.get("unresolved", default_unresolved),
+    }
+    line = comment.get("line_number")
+    if line is not None:
+        if not _positive_int(line):
+            raise CommentBatchError(f"line_number must be a positive integer, got {line!r}")
+        result["line"] = line
+
+    given = [field for field in _RANGE_FIELDS if comment.get(field) is not None]
+    if given:
+        if len(given) != len(_RANGE_FIELDS):
+            raise CommentBatchError(f"a range needs all of {', '.join(_RANGE_FIELDS)}")
+        comment_range = {field: comment[field] for field in _RANGE_FIELDS}
+        if not _positive_int(comment_range["start_line"]) or not _positive_int(comment_range["end_line"]):
+            raise CommentBatchError("range lines must be positive integers")
+        if (comment_range["start_line"], comment_range["start_character"]) > (
+            comment_range["end_line"],
+            comment_range["end_character"],
+        ):
+            raise CommentBatchError("range ends before it starts")
+        result["range"] = comment_range
+        # Gerrit requires line to equal end_line when a range is provided.
+        result["line"] = comment_range["end_line"]
+    if suggestion is not None and "line" not in result:
+        raise CommentBatchError("a suggestion needs a line_number or a range")
+
+    in_reply_to = comment.get("in_reply_to")
+    if in_reply_to is not None:
+        result["in_reply_to"] = in_reply_to
+    return result
+
+
+def comment_inputs(comments: List[Dict[str, Any]], default_unresolved: bool = True) -> List[Dict[str, Any]]:
+    """Validates all comments of a batch; raises CommentBatchError naming the first bad one."""
+    if not comments:
+        raise CommentBatchError("no comments given")
+    inputs = []
+    for index, comment in enumerate(comments):
+        if not isinstance(comment, dict):
+            raise CommentBatchError(f"comment {index + 1}: expected an object")
+        try:
+            inputs.append(comment_input(comment, default_unresolved))
+        except CommentBatchError as e:
+            raise CommentBatchError(f"comment {index + 1} ({comment.get('file_path')}): {e}") from None
+    return inputs
+
+
+def review_comments(inputs: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Groups CommentInputs into the `comments` map of a ReviewInput."""
+    by_file: Dict[str, List[Dict[str, Any]]] = {}
+    for comment in inputs:
+        entry = {key: value for key, value in comment.items() if key != "path"}
+        by_file.setdefault(comment["path"], []).append(entry)
+    return by_file
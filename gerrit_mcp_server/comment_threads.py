@@ -0,0 +1,200 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module reconstructs comment threads from the `in_reply_to` links of the
+published comments on a change and keeps them up to date incrementally.
+"""
+
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class _DefaultViewer:
+    """Stands in for callers that are not attached to an MCP session."""
+
+
+_DEFAULT_VIEWER = _DefaultViewer()
+
+
+class CommentThread:
+    """A root comment and all of its (transitive) replies."""
+
+    def __init__(self, path: str, root: Dict[str, Any]):
+        self.path = path
+        self.root = root
+        self.replies: List[Dict[str, Any]] = []
+
+    @property
+    def comments(self) -> List[Dict[str, Any]]:
+        return [self.root] + self.replies
+
+    @property
+    def last_updated(self) -> str:
+        return max(c.get("updated", "") for c in self.comments)
+
+    @property
+    def unresolved(self) -> bool:
+        """A thread's state is the state of its most recent comment."""
+        latest = max(self.comments, key=lambda c: c.get("updated", ""))
+        return latest.get("unresolved", False)
+
+    def as_row(self) -> Dict[str, Any]:
+        """The thread as a row for a row_filters selection."""
+        return {
+            "path": self.path,
+            "line": self.root.get("line"),
+            "unresolved": self.unresolved,
+            "last_updated": self.last_updated,
+            "comments": self.comments,
+        }
+
+
+class CommentThreadIndex:
+    """The comment threads of a single change."""
+
+    def __init__(self):
+        self._comments: Dict[str, Dict[str, Any]] = {}
+        self._paths: Dict[str, str] = {}
+        self._threads: Optional[List[CommentThread]] = None
+        # The change's `updated` timestamp when the comments were last fetched.
+        self.change_updated: Optional[str] = None
+        self._watermarks = weakref.WeakKeyDictionary()
+
+    def merge(self, comments_by_file: Dict[str, List[Dict[str, Any]]]) -> int:
+        """Merges a `/comments` response, returning the number of new or edited comments."""
+        merged = 0
+        for path, comments in comments_by_file.items():
+            for comment in comments:
+                comment_id = comment.get("id")
+                if not comment_id:
+                    continue
+                known = self._comments.get(comment_id)
+                if known is not None and known.get("updated") == comment.get("updated"):
+                    continue
+                self._comments[comment_id] = comment
+                self._paths[comment_id] = path
+                merged += 1
+        if merged:
+            self._threads = None
+        return merged
+
+    def threads(self) -> List[CommentThread]:
+        """Returns all threads, ordered by file and then by their root comment."""
+        if self._threads is None:
+            self._threads = self._build_threads()
+        return self._threads
+
+    def _build_threads(self) -> List[CommentThread]:
+        roots: Dict[str, str] = {}
+
+        def find_root(comment_id: str) -> str:
+            chain = []
+            current = comment_id
+            while current not in roots:
+                parent = self._comments[current].get("in_reply_to")
+                # Replies to comments we cannot see start their own thread.
+                if not parent or parent not in self._comments or parent in chain:
+                    roots[current] = current
+                    break
+                chain.append(current)
+                current = parent
+            for member in chain:
+                roots[member] = roots[current]
+            return roots[comment_id]
+
+        threads: "OrderedDict[str, CommentThread]" = OrderedDict()
+        ordered = sorted(self._comments.values(), key=lambda c: c.get("updated", ""))
+        for comment in ordered:
+            root_id = find_root(comment["id"])
+            if root_id == comment["id"]:
+                threads[root_id] = CommentThread(self._paths[root_id], comment)
+        for comment in ordered:
+            root_id = roots[comment["id"]]
+            if root_id != comment["id"]:
+                threads[root_id].replies.append(comment)
+
+        return sorted(
+            threads.values(),
+            key=lambda t: (t.path, t.root.get("line", 0), t.root.get("updated", "")),
+        )
+
+    def changed_since_last_view(self, viewer: Any = None) -> List[CommentThread]:
+        """
+        Returns the threads updated since the viewer last called this method and
+        advances the viewer's watermark.
+        """
+        viewer = _DEFAULT_VIEWER if viewer is None else viewer
+        watermark = self._watermarks.get(viewer, "")
+        threads = [t for t in self.threads() if t.last_updated > watermark]
+        if self._comments:
+            self._watermarks[viewer] = max(
+                c.get("updated", "") for c in self._comments.values()
+            )
+        return threads
+
+
+class CommentThreadCache:
+    """Keeps the thread index of recently viewed changes, least recently used first."""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CommentThreadIndex]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[CommentThreadIndex]:
+        index = self._entries.get(key)
+        if index is not None:
+            self._entries.move_to_end(key)
+        return index
+
+    def get_or_create(self, key: Hashable) -> CommentThreadIndex:
+        index = self.get(key)
+        if index is None:
+            index = CommentThreadIndex()
+            self._entries[key] = index
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]):
+        """Drops every entry whose key matches the predicate."""
+        for key in [k for k in self._entries if predicate(k)]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+def format_threads(change_id: str, threads: List[CommentThread]) -> str:
+    """Renders threads grouped by file, with replies indented under their root."""
+    output = f"Comment threads for CL {change_id}:\n"
+    current_path = None
+    for thread in threads:
+        if thread.path != current_path:
+            output += f"---\nFile: {thread.path}\n"
+            current_path = thread.path
+        line = thread.root.get("line", "File")
+        status = "UNRESOLVED" if thread.unresolved else "RESOLVED"
+        output += (
+            f"Thread L{line} - {status}, {len(thread.replies)} replies, "
+            f"last updated {thread.last_updated}\n"
+        )
+        for position, comment in enumerate(thread.comments):
+            indent = "  " if position == 0 else "    "
+            author = comment.get("author", {}).get("name", "Unknown")
+            timestamp = comment.get("updated", "No date")
+            output += f"{indent}[{author}] ({timestamp}) id={comment.get('id', '')}\n"
+            output += f"{indent}  {comment.get('message', '')}\n"
+    return output
@@ -0,0 +1,196 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module keeps the current configuration snapshot and reloads it when its
+file changes.
+
+While an event loop is running, a background task polls the file's stat and
+reads and validates a changed file in a worker thread, so tool calls only
+read the current snapshot. A valid file replaces the snapshot in a single
+assignment and the caller is told what changed. An invalid file is reported
+and the previous snapshot stays in use until the file is fixed.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from gerrit_mcp_server.transport_profiles import host_key
+
+Config = Dict[str, Any]
+FileState = Tuple[int, int]
+
+
+def file_state(path: Path) -> Optional[FileState]:
+    """Returns the modification time and size of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _hosts_by_key(config: Config) -> Dict[str, Dict[str, Any]]:
+    hosts: Dict[str, Dict[str, Any]] = {}
+    for host in config.get("gerrit_hosts", []):
+        for url in (host.get("internal_url"), host.get("external_url")):
+            if url:
+                # As in transport_profiles, the first host listed for a URL wins.
+                hosts.setdefault(host_key(url), host)
+    return hosts
+
+
+def changed_hosts(old: Config, new: Config) -> Set[str]:
+    """Returns the keys of the hosts that were added, removed or configured differently."""
+    old_hosts = _hosts_by_key(old)
+    new_hosts = _hosts_by_key(new)
+    return {key for key in old_hosts.keys() | new_hosts.keys() if old_hosts.get(key) != new_hosts.get(key)}
+
+
+def changed_sections(old: Config, new: Config) -> Set[str]:
+    """Returns the top-level settings, other than the hosts, whose values differ."""
+    return {
+        key
+        for key in old.keys() | new.keys()
+        if key != "gerrit_hosts" and old.get(key) != new.get(key)
+    }
+
+
+class _Snapshot:
+    def __init__(self, path: Path, state: Optional[FileState], config: Config):
+        self.path = path
+        self.state = state
+        self.config = config
+
+
+class ConfigWatcher:
+    """The current configuration, replaced as a whole when its file changes."""
+
+    def __init__(
+        self,
+        read: Callable[[Path], Config],
+        on_change: Callable[[Config, Config], None],
+        on_error: Callable[[Path, Exception], None],
+        interval_seconds: float = 2.0,
+    ):
+        self._read = read
+        self._on_change = on_change
+        self._on_error = on_error
+        self.interval_seconds = interval_seconds
+        self._snapshot: Optional[_Snapshot] = None
+        # The state of a file that failed to load, so that it is reported once.
+        self._rejected: Optional[Tuple[Path, Optional[FileState]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def current(self, path: Path) -> Optional[Config]:
+        """
+        Returns the snapshot of `path` while the poller keeps it up to date,
+        or None if the file has to be checked with check().
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.path == path and self._polling():
+            return snapshot.config
+        return None
+
+    def check(self, path: Path) -> Config:
+        """
+        Reloads the file if it changed since the snapshot and returns the
+        current configuration. Raises if the file cannot be loaded and there
+        is no previous snapshot of it to fall back to.
+        """
+        state = file_state(path)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.path == path:
+            if state is not None and state == snapshot.state:
+                return snapshot.config
+            if (path, state) == self._rejected:
+                return snapshot.config
+        try:
+            config = self._read(path)
+        except Exception as e:
+            if snapshot is None or snapshot.path != path:
+                raise
+            self._reject(path, state, e)
+            return snapshot.config
+        if state is None:
+            # Without a stat there is nothing to compare against next time.
+            return config
+        self._swap(_Snapshot(path, state, config))
+        return config
+
+    async def poll_once(self) -> bool:
+        """Reloads the snapshot's file off the event loop if it changed; returns True if it was replaced."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return False
+        state = file_state(snapshot.path)
+        if state == snapshot.state or (snapshot.path, state) == self._rejected:
+            return False
+        if state is None:
+            self._reject(snapshot.path, state, FileNotFoundError(f"Cannot read {snapshot.path}."))
+            return False
+        try:
+            config = await asyncio.to_thread(self._read, snapshot.path)
+        except Exception as e:
+            self._reject(snapshot.path, state, e)
+            return False
+        if self._snapshot is not snapshot:
+            # Replaced by a synchronous check in the meantime.
+            return False
+        self._swap(_Snapshot(snapshot.path, state, config))
+        return True
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _swap(self, snapshot: _Snapshot):
+        previous = self._snapshot
+        self._snapshot = snapshot
+        self._rejected = None
+        if previous is not None and previous.config is not snapshot.config:
+            self._on_change(previous.config, snapshot.config)
+
+    def _reject(self, path: Path, state: Optional[FileState], error: Exception):
+        self._rejected = (path, state)
+        self._on_error(path, error)
+
+    def _polling(self) -> bool:
+        """Whether the poller runs on the current event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return self._task is not None and not self._task.done() and self._task.get_loop() is loop
+
+    def start_polling(self):
+        """Starts the poller on the running event loop, if there is one and polling is enabled."""
+        if self.interval_seconds <= 0 or self._snapshot is None or self._polling():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = loop.create_task(self._poll())
+
+    async def _poll(self):
+        while self.interval_seconds > 0:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.poll_once()
+            except Exception as e:
+                self._on_error(self._snapshot.path, e)
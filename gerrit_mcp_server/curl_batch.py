@@ -0,0 +1,247 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module runs many requests through a single curl process.
+
+The transfers are written to curl's stdin as a config file (`--config -`),
+one segment per transfer separated by `next`, and run with `--parallel`.
+Since `next` resets every option, the authentication options are repeated in
+each segment. Each transfer writes its body to its own file and prints a
+marker line with its index, HTTP status and curl exit code, which is how the
+results are told apart again.
+
+A wrapper such as gob-curl adds its authentication to the command line of
+the curl it runs, which the segments of a config file do not inherit. So the
+wrapper is first run against a stand-in curl (RESOLVER_SCRIPT) that prints
+the arguments it was given, and the batch runs curl itself with those
+arguments repeated in each segment. A wrapper that cannot be resolved this
+way, for example because it runs curl by an absolute path, has its transfers
+run as one process each, with transfer_args, demultiplexed the same way.
+"""
+
+import os
+from typing import List, Optional, Sequence, Tuple
+
+from gerrit_mcp_server import json_codec
+
+MARKER = "@@gerrit-mcp-transfer"
+
+# Written to stderr after a transfer, so that its HTTP status is known without
+# touching the response on stdout.
+STATUS_MARKER = "@@gerrit-mcp-status"
+
+# Printed by the stand-in curl before the arguments a wrapper ran it with.
+_RESOLVED_MARKER = b"@@gerrit-mcp-resolved-args\n"
+
+# A stand-in for curl that prints its arguments, NUL-separated, and exits.
+RESOLVER_SCRIPT = (
+    "#!/bin/sh\n"
+    f"printf '%s\\n' '{_RESOLVED_MARKER.decode().strip()}'\n"
+    'for arg in "$@"; do printf \'%s\\0\' "$arg"; done\n'
+)
+
+# Options in the commands built by this server that take a value.
+_VALUE_OPTIONS = frozenset(
+    {
+        "-b", "--cookie",
+        "-u", "--user",
+        "-H", "--header",
+        "-X", "--request",
+        "-d", "--data", "--data-binary",
+        "-o", "--output",
+        "-w", "--write-out",
+        "-A", "--user-agent",
+        "--max-time",
+    }
+)
+
+
+class BatchResult:
+    """The outcome of one transfer of a batch."""
+
+    def __init__(self, status: int, body: bytes, exit_code: int = 0, error: Optional[str] = None):
+        self.status = status
+        self.body = body
+        self.exit_code = exit_code
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0 and self.error is None and 200 <= self.status < 300
+
+    def text(self) -> str:
+        """The body as text, without the XSSI prefix."""
+        return json_codec.decode_text(self.body)
+
+    def describe_error(self) -> str:
+        if self.error:
+            return self.error
+        if self.exit_code:
+            return f"curl exit code {self.exit_code}"
+        return f"HTTP {self.status}: {self.text()}"
+
+
+def _quote(value: str) -> str:
+    escaped = (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\t", "\\t")
+    )
+    return f'"{escaped}"'
+
+
+def _config_lines(args: Sequence[str]) -> List[str]:
+    """Translates curl command line arguments into config file lines."""
+    lines = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in _VALUE_OPTIONS and i + 1 < len(args):
+            lines.append(f"{arg} {_quote(args[i + 1])}")
+            i += 2
+        elif arg.startswith("-"):
+            lines.append(arg)
+            i += 1
+        else:
+            lines.append(f"url = {_quote(arg)}")
+            i += 1
+    return lines
+
+
+def parse_resolved_args(stdout: bytes, probe_url: str) -> Optional[List[str]]:
+    """
+    Returns the arguments a wrapper ran the stand-in curl with, without the
+    probe URL, or None if it did not run it or added arguments that cannot
+    be repeated in a config segment.
+    """
+    start = stdout.find(_RESOLVED_MARKER)
+    if start < 0:
+        return None
+    args = stdout[start + len(_RESOLVED_MARKER) :].decode("utf-8", "replace").split("\0")[:-1]
+    if probe_url not in args:
+        return None
+    args.remove(probe_url)
+    # Any other bare word would be taken for a URL: an option with a value
+    # that is not known to take one.
+    if any(line.startswith("url = ") for line in _config_lines(args)):
+        return None
+    return args
+
+
+def _body_from_file(
+    transfer: Sequence[str], body: Optional[bytes], index: int, output_dir: str
+) -> List[str]:
+    """
+    Moves the body of a transfer that reads it from stdin into a file. stdin
+    carries the config of the whole batch, and config lines are limited in
+    length, so the body is written next to the output files instead.
+    """
+    args = list(transfer)
+    if body is None or "@-" not in args:
+        return args
+    body_path = os.path.join(output_dir, f"{index}.body")
+    with open(body_path, "wb") as f:
+        f.write(body)
+    args[args.index("@-")] = f"@{body_path}"
+    return args
+
+
+def _write_out(index: int) -> str:
+    return f"\n{MARKER} {index} %{{http_code}} %{{exitcode}} %{{errormsg}}\n"
+
+
+def status_write_out() -> str:
+    """The --write-out format that reports the HTTP status of a transfer on stderr."""
+    return f"%{{stderr}}\n{STATUS_MARKER} %{{http_code}}\n"
+
+
+def split_status(stderr: bytes) -> Tuple[Optional[int], bytes]:
+    """
+    Returns the HTTP status written by status_write_out, or None if there was
+    no response, and stderr without it.
+    """
+    marker = f"\n{STATUS_MARKER} ".encode()
+    start = stderr.rfind(marker)
+    if start < 0:
+        return None, stderr
+    end = stderr.find(b"\n", start + len(marker))
+    end = len(stderr) if end < 0 else end
+    code = stderr[start + len(marker) : end].strip()
+    status = int(code) if code.isdigit() and int(code) else None
+    return status, stderr[:start] + stderr[end + 1 :]
+
+
+def transfer_args(transfer: Sequence[str], index: int, output_dir: str) -> List[str]:
+    """Returns the arguments that run one transfer of a batch in a process of its own."""
+    return list(transfer) + [
+        "--output",
+        os.path.join(output_dir, str(index)),
+        "--write-out",
+        _write_out(index) + status_write_out(),
+    ]
+
+
+def build_config(
+    common_args: Sequence[str],
+    transfers: Sequence[Sequence[str]],
+    output_dir: str,
+    bodies: Optional[Sequence[Optional[bytes]]] = None,
+) -> str:
+    """
+    Returns the curl config for a batch. common_args (authentication, limits)
+    are repeated in every segment; each transfer is the argument list a single
+    request would have used, including its URL, and bodies[i] is the request
+    body of transfers[i], if any. Request bodies are written to files in
+    output_dir.
+    """
+    segments = []
+    for index, transfer in enumerate(transfers):
+        body = bodies[index] if bodies is not None else None
+        lines = _config_lines(common_args) + _config_lines(
+            _body_from_file(transfer, body, index, output_dir)
+        )
+        lines.append(f"--output {_quote(os.path.join(output_dir, str(index)))}")
+        lines.append(f"--write-out {_quote(_write_out(index))}")
+        segments.append("\n".join(lines))
+    return "\nnext\n".join(segments) + "\n"
+
+
+def parse_results(stdout: bytes, count: int, output_dir: str) -> List[BatchResult]:
+    """Demultiplexes the marker lines and body files of a finished batch."""
+    results: List[Optional[BatchResult]] = [None] * count
+    for line in stdout.decode("utf-8", "replace").splitlines():
+        if not line.startswith(MARKER + " "):
+            continue
+        fields = line[len(MARKER) + 1 :].split(" ", 3)
+        if len(fields) < 3 or not fields[0].isdigit() or int(fields[0]) >= count:
+            continue
+        index = int(fields[0])
+        status = int(fields[1]) if fields[1].isdigit() else 0
+        exit_code = int(fields[2]) if fields[2].isdigit() else 0
+        error = fields[3].strip() if len(fields) > 3 and fields[3].strip() else None
+        body_path = os.path.join(output_dir, str(index))
+        body = b""
+        if os.path.exists(body_path):
+            with open(body_path, "rb") as f:
+                body = f.read()
+        results[index] = BatchResult(status, body, exit_code, error)
+    return [
+        result
+        if result is not None
+        else BatchResult(0, b"", error="curl did not report a result for this request")
+        for result in results
+    ]
@@ -0,0 +1,159 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module builds a review dashboard: several change queries, such as the
+changes that need the user's attention and the changes they are reviewing,
+shown together.
+
+The section queries overlap heavily, so each change is listed only under the
+first section that returns it, with a note of the other sections it is also
+in. Options that only some sections need are fetched once, for the union of
+the changes, instead of once per section.
+"""
+
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from gerrit_mcp_server.sort_util import sort_changes_by_date
+
+ChangeInfo = Dict[str, Any]
+
+
+class Section:
+    """One titled query of the dashboard."""
+
+    def __init__(self, name: str, query: str, options: Tuple[str, ...] = ()):
+        self.name = name
+        self.query = query
+        self.options = tuple(options)
+
+
+DEFAULT_SECTIONS = [
+    Section("Needs your attention", "attention:self"),
+    Section("Reviewing", "is:open reviewer:self -owner:self"),
+    Section("Your open changes", "is:open owner:self"),
+    Section("CC'd", "is:open cc:self"),
+]
+
+
+def sections_from_settings(settings: Dict[str, Any]) -> List[Section]:
+    """Returns the sections of the "dashboard" configuration section, or the defaults."""
+    configured = settings.get("sections")
+    if not configured:
+        return list(DEFAULT_SECTIONS)
+    return [Section(s["name"], s["query"], tuple(s.get("options", ()))) for s in configured]
+
+
+def union_options(sections: List[Section]) -> Tuple[str, ...]:
+    return tuple(sorted({option for section in sections for option in section.options}))
+
+
+class Dashboard:
+    """The deduplicated changes of each section."""
+
+    def __init__(
+        self,
+        sections: List[Section],
+        results: List[List[ChangeInfo]],
+        errors: Optional[Dict[str, str]] = None,
+    ):
+        self.sections = sections
+        self.errors = errors or {}
+        self.changes: Dict[str, ChangeInfo] = {}
+        self.members: Dict[str, List[str]] = {section.name: [] for section in sections}
+        self.also_in: Dict[str, List[str]] = {}
+        for section, changes in zip(sections, results):
+            for change in changes:
+                number = str(change["_number"])
+                if number in self.changes:
+                    self.also_in.setdefault(number, []).append(section.name)
+                    continue
+                self.changes[number] = change
+                self.members[section.name].append(number)
+
+    def update(self, changes: List[ChangeInfo]):
+        """Replaces the changes with versions fetched with more options."""
+        for change in changes:
+            number = str(change["_number"])
+            if number in self.changes:
+                self.changes[number] = change
+
+
+def _describe_labels(change: ChangeInfo) -> str:
+    states = []
+    for name, label in sorted((change.get("labels") or {}).items()):
+        if label.get("rejected"):
+            states.append(f"{name} rejected")
+        elif label.get("approved"):
+            states.append(f"{name} approved")
+    return ", ".join(states)
+
+
+def format_dashboard(dashboard: Dashboard) -> str:
+    total = len(dashboard.changes)
+    output = f"Dashboard: {total} change(s) in {len(dashboard.sections)} section(s).\n"
+    for section in dashboard.sections:
+        numbers = dashboard.members[section.name]
+        output += f"\n{section.name} ({len(numbers)}):\n"
+        if section.name in dashboard.errors:
+            output += f"  Failed to query: {dashboard.errors[section.name]}\n"
+            continue
+        if not numbers:
+            output += "  (none)\n"
+            continue
+        changes = sort_changes_by_date([dashboard.changes[n] for n in numbers])
+        for change in changes:
+            number = str(change["_number"])
+            wip_prefix = "[WIP] " if change.get("work_in_progress") else ""
+            line = f"- {number}: {wip_prefix}{change.get('subject', '')} ({change.get('project', '')})"
+            labels = _describe_labels(change)
+            if labels:
+                line += f" [{labels}]"
+            if number in dashboard.also_in:
+                line += f" (also in: {', '.join(dashboard.also_in[number])})"
+            output += line + "\n"
+    return output
+
+
+class DashboardCache:
+    """Rendered dashboards, kept for a few seconds to make repeated refreshes cheap."""
+
+    def __init__(self, ttl_seconds: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: Dict[Hashable, Tuple[float, str]] = {}
+
+    def get(self, key: Hashable) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            del self._entries[key]
+            return None
+        return entry[1]
+
+    def put(self, key: Hashable, value: str):
+        now = self._clock()
+        for stale in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[stale]
+        self._entries[key] = (now + self.ttl_seconds, value)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]):
+        """Drops every entry whose key matches the predicate."""
+        for key in [k for k in self._entries if predicate(k)]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,108 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module derives the change query options a tool needs from the ChangeInfo
+fields it renders.
+
+Each tool declares a FieldMask of the fields it reads. The mask asks Gerrit
+for exactly the options that populate those fields, and for `SKIP_DIFFSTAT`
+unless the tool shows line counts, since the diffstat is computed for every
+change of a query by default.
+"""
+
+from typing import Dict, Iterable, Tuple
+
+# The options that populate a field. Fields not listed here are part of every
+# ChangeInfo. A nested field (e.g. `owner.email`) stands for that part of a
+# field that otherwise only has its basic form.
+_FIELD_OPTIONS: Dict[str, Tuple[str, ...]] = {
+    "owner.email": ("DETAILED_ACCOUNTS",),
+    "owner.name": ("DETAILED_ACCOUNTS",),
+    "labels": ("LABELS",),
+    "labels.all": ("DETAILED_LABELS",),
+    "reviewers": ("DETAILED_LABELS",),
+    "reviewers.email": ("DETAILED_LABELS", "DETAILED_ACCOUNTS"),
+    "reviewer_updates": ("REVIEWER_UPDATES",),
+    "messages": ("MESSAGES",),
+    "current_revision": ("CURRENT_REVISION",),
+    "revisions.commit": ("CURRENT_REVISION", "CURRENT_COMMIT"),
+    "revisions.files": ("CURRENT_REVISION", "CURRENT_FILES"),
+    "submittable": ("SUBMITTABLE",),
+}
+
+_DEFAULT_FIELDS = frozenset(
+    {
+        "id",
+        "_number",
+        "project",
+        "branch",
+        "topic",
+        "change_id",
+        "subject",
+        "status",
+        "created",
+        "updated",
+        "submitted",
+        "owner",
+        "work_in_progress",
+        "total_comment_count",
+        "unresolved_comment_count",
+        "insertions",
+        "deletions",
+    }
+)
+
+# Default fields that are expensive to compute, and the flag that skips them.
+_SKIPPABLE_FIELDS: Dict[str, str] = {"insertions": "SKIP_DIFFSTAT", "deletions": "SKIP_DIFFSTAT"}
+
+
+class FieldMask:
+    """The ChangeInfo fields a tool renders."""
+
+    def __init__(self, *fields: str):
+        unknown = [f for f in fields if f not in _FIELD_OPTIONS and f not in _DEFAULT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown ChangeInfo fields: {', '.join(unknown)}")
+        self.fields = frozenset(fields)
+
+    @classmethod
+    def for_paths(cls, paths: Iterable[str]) -> "FieldMask":
+        """
+        Returns the mask of the fields that dotted paths into a ChangeInfo
+        read, e.g. `owner.email`, or `labels.all` for
+        `labels.Code-Review.all.value`. Paths into fields that no option
+        controls are ignored.
+        """
+        fields = set()
+        for path in paths:
+            parts = path.split(".")
+            candidates = [".".join(parts[:2]), f"{parts[0]}.{parts[2]}" if len(parts) > 2 else "", parts[0]]
+            for candidate in candidates:
+                if candidate in _FIELD_OPTIONS or candidate in _DEFAULT_FIELDS:
+                    fields.add(candidate)
+                    break
+        return cls(*fields)
+
+    def __or__(self, other: "FieldMask") -> "FieldMask":
+        return FieldMask(*(self.fields | other.fields))
+
+    def options(self, extra: Iterable[str] = ()) -> Tuple[str, ...]:
+        """Returns the minimal options for the mask, plus any extra options."""
+        options = set(extra)
+        for field in self.fields:
+            options.update(_FIELD_OPTIONS.get(field, ()))
+        needed = {flag for field, flag in _SKIPPABLE_FIELDS.items() if field in self.fields}
+        skipped = set(_SKIPPABLE_FIELDS.values()) - needed
+        return tuple(sorted((options | skipped) - needed))
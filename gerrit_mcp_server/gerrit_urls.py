@@ -18,7 +18,7 @@ Gerrit URL by dispatching to the appropriate authentication module.
 """
 
 from typing import List, Dict, Any
-from gerrit_mcp_server import gerrit_auth
+from gerrit_mcp_server.transport_profiles import profiles_for
 
 
 def get_curl_command_for_gerrit_url(
@@ -28,55 +28,4 @@ def get_curl_command_for_gerrit_url(
     Determines the appropriate curl command based on the authentication settings
     for the given Gerrit host.
     """
-    gerrit_hosts = config.get("gerrit_hosts", [])
-    auth_config = None
-
-    stripped_gerrit_base_url = (
-        gerrit_base_url.replace("https://", "").replace("http://", "").rstrip("/")
-    )
-    # Strip /a suffix that may have been added by _normalize_gerrit_url
-    # for authenticated access, so we can match against configured host URLs.
-    if stripped_gerrit_base_url.endswith("/a"):
-        stripped_gerrit_base_url = stripped_gerrit_base_url[:-2]
-
-    for host in gerrit_hosts:
-        internal_url = (
-            host.get("internal_url", "")
-            .replace("https://", "")
-            .replace("http://", "")
-            .rstrip("/")
-        )
-        external_url = (
-            host.get("external_url", "")
-            .replace("https://", "")
-            .replace("http://", "")
-            .rstrip("/")
-        )
-        if (
-            stripped_gerrit_base_url == internal_url
-            or stripped_gerrit_base_url == external_url
-        ):
-            auth_config = host.get("authentication")
-            break
-
-    if auth_config is None:
-        raise ValueError(
-            f"No configured Gerrit host found for URL: {gerrit_base_url}. "
-            f"Please check your gerrit_config.json file."
-        )
-
-    auth_type = auth_config.get("type")
-
-    if auth_type == "gob_curl":
-        return gerrit_auth._get_auth_for_gob(auth_config)
-
-    if auth_type == "http_basic":
-        return gerrit_auth._get_auth_for_http_basic(auth_config)
-
-    if auth_type == "git_cookies":
-        return gerrit_auth._get_auth_for_gitcookies(gerrit_base_url, auth_config)
-
-    raise ValueError(
-        "No valid authentication method found in gerrit_config.json. "
-        "Please configure a supported 'type' (e.g., 'http_basic', 'gob_curl', 'git_cookies') for the relevant host."
-    )
\ No newline at end of file
+    return profiles_for(config).get(gerrit_base_url).command(gerrit_base_url)
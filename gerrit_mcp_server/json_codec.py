@@ -0,0 +1,105 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module decodes Gerrit JSON responses from the raw bytes curl returns.
+
+Gerrit prepends `)]}'` to every JSON response to prevent XSSI. Instead of
+decoding the whole body to text and slicing the prefix off (a copy each), the
+prefix and surrounding whitespace are skipped with a memoryview over the
+original buffer. Parsing uses orjson when it is installed, and the standard
+library otherwise; both raise `json.JSONDecodeError` on invalid input.
+
+Base64 bodies (file contents and patches) are decoded here as well, so that
+the offload process pool can run these functions without importing the
+server.
+"""
+
+import base64
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+XSSI_PREFIX = b")]}'"
+
+JSONDecodeError = json.JSONDecodeError
+
+_WHITESPACE = b" \t\r\n"
+
+_backend = "orjson" if orjson is not None else "json"
+
+
+def backend() -> str:
+    """Returns the name of the JSON backend in use."""
+    return _backend
+
+
+def use_backend(name: str):
+    """Selects the JSON backend: "orjson" (if installed) or "json"."""
+    global _backend
+    if name not in ("orjson", "json"):
+        raise ValueError(f"Unknown JSON backend '{name}'. Use 'orjson' or 'json'.")
+    if name == "orjson" and orjson is None:
+        raise ValueError("The 'orjson' JSON backend is not installed.")
+    _backend = name
+
+
+def strip_xssi(data: Union[bytes, bytearray, memoryview]) -> memoryview:
+    """
+    Returns a view of a response body without the XSSI prefix and without
+    leading and trailing whitespace. No bytes are copied.
+    """
+    view = memoryview(data)
+    start, end = 0, len(view)
+    if view[: len(XSSI_PREFIX)] == XSSI_PREFIX:
+        start = len(XSSI_PREFIX)
+    while start < end and view[start] in _WHITESPACE:
+        start += 1
+    while end > start and view[end - 1] in _WHITESPACE:
+        end -= 1
+    return view[start:end]
+
+
+def decode_text(data: Union[bytes, bytearray, memoryview]) -> str:
+    """Decodes a response body to text, without the XSSI prefix."""
+    return str(strip_xssi(data), "utf-8", "replace")
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Parses JSON from text or from a (possibly XSSI-prefixed) response body."""
+    if not isinstance(data, str):
+        data = strip_xssi(data)
+    if _backend == "orjson":
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        # The standard library only accepts str, bytes and bytearray. Invalid
+        # UTF-8 is reported like orjson does, as a JSONDecodeError.
+        try:
+            data = str(data, "utf-8")
+        except UnicodeDecodeError as e:
+            raise JSONDecodeError(
+                f"Invalid UTF-8: {e.reason}", str(data, "utf-8", "replace"), e.start
+            ) from None
+    return json.loads(data)
+
+
+def decode_base64_text(data: Union[str, bytes]) -> str:
+    """Decodes a base64 response body to text."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return base64.b64decode(data).decode("utf-8")
@@ -15,19 +15,55 @@
 import asyncio
 import json
 import sys
-import base64
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import quote
 import os
 import datetime  # Added this import
 import argparse
+import functools
+import shutil
+import tempfile
+import time
 
 from gerrit_mcp_server.gerrit_urls import get_curl_command_for_gerrit_url
+from gerrit_mcp_server.transport_profiles import host_key
+from gerrit_mcp_server import config_watcher
+from gerrit_mcp_server.config_watcher import ConfigWatcher
 from gerrit_mcp_server.bug_utils import extract_bugs_from_commit_message
 from gerrit_mcp_server.sort_util import sort_changes_by_date
-from mcp.server.fastmcp import FastMCP
+from gerrit_mcp_server.patch_index import PatchIndex, PatchIndexCache
+from gerrit_mcp_server.comment_threads import (
+    CommentThreadCache,
+    CommentThreadIndex,
+    format_threads,
+)
+from gerrit_mcp_server.change_watcher import ChangeWatcher, format_watch
+from gerrit_mcp_server.change_index import LocalChangeIndex
+from gerrit_mcp_server.account_cache import AccountCache
+from gerrit_mcp_server.change_batcher import ChangeBatcher
+from gerrit_mcp_server import change_graph, dashboard
+from gerrit_mcp_server.dashboard import DashboardCache
+from gerrit_mcp_server.field_masks import FieldMask
+from gerrit_mcp_server import row_filters
+from gerrit_mcp_server.row_filters import Selection, SelectionError
+from gerrit_mcp_server.change_graph import ChangeGraph, StackEdges
+from gerrit_mcp_server.offload import Offloader
+from gerrit_mcp_server.admission import AdmissionController
+from gerrit_mcp_server.circuit_breaker import CLOSED, CircuitBreaker, CircuitBreakers
+from gerrit_mcp_server import bulk_mutations
+from gerrit_mcp_server.bulk_mutations import Checkpoint, RateLimiters
+from gerrit_mcp_server import comment_batch, reviewer_batch
+from gerrit_mcp_server import curl_batch
+from gerrit_mcp_server.curl_batch import BatchResult
+from gerrit_mcp_server.shared_store import SharedStore, private_directory
+from gerrit_mcp_server import result_store
+from gerrit_mcp_server.result_store import ResultStore
+from gerrit_mcp_server import json_codec, metrics
+from mcp.server.fastmcp import Context, FastMCP
 import mcp.types as types
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 # --- Load Gerrit details from JSON ---
 # Define paths outside the try block to ensure they are always initialized.
@@ -36,7 +72,6 @@ SERVER_ROOT_PATH = PKG_PATH.parent
 LOG_FILE_PATH = SERVER_ROOT_PATH / "server.log"
 CONFIG_FILE_PATH = PKG_PATH / "gerrit_config.json"
 
-
 def load_gerrit_config() -> Dict[str, Any]:
     """Loads the Gerrit configuration from the JSON file."""
     config_path_str = os.environ.get("GERRIT_CONFIG_PATH")
@@ -45,6 +80,11 @@ def load_gerrit_config() -> Dict[str, Any]:
     else:
         config_path = CONFIG_FILE_PATH
 
+    # While the server runs, the watcher reloads the file when it changes and
+    # this only returns its current (read-only) snapshot.
+    config = _config_watcher.current(config_path)
+    if config is not None:
+        return config
     if not config_path.exists():
         raise FileNotFoundError(
             f"Configuration file not found at {config_path}. "
@@ -53,6 +93,18 @@ def load_gerrit_config() -> Dict[str, Any]:
             "'gerrit_mcp_server/gerrit_config.json' as a starting point. "
             "Refer to the README.md for more details on the configuration options."
         )
+    config = _config_watcher.check(config_path)
+    reload_settings = config.get("config_reload")
+    if isinstance(reload_settings, dict):
+        _config_watcher.interval_seconds = reload_settings.get(
+            "interval_seconds", DEFAULT_CONFIG_RELOAD_SECONDS
+        )
+    _config_watcher.start_polling()
+    return config
+
+
+def _read_gerrit_config(config_path: Path) -> Dict[str, Any]:
+    """Reads and validates a configuration file."""
     try:
         with open(config_path, "r") as f:
             config = json.load(f)
@@ -84,6 +136,79 @@ def load_gerrit_config() -> Dict[str, Any]:
         raise e
 
 
+def _report_config_error(config_path: Path, error: Exception):
+    print(
+        f"[gerrit-mcp-server-error] Keeping the previous configuration; {config_path} could not be loaded: {error}",
+        file=sys.stderr,
+    )
+
+
+def _apply_config_change(old: Dict[str, Any], new: Dict[str, Any]):
+    """
+    Drops the state that was built from settings that changed: the cached
+    data of hosts that were added, removed or reconfigured, and the
+    components created from a changed tuning section. Calls already running
+    finish with the components they started with.
+    """
+    global _offloader, _admission_controller, _circuit_breakers, _change_batcher
+    global _bulk_rate_limiters, _dashboard_cache, _result_store
+
+    hosts = config_watcher.changed_hosts(old, new)
+    if hosts:
+        # The normalized base URLs the hosts' state is keyed by, before and after.
+        base_urls = set()
+        for config in (old, new):
+            gerrit_hosts = config.get("gerrit_hosts", [])
+            for host in gerrit_hosts:
+                for url in (host.get("internal_url"), host.get("external_url")):
+                    if url and host_key(url) in hosts:
+                        base_urls.add(_normalize_gerrit_url(url, gerrit_hosts))
+        for base_url in base_urls:
+            _account_cache.invalidate_host(base_url)
+            _change_graph.invalidate_host(base_url)
+        _patch_index_cache.invalidate(lambda key: key[0] in base_urls)
+        _comment_thread_cache.invalidate(lambda key: key[0] in base_urls)
+        if _dashboard_cache is not None:
+            _dashboard_cache.invalidate(lambda key: key[0] in base_urls)
+        if _circuit_breakers is not None:
+            for host in hosts:
+                _circuit_breakers.reset(host)
+        for host in hosts:
+            _wrapper_commands.pop(host, None)
+
+    sections = config_watcher.changed_sections(old, new)
+    if "offload" in sections and _offloader is not None:
+        _offloader.shutdown(cancel_futures=False)
+        _offloader = None
+    if "admission" in sections:
+        _admission_controller = None
+    if "circuit_breaker" in sections:
+        _circuit_breakers = None
+    if "change_batching" in sections:
+        _change_batcher = None
+    if "bulk_mutations" in sections:
+        _bulk_rate_limiters = None
+    if "dashboard" in sections:
+        _dashboard_cache = None
+    if "result_pages" in sections:
+        _result_store = None
+    if "config_reload" in sections:
+        _config_watcher.interval_seconds = _runtime_settings("config_reload", new).get(
+            "interval_seconds", DEFAULT_CONFIG_RELOAD_SECONDS
+        )
+    if hosts or sections:
+        metrics.increment("config.reloaded")
+
+
+# How often the configuration file is checked for changes, unless the
+# "config_reload" section says otherwise. 0 checks it on every call instead.
+DEFAULT_CONFIG_RELOAD_SECONDS = 2.0
+
+_config_watcher = ConfigWatcher(
+    _read_gerrit_config, _apply_config_change, _report_config_error, DEFAULT_CONFIG_RELOAD_SECONDS
+)
+
+
 try:
     with open(PKG_PATH / "gerrit_details.json", "r") as f:
         gerrit_details = json.load(f)
@@ -100,10 +225,275 @@ except Exception as e:
     }
 
 # --- Initialize FastMCP Server ---
-mcp = FastMCP("gerrit")
+
+# The number of HTTP worker processes serving this app. With more than one
+# worker, requests of one MCP session may reach different processes, so the
+# streamable-HTTP transport runs stateless and the caches that save upstream
+# requests are shared through a SharedStore file.
+WORKERS = int(os.environ.get("GERRIT_MCP_WORKERS", "1"))
+SHARED_STORE_PATH = os.environ.get("GERRIT_MCP_SHARED_STORE") or (
+    os.path.join(private_directory(), "shared.sqlite3")
+    if WORKERS > 1
+    else None
+)
+
+mcp = FastMCP("gerrit", stateless_http=WORKERS > 1)
 
 # --- Session State ---
 
+# Whole-revision patches downloaded by get_file_diff(use_patch_index=True),
+# keyed by (base_url, change_id, revision).
+_patch_index_cache = PatchIndexCache()
+
+# Comment threads of recently viewed changes, keyed by (base_url, change_id).
+_comment_thread_cache = CommentThreadCache()
+
+# Relation chains, submitted-together sets and topics of recently viewed
+# changes, keyed by (base_url, change number) and current revision.
+_change_graph = ChangeGraph()
+
+# Open local change indexes, keyed by database path.
+_local_change_indexes: Dict[str, LocalChangeIndex] = {}
+
+# The running sync of each host's local change index, keyed by base URL.
+_local_index_syncs: Dict[str, asyncio.Task] = {}
+
+# Shared by all worker processes when the server runs more than one.
+_shared_store: Optional[SharedStore] = SharedStore(SHARED_STORE_PATH) if SHARED_STORE_PATH else None
+
+# Accounts seen in responses or looked up, per host.
+_account_cache = AccountCache(store=_shared_store)
+
+# Created on first use from the "offload" configuration section.
+_offloader: Optional[Offloader] = None
+
+# Default limits for a single Gerrit request and for a whole tool call. Both
+# can be changed in the "timeouts" configuration section.
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 60
+DEFAULT_TOOL_TIMEOUT_SECONDS = 120
+_CURL_EXIT_GRACE_SECONDS = 5
+
+# Created on first use from the "admission" configuration section.
+_admission_controller: Optional[AdmissionController] = None
+
+# Created on first use from the "circuit_breaker" configuration section.
+_circuit_breakers: Optional[CircuitBreakers] = None
+
+# Created on first use if the "change_batching" configuration section enables it.
+_change_batcher: Optional[ChangeBatcher] = None
+
+# Created on first use from the "bulk_mutations" configuration section.
+_bulk_rate_limiters: Optional[RateLimiters] = None
+
+# Defaults of the "bulk_mutations" configuration section.
+DEFAULT_BULK_CONCURRENCY = 4
+DEFAULT_BULK_RATE_PER_SECOND = 5.0
+DEFAULT_BULK_MAX_CHANGES = 100
+# Checkpoints are kept in the "bulk" directory of private_directory() unless
+# "checkpoint_dir" is set.
+
+# Created on first use from the "dashboard" configuration section.
+_dashboard_cache: Optional[DashboardCache] = None
+DEFAULT_DASHBOARD_LIMIT = 25
+DEFAULT_DASHBOARD_TTL_SECONDS = 30
+
+# Created on first use from the "result_pages" configuration section.
+_result_store: Optional[ResultStore] = None
+DEFAULT_RESULT_PAGE_BYTES = 64 * 1024
+DEFAULT_RESULT_TTL_SECONDS = 600
+DEFAULT_RESULT_STORE_BYTES = 64 * 1024 * 1024
+
+# The ChangeInfo fields each tool renders, which determine the options it
+# requests; see field_masks.
+_QUERY_CHANGES_FIELDS = FieldMask("_number", "subject", "work_in_progress", "updated")
+# Accounts are rendered through the account cache, so get_change_details
+# does not ask for DETAILED_ACCOUNTS.
+_CHANGE_DETAILS_FIELDS = FieldMask(
+    "_number",
+    "subject",
+    "owner",
+    "status",
+    "revisions.commit",
+    "reviewers",
+    "labels.all",
+    "messages",
+)
+_STACK_FIELDS = FieldMask(
+    "_number", "subject", "status", "topic", "work_in_progress", "current_revision", "labels", "submittable"
+)
+_DASHBOARD_FIELDS = FieldMask("_number", "subject", "project", "updated", "work_in_progress")
+_CHANGE_INDEX_FIELDS = FieldMask(
+    "_number",
+    "project",
+    "branch",
+    "subject",
+    "status",
+    "created",
+    "updated",
+    "work_in_progress",
+    "owner.email",
+    "owner.name",
+    "revisions.commit",
+)
+_WATCH_FIELDS = FieldMask("_number", "subject", "status", "updated", "work_in_progress")
+_BULK_TARGET_FIELDS = FieldMask("_number", "subject")
+_CHANGE_UPDATED_FIELDS = FieldMask("updated")
+_CURRENT_REVISION_FIELDS = FieldMask("current_revision")
+
+# The options a stack member's state is computed from.
+_STACK_OPTIONS = _STACK_FIELDS.options()
+
+# The options that make a change query return what /changes/{id}/detail does.
+_DETAIL_OPTIONS = ("LABELS", "DETAILED_LABELS", "DETAILED_ACCOUNTS", "REVIEWER_UPDATES", "MESSAGES")
+
+# curl exit codes that mean the host could not be reached or did not answer:
+# DNS resolution, connect, timeout, TLS handshake, empty reply, send and
+# receive failures.
+_TRANSPORT_FAILURE_EXIT_CODES = frozenset({5, 6, 7, 28, 35, 52, 55, 56})
+
+
+def _record_curl_outcome(breaker: CircuitBreaker, returncode: int, status: Optional[int]):
+    """
+    Records the outcome of a request with its host's breaker. A transport
+    failure or a 5xx answer (e.g. from a gateway in front of a host that is
+    down) counts as a failure; any other answer, a 4xx included, shows that
+    the host is up.
+    """
+    if returncode in _TRANSPORT_FAILURE_EXIT_CODES or (status is not None and status >= 500):
+        breaker.record_failure()
+    elif returncode == 0:
+        breaker.record_success()
+    else:
+        breaker.record_abandoned()
+
+
+def _runtime_settings(section: str, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Returns an optional tuning section of the configuration, or {}."""
+    if config is None:
+        config = load_gerrit_config()
+    settings = config.get(section)
+    return settings if isinstance(settings, dict) else {}
+
+
+def _get_offloader() -> Offloader:
+    global _offloader
+    if _offloader is None:
+        _offloader = Offloader(**_runtime_settings("offload"))
+    return _offloader
+
+
+def _get_admission_controller() -> AdmissionController:
+    global _admission_controller
+    if _admission_controller is None:
+        settings = dict(_runtime_settings("admission"))
+        settings.pop("tool_costs", None)
+        _admission_controller = AdmissionController(**settings)
+    return _admission_controller
+
+
+def _get_circuit_breakers() -> CircuitBreakers:
+    global _circuit_breakers
+    if _circuit_breakers is None:
+        _circuit_breakers = CircuitBreakers(**_runtime_settings("circuit_breaker"))
+    return _circuit_breakers
+
+
+def _get_dashboard_cache() -> DashboardCache:
+    global _dashboard_cache
+    if _dashboard_cache is None:
+        settings = _runtime_settings("dashboard")
+        _dashboard_cache = DashboardCache(settings.get("ttl_seconds", DEFAULT_DASHBOARD_TTL_SECONDS))
+    return _dashboard_cache
+
+
+def _get_result_store() -> ResultStore:
+    global _result_store
+    if _result_store is None:
+        settings = _runtime_settings("result_pages")
+        _result_store = ResultStore(
+            settings.get("ttl_seconds", DEFAULT_RESULT_TTL_SECONDS),
+            settings.get("max_stored_bytes", DEFAULT_RESULT_STORE_BYTES),
+            store=_shared_store,
+        )
+    return _result_store
+
+
+def _result_page_budget(config: Optional[Dict[str, Any]] = None) -> int:
+    settings = _runtime_settings("result_pages", config)
+    return result_store.page_budget(
+        settings.get("page_bytes", DEFAULT_RESULT_PAGE_BYTES), settings.get("page_tokens")
+    )
+
+
+def _page_result(result: Any, config: Dict[str, Any]) -> Any:
+    """Cuts a single text result down to its first page, keeping the rest for get_result_page."""
+    if not (isinstance(result, list) and len(result) == 1 and result[0].get("type") == "text"):
+        return result
+    text = result[0]["text"]
+    page = result_store.paginate(_get_result_store(), text, _result_page_budget(config))
+    if page is text:
+        return result
+    return [{"type": "text", "text": page}]
+
+
+def _get_bulk_rate_limiters() -> RateLimiters:
+    global _bulk_rate_limiters
+    if _bulk_rate_limiters is None:
+        settings = _runtime_settings("bulk_mutations")
+        rate = settings.get("rate_per_second", DEFAULT_BULK_RATE_PER_SECOND)
+        _bulk_rate_limiters = RateLimiters(rate, settings.get("burst", max(1, int(rate))))
+    return _bulk_rate_limiters
+
+
+def _gerrit_tool(cost: int = 1, timeout_seconds: Optional[float] = None, paged: bool = False):
+    """
+    Registers an MCP tool whose calls go through admission control and run
+    under a deadline.
+
+    The cost is the share of the server's capacity a call holds while it runs;
+    it can be overridden per tool in the "tool_costs" of the "admission"
+    section. The deadline defaults to the "tool_seconds" of the "timeouts"
+    section and can be overridden per tool in its "tools". A call that runs
+    past its deadline is cancelled, which also stops its curl processes.
+
+    The output of a paged tool that exceeds the page budget of the
+    "result_pages" section is cut to its first page and a cursor for
+    get_result_page.
+    """
+
+    def decorator(func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            config = load_gerrit_config()
+            tool_cost = _runtime_settings("admission", config).get("tool_costs", {}).get(name, cost)
+            timeouts = _runtime_settings("timeouts", config)
+            deadline = timeouts.get("tools", {}).get(
+                name, timeout_seconds or timeouts.get("tool_seconds", DEFAULT_TOOL_TIMEOUT_SECONDS)
+            )
+            async with _get_admission_controller().admit(name, tool_cost):
+                timeout = asyncio.timeout(deadline)
+                try:
+                    async with timeout:
+                        result = await func(*args, **kwargs)
+                except TimeoutError:
+                    if not timeout.expired():
+                        raise
+                    metrics.increment(f"tool.{name}.timed_out")
+                    raise TimeoutError(f"{name} did not finish within {deadline} seconds.")
+            return _page_result(result, config) if paged else result
+
+        mcp.tool()(wrapper)
+        return wrapper
+
+    return decorator
+
+
+async def _parse_json(text: str) -> Any:
+    """Parses a JSON response, off the event loop if it is large."""
+    return await _get_offloader().run("parse", len(text), json_codec.loads, text)
+
 
 def _get_gerrit_base_url(gerrit_base_url: Optional[str] = None) -> str:
     """Returns the Gerrit base URL, prioritizing the parameter over the environment variable."""
@@ -182,63 +572,336 @@ def _normalize_gerrit_url(url: str, gerrit_hosts: List[Dict[str, Any]]) -> str:
     return normalized_url
 
 
-async def run_curl(args: List[str], gerrit_base_url: str) -> str:
-    """Executes a curl command and returns the output."""
-    config = load_gerrit_config()
-    command = get_curl_command_for_gerrit_url(gerrit_base_url, config) + args
+async def _run_curl_process(
+    command: List[str], breaker: CircuitBreaker, wait_seconds: float, stdin_data: Optional[bytes] = None
+) -> Tuple[int, bytes, bytes]:
+    """
+    Runs a curl process to completion and returns its exit code, stdout and
+    stderr. stdin_data is written to its stdin; without it, stdin is empty,
+    so that nothing waits on the server's own stdin. A process that outlives
+    wait_seconds, or whose caller is cancelled, is killed and reaped.
+    """
     with open(LOG_FILE_PATH, "a") as log_file:
         log_file.write(f"[gerrit-mcp-server] Executing: {" ".join(command)}\n")
 
-    process = await asyncio.create_subprocess_exec(
-        *command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE if stdin_data is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except BaseException:
+        breaker.record_abandoned()
+        raise
+    try:
+        # curl enforces the timeout itself; the extra wait only covers a curl
+        # (or gob-curl wrapper) that does not exit.
+        stdout, stderr = await asyncio.wait_for(process.communicate(stdin_data), wait_seconds)
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        # Timed out, or the tool call was cancelled: do not leave curl running.
+        if isinstance(e, asyncio.TimeoutError):
+            breaker.record_failure()
+        else:
+            breaker.record_abandoned()
+        await _kill_process(process)
+        with open(LOG_FILE_PATH, "a") as log_file:
+            log_file.write(f"[gerrit-mcp-server] curl command stopped: {" ".join(command)}\n")
+        raise
+    return process.returncode, stdout, stderr
+
 
-    stdout_str = stdout.decode()
-    stderr_str = stderr.decode()
+async def _exec_curl(args: List[str], gerrit_base_url: str, body: Optional[bytes] = None) -> bytes:
+    """Executes a curl command, with an optional request body on its stdin, and returns its raw stdout."""
+    config = load_gerrit_config()
+    timeout = _runtime_settings("timeouts", config).get(
+        "request_seconds", DEFAULT_REQUEST_TIMEOUT_SECONDS
+    )
+    command = get_curl_command_for_gerrit_url(gerrit_base_url, config) + [
+        "--max-time",
+        str(timeout),
+    ] + args
+    if "--write-out" not in args and "-w" not in args:
+        # curl does not fail on an HTTP error status; the breaker needs it.
+        command += ["--write-out", curl_batch.status_write_out()]
+    breaker = _get_circuit_breakers().get(host_key(gerrit_base_url))
+    breaker.before_call()
+    returncode, stdout, stderr = await _run_curl_process(
+        command, breaker, timeout + _CURL_EXIT_GRACE_SECONDS, stdin_data=body
+    )
+    status, stderr = curl_batch.split_status(stderr)
+    _record_curl_outcome(breaker, returncode, status)
 
+    # The response body is only decoded for the log when the command failed, so
+    # that large responses are not copied just to be logged.
+    stderr_str = stderr.decode(errors="replace")
     with open(LOG_FILE_PATH, "a") as log_file:
         log_file.write("[gerrit-mcp-server] curl command finished.\n")
-        log_file.write(f"[gerrit-mcp-server] stdout:\n{stdout_str}\n")
+        log_file.write(f"[gerrit-mcp-server] stdout: {len(stdout)} bytes\n")
         log_file.write(f"[gerrit-mcp-server] stderr:\n{stderr_str}\n")
 
-    if process.returncode != 0:
-        error_msg = f"curl command failed with exit code {process.returncode}.\nSTDERR:\n{stderr_str}"
+    if returncode != 0:
+        error_msg = f"curl command failed with exit code {returncode}.\nSTDERR:\n{stderr_str}"
         with open(LOG_FILE_PATH, "a") as log_file:
             log_file.write(f"[gerrit-mcp-server] {error_msg}\n")
+            log_file.write(f"[gerrit-mcp-server] stdout:\n{stdout.decode(errors='replace')}\n")
         raise Exception(error_msg)
 
-    # Gerrit prepends )]\' to JSON responses to prevent XSSI.
-    # We need to remove it before parsing.
-    if stdout_str.startswith(")]}'"):
-        stdout_str = stdout_str[4:]
+    return stdout
+
+
+# How long the command a curl wrapper resolved to is used for batches before
+# the wrapper is run again, e.g. for a refreshed credential.
+_WRAPPER_COMMAND_TTL_SECONDS = 300.0
+_WRAPPER_RESOLVE_TIMEOUT_SECONDS = 10.0
+
+# The plain curl command of a curl wrapper, by host key: the wrapper's prefix,
+# when to resolve it again, and the command or None if it cannot be resolved.
+_wrapper_commands: Dict[str, Tuple[Tuple[str, ...], float, Optional[List[str]]]] = {}
+
+
+async def _resolve_curl_wrapper(prefix: List[str], gerrit_base_url: str) -> Optional[List[str]]:
+    """
+    Returns the plain curl command, with the wrapper's authentication, that a
+    curl wrapper such as gob-curl runs for requests to a host, or None if it
+    cannot be determined. The wrapper is run against a stand-in curl found
+    first on its PATH; see curl_batch.
+    """
+    key = host_key(gerrit_base_url)
+    cached = _wrapper_commands.get(key)
+    if cached is not None and cached[0] == tuple(prefix) and cached[1] > time.monotonic():
+        return cached[2]
+
+    command = None
+    curl_path = shutil.which("curl")
+    if curl_path is not None:
+        # A harmless request, in case the wrapper does not run the stand-in.
+        probe_url = f"{gerrit_base_url}/config/server/version"
+        stdout = b""
+        with tempfile.TemporaryDirectory() as bin_dir:
+            stand_in = os.path.join(bin_dir, "curl")
+            with open(stand_in, "w") as f:
+                f.write(curl_batch.RESOLVER_SCRIPT)
+            os.chmod(stand_in, 0o700)
+            env = dict(os.environ, PATH=bin_dir + os.pathsep + os.environ.get("PATH", ""))
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *prefix,
+                    probe_url,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                    env=env,
+                )
+                try:
+                    stdout, _ = await asyncio.wait_for(
+                        process.communicate(), _WRAPPER_RESOLVE_TIMEOUT_SECONDS
+                    )
+                finally:
+                    await _kill_process(process)
+            except (OSError, asyncio.TimeoutError) as e:
+                with open(LOG_FILE_PATH, "a") as log_file:
+                    log_file.write(f"[gerrit-mcp-server] Could not run {prefix[0]} to resolve it: {e}\n")
+        args = curl_batch.parse_resolved_args(stdout, probe_url)
+        if args is not None:
+            command = [curl_path] + args
+    if command is None:
+        with open(LOG_FILE_PATH, "a") as log_file:
+            log_file.write(
+                f"[gerrit-mcp-server] {prefix[0]} could not be resolved to a curl command; "
+                f"batches to {key} run one process per request.\n"
+            )
+    _wrapper_commands[key] = (tuple(prefix), time.monotonic() + _WRAPPER_COMMAND_TTL_SECONDS, command)
+    return command
+
+
+async def run_curl_batch(
+    transfers: List[List[str]],
+    gerrit_base_url: str,
+    max_parallel: int = 16,
+    bodies: Optional[List[Optional[bytes]]] = None,
+) -> List[BatchResult]:
+    """
+    Executes several requests to the same host with a single curl process.
+    Each transfer is the argument list run_curl would have been given, and
+    bodies[i] the body it would have been given for transfers[i]. Returns
+    one result per transfer, in order; failed transfers do not raise.
+    """
+    if not transfers:
+        return []
+    config = load_gerrit_config()
+    timeout = _runtime_settings("timeouts", config).get(
+        "request_seconds", DEFAULT_REQUEST_TIMEOUT_SECONDS
+    )
+    prefix = get_curl_command_for_gerrit_url(gerrit_base_url, config)
+    if os.path.basename(prefix[0]) != "curl":
+        resolved = await _resolve_curl_wrapper(prefix, gerrit_base_url)
+        if resolved is None:
+            metrics.increment("curl_batch.unbatched_transfers", len(transfers))
+            return await _run_curl_transfers_separately(transfers, gerrit_base_url, max_parallel, bodies)
+        prefix = resolved
+    metrics.increment("curl_batch.batches")
+    metrics.increment("curl_batch.batched_transfers", len(transfers))
+    # The progress meter is global, so -s has to be on the command line too.
+    command = [prefix[0], "-s", "--parallel", "--parallel-max", str(max_parallel), "--config", "-"]
+    common_args = prefix[1:] + ["--max-time", str(timeout)]
+    breaker = _get_circuit_breakers().get(host_key(gerrit_base_url))
+    breaker.before_call()
+
+    waves = -(-len(transfers) // max_parallel)
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            curl_config = curl_batch.build_config(common_args, transfers, output_dir, bodies)
+            returncode, stdout, stderr = await _run_curl_process(
+                command,
+                breaker,
+                timeout * waves + _CURL_EXIT_GRACE_SECONDS,
+                stdin_data=curl_config.encode("utf-8"),
+            )
+            results = curl_batch.parse_results(stdout, len(transfers), output_dir)
+    except Exception:
+        # E.g. the body files could not be written: release a half-open probe.
+        breaker.record_abandoned()
+        raise
+
+    statuses = [result.status for result in results if result.status]
+    if any(status < 500 for status in statuses):
+        breaker.record_success()
+    elif statuses or all(result.exit_code in _TRANSPORT_FAILURE_EXIT_CODES for result in results):
+        breaker.record_failure()
+    else:
+        breaker.record_abandoned()
 
     with open(LOG_FILE_PATH, "a") as log_file:
-        log_file.write(f"[gerrit-mcp-server] JSON to parse:\n{stdout_str}\n")
+        failed = sum(1 for result in results if not result.ok)
+        log_file.write(
+            f"[gerrit-mcp-server] curl batch of {len(transfers)} finished with exit code "
+            f"{returncode}, {failed} failed.\n"
+        )
+        if failed:
+            log_file.write(f"[gerrit-mcp-server] stderr:\n{stderr.decode(errors='replace')}\n")
+    return results
+
+
+async def _run_curl_transfers_separately(
+    transfers: List[List[str]],
+    gerrit_base_url: str,
+    max_parallel: int,
+    bodies: Optional[List[Optional[bytes]]],
+) -> List[BatchResult]:
+    """
+    Runs the transfers of a batch for a curl wrapper that could not be
+    resolved to a curl command with one process each, at most max_parallel at
+    a time. A wrapper adds its authentication to its own command line only,
+    so the segments of a --config batch after the first would be sent
+    without it.
+    """
+    # Like a batch, fail fast as a whole while the host's circuit is open. The
+    # probe of a half-open circuit is left to the first transfer.
+    breaker = _get_circuit_breakers().get(host_key(gerrit_base_url))
+    breaker.check()
+    semaphore = asyncio.Semaphore(max_parallel)
+    errors: Dict[int, BatchResult] = {}
+
+    async def run(index: int, transfer: List[str], output_dir: str) -> bytes:
+        body = bodies[index] if bodies is not None else None
+        async with semaphore:
+            try:
+                return await _exec_curl(
+                    curl_batch.transfer_args(transfer, index, output_dir), gerrit_base_url, body
+                )
+            except Exception as e:
+                errors[index] = BatchResult(0, b"", error=str(e))
+                return b""
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        stdouts = []
+        pending = list(enumerate(transfers))
+        if breaker.state != CLOSED:
+            # The other transfers would be rejected while the probe runs.
+            index, transfer = pending.pop(0)
+            stdouts.append(await run(index, transfer, output_dir))
+        stdouts += await asyncio.gather(
+            *(run(index, transfer, output_dir) for index, transfer in pending)
+        )
+        results = curl_batch.parse_results(b"".join(stdouts), len(transfers), output_dir)
+    return [errors.get(index, result) for index, result in enumerate(results)]
+
+
+async def _kill_process(process: asyncio.subprocess.Process):
+    """Kills a subprocess that is still running and reaps it."""
+    if process.returncode is not None:
+        return
+    try:
+        process.kill()
+    except ProcessLookupError:
+        pass
+    await process.wait()
+
+
+async def run_curl(args: List[str], gerrit_base_url: str, body: Optional[bytes] = None) -> str:
+    """Executes a curl command, with the request body on its stdin, and returns the output."""
+    stdout = await _exec_curl(args, gerrit_base_url, body)
+    # Gerrit prepends )]}' to JSON responses to prevent XSSI. The prefix is
+    # skipped without copying, so the body is decoded exactly once.
+    return json_codec.decode_text(stdout)
 
-    return stdout_str.strip()
 
+async def run_curl_json(args: List[str], gerrit_base_url: str, body: Optional[bytes] = None) -> Any:
+    """
+    Executes a curl command and parses its output as JSON straight from the
+    response bytes. Returns None for an empty response. For a response that
+    is not JSON, raises a JSONDecodeError whose `doc` is the response text.
+    """
+    value, _ = await _run_curl_json_sized(args, gerrit_base_url, body)
+    return value
+
+
+async def _run_curl_json_sized(
+    args: List[str], gerrit_base_url: str, body: Optional[bytes] = None
+) -> Tuple[Any, int]:
+    """Like run_curl_json, and also returns the size of the response, which sizes the work of rendering it."""
+    stdout = await _exec_curl(args, gerrit_base_url, body)
+    data = json_codec.strip_xssi(stdout)
+    if not data:
+        return None, 0
+    try:
+        value = await _get_offloader().run("parse", len(data), json_codec.loads, data)
+    except json_codec.JSONDecodeError as e:
+        # Gerrit answers errors with plain text; keep it for the error message.
+        raise json_codec.JSONDecodeError(e.msg, json_codec.decode_text(stdout), e.pos) from None
+    return value, len(data)
+
+
+def _create_body_args(
+    method: str, url: str, payload: Optional[Dict[str, Any]]
+) -> Tuple[List[str], Optional[bytes]]:
+    """
+    Returns the curl arguments and the body of a request. The body is not on
+    the command line (`--data-binary @-`) but passed to run_curl, which writes
+    it to curl's stdin, so it is not limited by ARG_MAX and not visible in
+    the process table.
+    """
+    if not payload:
+        return ["-X", method, url], None
+    return (
+        ["-X", method, "-H", "Content-Type: application/json", "--data-binary", "@-", url],
+        json.dumps(payload).encode("utf-8"),
+    )
 
-def _create_post_args(url: str, payload: Optional[Dict[str, Any]] = None) -> List[str]:
-    """Creates the argument list for a curl POST request."""
-    args = ["-X", "POST"]
-    if payload:
-        payload_json = json.dumps(payload)
-        args.extend(["-H", "Content-Type: application/json", "--data", payload_json])
-    args.append(url)
-    return args
 
+def _create_post_args(
+    url: str, payload: Optional[Dict[str, Any]] = None
+) -> Tuple[List[str], Optional[bytes]]:
+    """Creates the argument list and body for a curl POST request."""
+    return _create_body_args("POST", url, payload)
 
-def _create_put_args(url: str, payload: Optional[Dict[str, Any]] = None) -> List[str]:
-    """Creates the argument list for a curl PUT request."""
-    args = ["-X", "PUT"]
-    if payload:
-        payload_json = json.dumps(payload)
-        args.extend(["-H", "Content-Type: application/json", "--data", payload_json])
-    args.append(url)
-    return args
+
+def _create_put_args(
+    url: str, payload: Optional[Dict[str, Any]] = None
+) -> Tuple[List[str], Optional[bytes]]:
+    """Creates the argument list and body for a curl PUT request."""
+    return _create_body_args("PUT", url, payload)
 
 
 def _create_delete_args(url: str) -> List[str]:
@@ -246,39 +909,203 @@ def _create_delete_args(url: str) -> List[str]:
     return ["-X", "DELETE", url]
 
 
+async def _fetch_accounts(base_url: str, account_ids: List[int]) -> List[Dict[str, Any]]:
+    """Looks up several accounts by ID with a single account query."""
+    query = " OR ".join(str(account_id) for account_id in account_ids)
+    url = f"{base_url}/accounts/?q={quote(query)}&o=DETAILS&n={len(account_ids)}"
+    result_json_str = await run_curl([url], base_url)
+    return json_codec.loads(result_json_str) if result_json_str else []
+
+
+async def _fill_in_accounts(base_url: str, payload: Any):
+    """Completes accounts that a response only references by _account_id."""
+    await _account_cache.fill_in(base_url, payload, _fetch_accounts)
+
+
+async def _fetch_change(
+    base_url: str, change_id: str, options: Tuple[str, ...] = (), detail: bool = False
+) -> Dict[str, Any]:
+    """Fetches the ChangeInfo of one change, or its /detail with detail=True."""
+    url = f"{base_url}/changes/{change_id}{'/detail' if detail else ''}"
+    if options:
+        url += "?" + "&".join(f"o={option}" for option in options)
+    return await run_curl_json([url], base_url)
+
+
+async def _fetch_changes_by_id(
+    base_url: str, change_ids: List[str], options: Tuple[str, ...], detail: bool
+) -> List[Dict[str, Any]]:
+    """Fetches several changes with a single `change:A OR change:B` query."""
+    if detail:
+        options = tuple(sorted(set(options) | set(_DETAIL_OPTIONS)))
+    query = " OR ".join(f"change:{change_id}" for change_id in change_ids)
+    url = f"{base_url}/changes/?q={quote(query)}&n={len(change_ids) * 2}"
+    url += "".join(f"&o={option}" for option in options)
+    return await run_curl_json([url], base_url) or []
+
+
+def _get_change_batcher() -> Optional[ChangeBatcher]:
+    global _change_batcher
+    settings = dict(_runtime_settings("change_batching"))
+    if not settings.pop("enabled", False):
+        return None
+    if _change_batcher is None:
+        _change_batcher = ChangeBatcher(_fetch_changes_by_id, _fetch_change, **settings)
+    return _change_batcher
+
+
+async def _get_change(
+    base_url: str, change_id: str, options: Tuple[str, ...] = (), detail: bool = False
+) -> Dict[str, Any]:
+    """
+    Looks up one change. With change batching enabled, concurrent lookups on
+    the same host are merged into a single change query.
+    """
+    batcher = _get_change_batcher()
+    if batcher is None:
+        return await _fetch_change(base_url, change_id, options, detail)
+    return await batcher.get(base_url, change_id, options, detail)
+
+
+async def _fetch_stack_edges(base_url: str, change: Dict[str, Any]) -> StackEdges:
+    """Fetches the relation chain, submitted-together set and topic of a change concurrently."""
+    number = change["_number"]
+    requests = [
+        run_curl([f"{base_url}/changes/{number}/revisions/current/related"], base_url),
+        run_curl([f"{base_url}/changes/{number}/submitted_together?o=NON_VISIBLE_CHANGES"], base_url),
+    ]
+    topic = change.get("topic")
+    if topic:
+        topic_query = quote(f'topic:"{topic}"')
+        requests.append(run_curl([f"{base_url}/changes/?q={topic_query}&n=100"], base_url))
+    responses = await asyncio.gather(*requests)
+    related, outdated = change_graph.parse_related(
+        await _parse_json(responses[0]) if responses[0] else {}
+    )
+    together, non_visible = change_graph.parse_submitted_together(
+        await _parse_json(responses[1]) if responses[1] else []
+    )
+    topic_changes = (await _parse_json(responses[2]) or []) if topic and responses[2] else []
+    return StackEdges(
+        related,
+        [str(c["_number"]) for c in together],
+        [str(c["_number"]) for c in topic_changes],
+        non_visible,
+        outdated,
+    )
+
+
+async def _get_stack(
+    base_url: str, change_id: str
+) -> Tuple[Dict[str, Any], StackEdges, Dict[str, Dict[str, Any]]]:
+    """
+    Returns a change, its cached (or freshly fetched) stack edges and the
+    current state of every member, looked up concurrently. If a member turns
+    out to have a new revision, the edges are fetched again once.
+    """
+    seed = await _get_change(base_url, change_id, _STACK_OPTIONS)
+    number = str(seed["_number"])
+    revision = seed.get("current_revision")
+    _change_graph.observe(base_url, number, revision)
+    for _ in range(2):
+        edges = _change_graph.get(base_url, number, revision)
+        if edges is None:
+            edges = await _fetch_stack_edges(base_url, seed)
+            _change_graph.put(base_url, number, revision, edges)
+        others = [member for member in edges.members() if member != number]
+        fetched = await asyncio.gather(
+            *(_get_change(base_url, member, _STACK_OPTIONS) for member in others),
+            return_exceptions=True,
+        )
+        changes = {number: seed}
+        moved = False
+        for member, change in zip(others, fetched):
+            if isinstance(change, BaseException):
+                # Not visible, or gone; reported as such.
+                continue
+            changes[member] = change
+            moved = _change_graph.observe(base_url, member, change.get("current_revision")) or moved
+        if not moved:
+            break
+    return seed, edges, changes
+
+
 # --- Tool Implementations ---
 
 
-@mcp.tool()
+@_gerrit_tool(cost=2, paged=True)
 async def query_changes(
     query: str,
     gerrit_base_url: Optional[str] = None,
     limit: Optional[int] = None,
     options: Optional[List[str]] = None,
+    select: Optional[Dict[str, Any]] = None,
 ):
     """
     Searches for CLs matching a given query string.
+
+    Args:
+        select: Optionally keeps only some of the changes and fields, evaluated
+            on the server over the ChangeInfo of each change. For example
+            {"where": {"labels.Code-Review.all.value": -1}, "fields": ["_number",
+            "subject", "owner.email"], "limit": 10}. "where" maps dotted field
+            paths to a value or to operators (eq, ne, lt, le, gt, ge, in,
+            not_in, contains (case-insensitive), startswith, exists); all, any
+            and not combine conditions. A path that reaches a list matches if
+            any element does. "fields" renders only those paths of each row.
+            The options the paths need are requested automatically.
     """
+    return await _query_changes(query, gerrit_base_url, limit, options, select)
+
+
+async def _query_changes(
+    query: str,
+    gerrit_base_url: Optional[str] = None,
+    limit: Optional[int] = None,
+    options: Optional[List[str]] = None,
+    select: Optional[Dict[str, Any]] = None,
+):
+    """
+    Runs a change query for a tool. Tools that build their own query call
+    this instead of the query_changes tool, so that a call is only admitted
+    once.
+    """
+    try:
+        selection = Selection.from_spec(select)
+    except SelectionError as e:
+        return [{"type": "text", "text": f"Invalid select: {e}"}]
     config = load_gerrit_config()
     gerrit_hosts = config.get("gerrit_hosts", [])
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
     url = f"{base_url}/changes/?q={quote(query)}"
     if limit:
         url += f"&n={limit}"
-    if options:
-        for option in options:
-            url += f"&o={option}"
+    mask = _QUERY_CHANGES_FIELDS
+    if selection is not None:
+        mask = mask | FieldMask.for_paths(selection.paths())
+    for option in mask.options(options or ()):
+        url += f"&o={option}"
 
-    result_json_str = await run_curl([url], base_url)
     try:
-        changes = json.loads(result_json_str)
-    except json.JSONDecodeError:
+        changes, size = await _run_curl_json_sized([url], base_url)
+    except json.JSONDecodeError as e:
         return [
             {
                 "type": "text",
-                "text": f"Failed to parse JSON response from Gerrit. Raw response: '{result_json_str}'",
+                "text": f"Failed to parse JSON response from Gerrit. Raw response: '{e.doc}'",
             }
         ]
+    changes = changes or []
+    if selection is not None:
+        changes = selection.apply(changes)
+        if selection.fields is not None:
+            title = f'Changes for query "{query}"'
+            return [{"type": "text", "text": row_filters.format_rows(title, changes, selection)}]
+    return await _get_offloader().run("render", size, _format_change_list, changes, query)
+
+
+def _format_change_list(changes: List[Dict[str, Any]], query: str, footer: str = ""):
+    """Renders the result of a change query, newest first."""
     changes = sort_changes_by_date(changes)
 
     if not changes:
@@ -288,11 +1115,196 @@ async def query_changes(
     for change in changes:
         wip_prefix = "[WIP] " if change.get("work_in_progress") else ""
         output += f"- {change["_number"]}: {wip_prefix}{change["subject"]}\n"
+    output += footer
+
+    return [{"type": "text", "text": output}]
+
+
+def _get_local_change_index(
+    config: Dict[str, Any], base_url: str
+) -> Optional[Tuple[LocalChangeIndex, Dict[str, Any]]]:
+    """
+    Returns the local change index and its settings if it is enabled for the
+    given host, or None.
+    """
+    settings = config.get("local_change_index")
+    if not settings:
+        return None
+    gerrit_hosts = config.get("gerrit_hosts", [])
+    hosts = [_normalize_gerrit_url(h, gerrit_hosts) for h in settings.get("hosts", [])]
+    if base_url not in hosts:
+        return None
+    path = os.path.expanduser(
+        settings.get("path", "~/.cache/gerrit-mcp-server/change_index.sqlite3")
+    )
+    if path not in _local_change_indexes:
+        _local_change_indexes[path] = LocalChangeIndex(path)
+    return _local_change_indexes[path], settings
+
+
+_SYNC_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+async def _sync_local_change_index(
+    index: LocalChangeIndex,
+    base_url: str,
+    sync_since: str,
+    page_size: int = 500,
+    window_days: int = 30,
+) -> int:
+    """
+    Fetches the changes updated since the last sync into the local index.
+
+    History is fetched in windows of `window_days`, oldest first, and the
+    cursor is saved after each window, so that an interrupted sync resumes
+    where it stopped and the windows already fetched can be served meanwhile.
+    """
+    state = index.sync_state(base_url)
+    cursor = state["cursor"] if state and state["sync_since"] == sync_since else None
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+    synced = 0
+    while True:
+        # Gerrit timestamps carry nanoseconds; query with second precision and
+        # let the overlap be absorbed by the upsert.
+        if cursor:
+            window_start = datetime.datetime.strptime(cursor[:19], _SYNC_TIME_FORMAT)
+            query = f'after:"{cursor[:19]}"'
+        else:
+            window_start = datetime.datetime.strptime(sync_since, "%Y-%m-%d")
+            query = f"after:{sync_since}"
+        window_end = window_start + datetime.timedelta(days=window_days)
+        last_window = window_end >= now
+        if not last_window:
+            query += f' before:"{window_end.strftime(_SYNC_TIME_FORMAT)}"'
+
+        window_synced, newest = await _fetch_into_local_change_index(index, base_url, query, page_size)
+        synced += window_synced
+        if last_window:
+            if newest and (cursor is None or newest > cursor):
+                cursor = newest
+            break
+        cursor = window_end.strftime(_SYNC_TIME_FORMAT)
+        index.save_cursor(base_url, sync_since, cursor)
+
+    index.finish_sync(base_url, sync_since, cursor)
+    return synced
+
+
+async def _fetch_into_local_change_index(
+    index: LocalChangeIndex, base_url: str, query: str, page_size: int
+) -> Tuple[int, Optional[str]]:
+    """Pages through a query into the local index; returns the number of changes and the newest `updated`."""
+    newest = None
+    synced = 0
+    start = 0
+    while True:
+        url = (
+            f"{base_url}/changes/?q={quote(query)}"
+            + "".join(f"&o={option}" for option in _CHANGE_INDEX_FIELDS.options())
+            + f"&n={page_size}&S={start}"
+        )
+        changes = await run_curl_json([url], base_url)
+        if not changes:
+            break
+        index.upsert_changes(base_url, changes)
+        synced += len(changes)
+        page_newest = max(c.get("updated", "") for c in changes)
+        newest = page_newest if newest is None else max(newest, page_newest)
+        if not changes[-1].get("_more_changes"):
+            break
+        start += len(changes)
+    return synced, newest
+
+
+def _start_local_change_index_sync(
+    index: LocalChangeIndex, base_url: str, settings: Dict[str, Any]
+) -> asyncio.Task:
+    """
+    Returns the running sync of a host's local index, starting one in the
+    background if none is running. The sync is not bound to the deadline of
+    the tool call that started it.
+    """
+    task = _local_index_syncs.get(base_url)
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.create_task(
+            _sync_local_change_index(
+                index,
+                base_url,
+                settings.get("sync_since", "2020-01-01"),
+                window_days=settings.get("sync_window_days", 30),
+            )
+        )
+        _local_index_syncs[base_url] = task
+        task.add_done_callback(functools.partial(_finish_local_change_index_sync, base_url))
+    return task
+
+
+def _finish_local_change_index_sync(base_url: str, task: asyncio.Task):
+    if _local_index_syncs.get(base_url) is task:
+        del _local_index_syncs[base_url]
+    if not task.cancelled() and task.exception() is not None:
+        with open(LOG_FILE_PATH, "a") as log_file:
+            log_file.write(
+                f"[gerrit-mcp-server] Error syncing local change index for {base_url}: "
+                f"{task.exception()}\n"
+            )
+
+
+@_gerrit_tool(cost=4)
+async def get_dashboard(refresh: bool = False, gerrit_base_url: Optional[str] = None):
+    """
+    Shows the user's review dashboard: the changes that need their attention,
+    that they are reviewing, that they own and that they are CC'd on (or the
+    sections configured in the "dashboard" section). Each change is listed
+    once, under the first section it is in. Results are cached for a few
+    seconds; use refresh=True to query again.
+    """
+    config = load_gerrit_config()
+    gerrit_hosts = config.get("gerrit_hosts", [])
+    base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
+    settings = _runtime_settings("dashboard", config)
+    sections = dashboard.sections_from_settings(settings)
+    limit = settings.get("limit", DEFAULT_DASHBOARD_LIMIT)
+
+    cache = _get_dashboard_cache()
+    key = (base_url, limit, tuple((s.name, s.query, s.options) for s in sections))
+    if not refresh:
+        cached = cache.get(key)
+        if cached is not None:
+            return [{"type": "text", "text": cached}]
+
+    async def run_section(section: dashboard.Section) -> List[Dict[str, Any]]:
+        url = f"{base_url}/changes/?q={quote(section.query)}&n={limit}"
+        url += "".join(f"&o={option}" for option in _DASHBOARD_FIELDS.options())
+        result_str = await run_curl([url], base_url)
+        return await _parse_json(result_str) if result_str else []
+
+    responses = await asyncio.gather(*(run_section(s) for s in sections), return_exceptions=True)
+    results = []
+    errors = {}
+    for section, response in zip(sections, responses):
+        if isinstance(response, BaseException):
+            errors[section.name] = str(response)
+            response = []
+        results.append(response)
+    board = dashboard.Dashboard(sections, results, errors)
+
+    options = dashboard.union_options(sections)
+    if options and board.changes:
+        board.update(
+            await _fetch_changes_by_id(
+                base_url, list(board.changes), _DASHBOARD_FIELDS.options(options), False
+            )
+        )
 
+    output = dashboard.format_dashboard(board)
+    if not errors:
+        cache.put(key, output)
     return [{"type": "text", "text": output}]
 
 
-@mcp.tool()
+@_gerrit_tool(cost=2, paged=True)
 async def query_changes_by_date_and_filters(  # Renamed method
     start_date: str,  # Format YYYY-MM-DD
     end_date: str,  # Format YYYY-MM-DD
@@ -346,13 +1358,60 @@ async def query_changes_by_date_and_filters(  # Renamed method
 
     full_query = " ".join(query_parts)
 
-    # Re-use the existing 'query_changes' tool to execute the constructed query
-    return await query_changes(
-        query=full_query, gerrit_base_url=gerrit_base_url, limit=limit
+    # Settled history that is already in the local change index is answered
+    # without a round trip to Gerrit.
+    config = load_gerrit_config()
+    base_url = _normalize_gerrit_url(
+        _get_gerrit_base_url(gerrit_base_url), config.get("gerrit_hosts", [])
     )
+    local_index = _get_local_change_index(config, base_url)
+    if local_index:
+        index, settings = local_index
+        start_str = parsed_start_date.strftime("%Y-%m-%d")
+        state = index.sync_state(base_url)
+        if (
+            not state
+            or not state["synced_at"]
+            or state["sync_since"] != settings.get("sync_since", "2020-01-01")
+            or time.time() - state["synced_at"] > settings.get("sync_interval_seconds", 3600)
+        ):
+            # The sync runs in the background; until it reaches the range,
+            # the query goes to Gerrit.
+            _start_local_change_index_sync(index, base_url, settings)
+        if index.covers(base_url, status, start_str, effective_end_date_str):
+            changes = index.query(
+                base_url,
+                status,
+                start_str,
+                effective_end_date_str,
+                project=project,
+                message_substring=message_substring,
+                limit=limit,
+            )
+            return _format_change_list(
+                changes, full_query, footer="(Served from the local change index.)\n"
+            )
+
+    return await _query_changes(full_query, gerrit_base_url=gerrit_base_url, limit=limit)
+
+
+def _index_votes_by_account(labels: Dict[str, Any]) -> Dict[Any, List[str]]:
+    """
+    Groups the rendered votes of every label by the voter's _account_id in a
+    single pass, in label order.
+    """
+    votes_by_account: Dict[Any, List[str]] = {}
+    for label, info in labels.items():
+        for vote in info.get("all", []):
+            vote_value = vote.get("value", 0)
+            vote_str = f"+{vote_value}" if vote_value > 0 else str(vote_value)
+            votes_by_account.setdefault(vote.get("_account_id"), []).append(
+                f"{label}: {vote_str}"
+            )
+    return votes_by_account
 
 
-@mcp.tool()
+@_gerrit_tool(cost=2, paged=True)
 async def get_change_details(
     change_id: str,
     gerrit_base_url: Optional[str] = None,
@@ -365,23 +1424,13 @@ async def get_change_details(
     gerrit_hosts = config.get("gerrit_hosts", [])
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
 
-    # Always get the commit message and other details
-    base_options = ["CURRENT_REVISION", "CURRENT_COMMIT", "DETAILED_LABELS"]
-    if options:
-        # Combine with user-provided options, ensuring no duplicates
-        options = list(set(base_options + options))
-    else:
-        options = base_options
-
-    query_params = "&".join([f"o={option}" for option in options])
-    url = f"{base_url}/changes/{change_id}/detail?{query_params}"
-
-    result_json_str = await run_curl([url], base_url)
-    details = json.loads(result_json_str)
+    # Only the options for the rendered fields, plus any the caller asked for.
+    details = await _get_change(base_url, change_id, _CHANGE_DETAILS_FIELDS.options(options or ()))
+    await _fill_in_accounts(base_url, details)
 
     output = f"Summary for CL {details['_number']}:\n"
     output += f"Subject: {details['subject']}\n"
-    output += f"Owner: {details['owner']['email']}\n"
+    output += f"Owner: {details['owner'].get('email', details['owner'].get('name', 'N/A'))}\n"
     output += f"Status: {details['status']}\n"
 
     # Extract and display bugs from commit message
@@ -397,17 +1446,9 @@ async def get_change_details(
 
     if "reviewers" in details and "REVIEWER" in details["reviewers"]:
         output += "Reviewers:\n"
+        votes_by_account = _index_votes_by_account(details.get("labels", {}))
         for reviewer in details["reviewers"]["REVIEWER"]:
-            votes = []
-            if "labels" in details:
-                for label, info in details["labels"].items():
-                    for vote in info.get("all", []):
-                        if vote.get("_account_id") == reviewer.get("_account_id"):
-                            vote_value = vote.get("value", 0)
-                            vote_str = (
-                                f"+{vote_value}" if vote_value > 0 else str(vote_value)
-                            )
-                            votes.append(f"{label}: {vote_str}")
+            votes = votes_by_account.get(reviewer.get("_account_id"), [])
             reviewer_email = reviewer.get("email", "N/A")
             output += f"- {reviewer_email} ({', '.join(votes)})\n"
 
@@ -422,7 +1463,7 @@ async def get_change_details(
     return [{"type": "text", "text": output}]
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def get_commit_message(
     change_id: str,
     gerrit_base_url: Optional[str] = None,
@@ -437,7 +1478,7 @@ async def get_commit_message(
 
     try:
         result_str = await run_curl([url], base_url)
-        commit_info = json.loads(result_str)
+        commit_info = json_codec.loads(result_str)
 
         output = f"Commit message for CL {change_id}:\n"
         output += f"Subject: {commit_info.get('subject', 'N/A')}\n\n"
@@ -473,27 +1514,43 @@ async def get_commit_message(
         ]
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def list_change_files(
-    change_id: str, gerrit_base_url: Optional[str] = None
+    change_id: str, gerrit_base_url: Optional[str] = None, select: Optional[Dict[str, Any]] = None
 ):
     """
     Lists all files modified in the most recent patch set of a CL.
+    select filters and projects the files like the select of query_changes;
+    each file has path, status, lines_inserted, lines_deleted, size_delta
+    and old_path.
     """
+    try:
+        selection = Selection.from_spec(select)
+    except SelectionError as e:
+        return [{"type": "text", "text": f"Invalid select: {e}"}]
     config = load_gerrit_config()
     gerrit_hosts = config.get("gerrit_hosts", [])
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
     url = f"{base_url}/changes/{change_id}/revisions/current/files/"
     result_json_str = await run_curl([url], base_url)
-    files = json.loads(result_json_str)
+    files = await _parse_json(result_json_str)
 
     # We need the revision number for the patch set
     detail_url = f"{base_url}/changes/{change_id}/detail"
     detail_json_str = await run_curl([detail_url], base_url)
-    details = json.loads(detail_json_str)
+    details = json_codec.loads(detail_json_str)
     patch_set = details.get("current_revision_number", "current")
 
-    output = f"Files in CL {change_id} (Patch Set {patch_set}):\n"
+    title = f"Files in CL {change_id} (Patch Set {patch_set})"
+    if selection is not None:
+        rows = selection.apply(
+            dict(info, path=path) for path, info in files.items() if path != "/COMMIT_MSG"
+        )
+        if selection.fields is not None:
+            return [{"type": "text", "text": row_filters.format_rows(title, rows, selection)}]
+        files = {row.pop("path"): row for row in rows}
+
+    output = f"{title}:\n"
     for file_path, file_info in files.items():
         if file_path == "/COMMIT_MSG":
             continue
@@ -506,53 +1563,185 @@ async def list_change_files(
     return [{"type": "text", "text": output}]
 
 
-@mcp.tool()
+async def _get_patch_index(base_url: str, change_id: str) -> PatchIndex:
+    """
+    Downloads the whole current revision patch once and indexes it by file.
+    The index is kept by revision, so a new patch set is downloaded again once
+    the remembered current revision expires.
+    """
+    revision = _patch_index_cache.get_revision((base_url, change_id))
+    if revision is None:
+        change = await _get_change(base_url, change_id, _CURRENT_REVISION_FIELDS.options())
+        revision = change.get("current_revision")
+        if not revision:
+            raise ValueError(f"Cannot find the current revision. Response: {change}")
+        _patch_index_cache.put_revision((base_url, change_id), revision)
+
+    async def build() -> PatchIndex:
+        fd, zip_path = tempfile.mkstemp(suffix=".zip")
+        os.close(fd)
+        try:
+            url = f"{base_url}/changes/{change_id}/revisions/{revision}/patch?zip"
+            await run_curl(["-o", zip_path, url], base_url)
+            return await asyncio.to_thread(PatchIndex.from_zip_file, zip_path)
+        finally:
+            os.remove(zip_path)
+
+    return await _patch_index_cache.get_or_build((base_url, change_id, revision), build)
+
+
+@_gerrit_tool(cost=4, paged=True)
 async def get_file_diff(
-    change_id: str, file_path: str, gerrit_base_url: Optional[str] = None
+    change_id: str,
+    file_path: str,
+    gerrit_base_url: Optional[str] = None,
+    use_patch_index: bool = False,
 ):
     """
     Retrieves the diff for a single, specified file within a CL.
+    Set use_patch_index when reading many files of the same CL: the whole
+    revision patch is downloaded once and later files are served locally.
     """
     config = load_gerrit_config()
     gerrit_hosts = config.get("gerrit_hosts", [])
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
+
+    if use_patch_index:
+        try:
+            index = await _get_patch_index(base_url, change_id)
+        except ValueError as e:
+            return [{"type": "text", "text": f"Failed to get patch for CL {change_id}: {e}"}]
+        diff_text = index.get_file_diff(file_path)
+        if diff_text is None:
+            return [
+                {
+                    "type": "text",
+                    "text": f"File {file_path} not found in the patch for CL {change_id}.",
+                }
+            ]
+        return [{"type": "text", "text": diff_text}]
+
     encoded_file_path = quote(file_path, safe="")
     url = f"{base_url}/changes/{change_id}/revisions/current/patch?path={encoded_file_path}"
 
     diff_base64 = await run_curl([url], base_url)
     # The response is a base64 encoded string, we need to decode it.
-    # The result from run_curl is already a string, so we encode it back to bytes for b64decode
-    diff_text = base64.b64decode(diff_base64.encode("utf-8")).decode("utf-8")
+    diff_text = await _get_offloader().run(
+        "decode", len(diff_base64), json_codec.decode_base64_text, diff_base64
+    )
     return [{"type": "text", "text": diff_text}]
 
 
-@mcp.tool()
+async def _refresh_comment_threads(base_url: str, change_id: str) -> CommentThreadIndex:
+    """
+    Returns the cached thread index for a change, downloading the comments
+    again only if the change was updated since they were last fetched.
+    """
+    index = _comment_thread_cache.get_or_create((base_url, change_id))
+    change_info = await _get_change(base_url, change_id, _CHANGE_UPDATED_FIELDS.options())
+    updated = change_info.get("updated")
+    if index.change_updated is None or index.change_updated != updated:
+        comments_url = f"{base_url}/changes/{change_id}/comments"
+        comments_by_file = await run_curl_json([comments_url], base_url) or {}
+        await _fill_in_accounts(base_url, comments_by_file)
+        index.merge(comments_by_file)
+        index.change_updated = updated
+    return index
+
+
+@_gerrit_tool(cost=2, paged=True)
 async def list_change_comments(
-    change_id: str, gerrit_base_url: Optional[str] = None
+    change_id: str,
+    gerrit_base_url: Optional[str] = None,
+    threaded: bool = False,
+    only_changed: bool = False,
+    select: Optional[Dict[str, Any]] = None,
+    ctx: Optional[Context] = None,
 ):
     """
     list_change_comments is useful for reviewing feedback, reading comments on a change, analyzing comments, and responding to comments.
+    Set threaded to group replies under their root comment with each thread's resolution state.
+    Set only_changed to return only the threads that changed since your last only_changed call for this CL.
+    select filters and projects like the select of query_changes, e.g. {"where": {"unresolved": true, "author.email": "a@example.com"}}.
+    The rows are comments (path, line, message, unresolved, author, updated, id) or, when threaded, threads (path, line, unresolved, last_updated, comments).
     """
+    try:
+        selection = Selection.from_spec(select)
+    except SelectionError as e:
+        return [{"type": "text", "text": f"Invalid select: {e}"}]
     config = load_gerrit_config()
     gerrit_hosts = config.get("gerrit_hosts", [])
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
+
+    if threaded or only_changed:
+        try:
+            index = await _refresh_comment_threads(base_url, change_id)
+        except json.JSONDecodeError as e:
+            return [
+                {
+                    "type": "text",
+                    "text": f"Failed to parse JSON response from Gerrit for CL {change_id}: {e}",
+                }
+            ]
+        if only_changed:
+            session = ctx.session if ctx is not None else None
+            threads = index.changed_since_last_view(session)
+            if not threads:
+                return [
+                    {
+                        "type": "text",
+                        "text": f"No comment threads changed on CL {change_id} since the last view.",
+                    }
+                ]
+        else:
+            threads = index.threads()
+            if not threads:
+                return [{"type": "text", "text": f"No comments found for CL {change_id}."}]
+        if selection is not None:
+            threads = selection.apply(threads, lambda thread: thread.as_row())
+            if selection.fields is not None:
+                title = f"Comment threads for CL {change_id}"
+                rows = [thread.as_row() for thread in threads]
+                return [{"type": "text", "text": row_filters.format_rows(title, rows, selection)}]
+            if not threads:
+                return [{"type": "text", "text": f"No comment threads on CL {change_id} match the selection."}]
+        return [{"type": "text", "text": format_threads(change_id, threads)}]
+
     url = f"{base_url}/changes/{change_id}/comments"
-    result_json_str = await run_curl([url], base_url)
     try:
-        comments_by_file = json.loads(result_json_str)
-    except json.JSONDecodeError:
+        comments_by_file, size = await _run_curl_json_sized([url], base_url)
+    except json.JSONDecodeError as e:
         return [
             {
                 "type": "text",
-                "text": f"Failed to parse JSON response from Gerrit. Raw response:\n{result_json_str}",
+                "text": f"Failed to parse JSON response from Gerrit. Raw response:\n{e.doc}",
             }
         ]
+    comments_by_file = comments_by_file or {}
+
+    await _fill_in_accounts(base_url, comments_by_file)
 
+    if not comments_by_file:
+        return [{"type": "text", "text": f"No comments found for CL {change_id}."}]
+
+    if selection is not None:
+        rows = selection.apply(row_filters.file_rows(comments_by_file))
+        if selection.fields is not None:
+            title = f"Comments for CL {change_id}"
+            return [{"type": "text", "text": row_filters.format_rows(title, rows, selection)}]
+        if not rows:
+            return [{"type": "text", "text": f"No comments on CL {change_id} match the selection."}]
+        comments_by_file = row_filters.group_by_path(rows)
+
+    output = await _get_offloader().run("render", size, _format_comments, change_id, comments_by_file)
+    return [{"type": "text", "text": output}]
+
+
+def _format_comments(change_id: str, comments_by_file: Dict[str, List[Dict[str, Any]]]) -> str:
+    """Renders comments flat, file by file."""
     output = f"Comments for CL {change_id}:\n"
-    found_comments = False
     for file_path, comments in comments_by_file.items():
         output += f"---\nFile: {file_path}\n"
-        found_comments = True
         for comment in comments:
             line = comment.get("line", "File")
             author = comment.get("author", {}).get("name", "Unknown")
@@ -562,14 +1751,10 @@ async def list_change_comments(
             comment_id = comment.get("id", "")
             output += f"L{line}: [{author}] ({timestamp}) - {status} id={comment_id}\n"
             output += f"  {message}\n"
-
-    if not found_comments:
-        return [{"type": "text", "text": f"No comments found for CL {change_id}."}]
-
-    return [{"type": "text", "text": output}]
+    return output
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def add_reviewer(
     change_id: str,
     reviewer: str,
@@ -592,12 +1777,13 @@ async def add_reviewer(
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
     url = f"{base_url}/changes/{change_id}/reviewers"
     payload = {"reviewer": reviewer, "state": state}
-    args = _create_post_args(url, payload)
+    args, body = _create_post_args(url, payload)
 
     try:
-        result_str = await run_curl(args, base_url)
+        result_str = await run_curl(args, base_url, body=body)
         try:
-            result_data = json.loads(result_str)
+            result_data = json_codec.loads(result_str)
+            _account_cache.seed(base_url, result_data)
             if "error" in result_data:
                 return [
                     {
@@ -629,7 +1815,59 @@ async def add_reviewer(
         raise e
 
 
-@mcp.tool()
+@_gerrit_tool()
+async def add_reviewers(
+    change_id: str,
+    reviewers: Optional[List[str]] = None,
+    ccs: Optional[List[str]] = None,
+    notify: Optional[str] = None,
+    gerrit_base_url: Optional[str] = None,
+):
+    """
+    Adds several users or groups to a CL as reviewers and/or CCs in a single
+    request, so that one notification is sent. notify can be NONE, OWNER,
+    OWNER_REVIEWERS or ALL. Either all of them are added or none are.
+    """
+    try:
+        payload = reviewer_batch.review_input(reviewers, ccs, notify)
+    except ValueError as e:
+        return [{"type": "text", "text": f"No reviewers were added: {e}."}]
+
+    config = load_gerrit_config()
+    gerrit_hosts = config.get("gerrit_hosts", [])
+    base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
+    url = f"{base_url}/changes/{change_id}/revisions/current/review"
+    args, body = _create_post_args(url, payload)
+
+    try:
+        result_str = await run_curl(args, base_url, body=body)
+        try:
+            result = json_codec.loads(result_str)
+        except json.JSONDecodeError:
+            result = result_str
+        _account_cache.seed(base_url, result)
+        outcomes = reviewer_batch.entry_results(payload, result)
+        failed = [o for o in outcomes if not o["ok"]]
+        if failed:
+            output = f"Failed to add reviewers to CL {change_id}; none were added.\n"
+        else:
+            output = f"Added {len(outcomes)} reviewer(s) and CC(s) to CL {change_id}.\n"
+        for outcome in outcomes:
+            if outcome["ok"]:
+                detail = ", ".join(outcome["accounts"]) or "already added"
+                output += f"- {outcome['reviewer']} as {outcome['state']}: {detail}\n"
+            else:
+                output += f"- {outcome['reviewer']} as {outcome['state']}: FAILED: {outcome['error']}\n"
+        return [{"type": "text", "text": output}]
+    except Exception as e:
+        with open(LOG_FILE_PATH, "a") as log_file:
+            log_file.write(
+                f"[gerrit-mcp-server] Error adding reviewers to CL {change_id}: {e}\n"
+            )
+        raise e
+
+
+@_gerrit_tool()
 async def set_ready_for_review(
     change_id: str,
     gerrit_base_url: Optional[str] = None,
@@ -641,10 +1879,10 @@ async def set_ready_for_review(
     gerrit_hosts = config.get("gerrit_hosts", [])
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
     url = f"{base_url}/changes/{change_id}/ready"
-    args = _create_post_args(url)
+    args, body = _create_post_args(url)
 
     try:
-        result_json = await run_curl(args, base_url)
+        result_json = await run_curl(args, base_url, body=body)
         if result_json:
             return [
                 {
@@ -661,7 +1899,7 @@ async def set_ready_for_review(
         raise e
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def set_work_in_progress(
     change_id: str,
     message: Optional[str] = None,
@@ -675,10 +1913,10 @@ async def set_work_in_progress(
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
     url = f"{base_url}/changes/{change_id}/wip"
     payload = {"message": message} if message else None
-    args = _create_post_args(url, payload)
+    args, body = _create_post_args(url, payload)
 
     try:
-        result_json = await run_curl(args, base_url)
+        result_json = await run_curl(args, base_url, body=body)
         if result_json:
             return [
                 {
@@ -695,7 +1933,7 @@ async def set_work_in_progress(
         raise e
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def revert_change(
     change_id: str,
     message: Optional[str] = None,
@@ -709,11 +1947,11 @@ async def revert_change(
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
     url = f"{base_url}/changes/{change_id}/revert"
     payload = {"message": message} if message else None
-    args = _create_post_args(url, payload)
+    args, body = _create_post_args(url, payload)
 
     try:
-        result_str = await run_curl(args, base_url)
-        revert_info = json.loads(result_str)
+        result_str = await run_curl(args, base_url, body=body)
+        revert_info = json_codec.loads(result_str)
         if "id" in revert_info and "_number" in revert_info:
             output = (
                 f"Successfully reverted CL {change_id}.\n"
@@ -741,7 +1979,7 @@ async def revert_change(
         raise e
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def revert_submission(
     change_id: str,
     message: Optional[str] = None,
@@ -755,11 +1993,11 @@ async def revert_submission(
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
     url = f"{base_url}/changes/{change_id}/revert_submission"
     payload = {"message": message} if message else None
-    args = _create_post_args(url, payload)
+    args, body = _create_post_args(url, payload)
 
     try:
-        result_str = await run_curl(args, base_url)
-        submission_info = json.loads(result_str)
+        result_str = await run_curl(args, base_url, body=body)
+        submission_info = json_codec.loads(result_str)
         if "revert_changes" in submission_info:
             output = f"Successfully reverted submission for CL {change_id}.\n"
             output += "Created revert changes:\n"
@@ -788,7 +2026,7 @@ async def revert_submission(
         raise e
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def create_change(
     project: str,
     subject: str,
@@ -815,20 +2053,10 @@ async def create_change(
     if status:
         payload["status"] = status
 
-    payload_json = json.dumps(payload)
-
-    args = [
-        "-X",
-        "POST",
-        "-H",
-        "Content-Type: application/json",
-        "--data",
-        payload_json,
-        url,
-    ]
+    args, body = _create_post_args(url, payload)
 
     try:
-        result_str = await run_curl(args, base_url)
+        result_str = await run_curl(args, base_url, body=body)
         if not result_str.startswith("{"):
             return [
                 {
@@ -837,7 +2065,7 @@ async def create_change(
                 }
             ]
 
-        change_info = json.loads(result_str)
+        change_info = json_codec.loads(result_str)
         if "id" in change_info and "_number" in change_info:
             output = (
                 f"Successfully created new change {change_info['_number']}.\n"
@@ -862,7 +2090,7 @@ async def create_change(
         ]
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def set_topic(
     change_id: str,
     topic: str,
@@ -876,58 +2104,46 @@ async def set_topic(
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
     url = f"{base_url}/changes/{change_id}/topic"
 
-    payload = json.dumps({"topic": topic})
-    args = ["-X", "PUT", "-H", "Content-Type: application/json", "--data", payload, url]
+    args, body = _create_put_args(url, {"topic": topic})
 
     try:
-        result_str = await run_curl(args, base_url)
-
-        if not result_str:
-            return [
-                {
-                    "type": "text",
-                    "text": f"Topic successfully deleted from CL {change_id}.",
-                }
-            ]
+        result_str = await run_curl(args, base_url, body=body)
+    except Exception as e:
+        return [
+            {
+                "type": "text",
+                "text": f"An error occurred while setting the topic for CL {change_id}: {e}",
+            }
+        ]
 
-        new_topic = json.loads(result_str)
+    if not result_str:
         return [
             {
                 "type": "text",
-                "text": f"Successfully set topic for CL {change_id} to: {new_topic}",
+                "text": f"Topic successfully deleted from CL {change_id}.",
             }
         ]
 
-    except Exception as e:
-        # Check if the exception is a JSONDecodeError and try to get the response text
-        if isinstance(e, json.JSONDecodeError):
-            # The raw response is not directly available in the exception,
-            # so we have to re-run the command to get the raw output for the error message.
-            # This is not ideal, but it's the most reliable way to get the error message.
-            try:
-                raw_response = await run_curl(args, base_url)
-                return [
-                    {
-                        "type": "text",
-                        "text": f"Failed to set topic for CL {change_id}. Response: {raw_response}",
-                    }
-                ]
-            except Exception as inner_e:
-                return [
-                    {
-                        "type": "text",
-                        "text": f"An error occurred while setting the topic for CL {change_id}: {inner_e}",
-                    }
-                ]
+    try:
+        new_topic = json_codec.loads(result_str)
+    except json.JSONDecodeError:
+        # Gerrit answers errors with plain text. The PUT is not sent again,
+        # since repeating a mutation could undo it.
         return [
             {
                 "type": "text",
-                "text": f"An error occurred while setting the topic for CL {change_id}: {e}",
+                "text": f"Failed to set topic for CL {change_id}. Response: {result_str}",
             }
         ]
+    return [
+        {
+            "type": "text",
+            "text": f"Successfully set topic for CL {change_id} to: {new_topic}",
+        }
+    ]
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def changes_submitted_together(
     change_id: str,
     gerrit_base_url: Optional[str] = None,
@@ -952,7 +2168,7 @@ async def changes_submitted_together(
                 {"type": "text", "text": "This change would be submitted by itself."}
             ]
 
-        data = json.loads(result_str)
+        data = json_codec.loads(result_str)
 
         changes = []
         non_visible_changes = 0
@@ -993,7 +2209,37 @@ async def changes_submitted_together(
         ]
 
 
-@mcp.tool()
+@_gerrit_tool(cost=2)
+async def get_stack_status(change_id: str, gerrit_base_url: Optional[str] = None):
+    """
+    Answers whether a whole stack is ready to submit: lists every CL of the
+    relation chain, submitted-together set and topic of a CL with its label
+    states, and which CLs block submission and why.
+    """
+    config = load_gerrit_config()
+    gerrit_hosts = config.get("gerrit_hosts", [])
+    base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
+
+    try:
+        seed, edges, changes = await _get_stack(base_url, change_id)
+    except json.JSONDecodeError as e:
+        return [
+            {
+                "type": "text",
+                "text": f"Failed to get the stack of CL {change_id}. Response: {e.doc}",
+            }
+        ]
+    except Exception as e:
+        with open(LOG_FILE_PATH, "a") as log_file:
+            log_file.write(
+                f"[gerrit-mcp-server] Error getting the stack of CL {change_id}: {e}\n"
+            )
+        raise e
+    output = change_graph.format_stack(str(seed["_number"]), edges, changes, seed.get("topic"))
+    return [{"type": "text", "text": output}]
+
+
+@_gerrit_tool()
 async def suggest_reviewers(
     change_id: str,
     query: str,
@@ -1022,9 +2268,10 @@ async def suggest_reviewers(
         if not result_str:
             return [{"type": "text", "text": "No reviewers found for the given query."}]
 
-        reviewers = json.loads(result_str)
+        reviewers = json_codec.loads(result_str)
         if not reviewers:
             return [{"type": "text", "text": "No reviewers found for the given query."}]
+        _account_cache.seed(base_url, reviewers)
 
         output = "Suggested reviewers:\n"
         for suggestion in reviewers:
@@ -1053,7 +2300,7 @@ async def suggest_reviewers(
         ]
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def abandon_change(
     change_id: str,
     message: Optional[str] = None,
@@ -1067,11 +2314,11 @@ async def abandon_change(
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
     url = f"{base_url}/changes/{change_id}/abandon"
     payload = {"message": message} if message else None
-    args = _create_post_args(url, payload)
+    args, body = _create_post_args(url, payload)
 
     try:
-        result_str = await run_curl(args, base_url)
-        abandon_info = json.loads(result_str)
+        result_str = await run_curl(args, base_url, body=body)
+        abandon_info = json_codec.loads(result_str)
         if "id" in abandon_info and abandon_info.get("status") == "ABANDONED":
             output = (
                 f"Successfully abandoned CL {change_id}.\n"
@@ -1100,7 +2347,7 @@ async def abandon_change(
         raise e
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def get_most_recent_cl(
     user: str, gerrit_base_url: Optional[str] = None
 ):
@@ -1113,7 +2360,7 @@ async def get_most_recent_cl(
     query = f"owner:{user}"
     url = f"{base_url}/changes/?q={quote(query)}&n=1"
     result_json_str = await run_curl([url], base_url)
-    changes = json.loads(result_json_str)
+    changes = json_codec.loads(result_json_str)
 
     if not changes:
         return [{"type": "text", "text": f"No changes found for user: {user}"}]
@@ -1126,7 +2373,7 @@ async def get_most_recent_cl(
     return [{"type": "text", "text": output}]
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def get_bugs_from_cl(
     change_id: str, gerrit_base_url: Optional[str] = None
 ):
@@ -1142,7 +2389,7 @@ async def get_bugs_from_cl(
         return [
             {"type": "text", "text": f"No commit message found for CL {change_id}."}
         ]
-    details = json.loads(result_json_str)
+    details = json_codec.loads(result_json_str)
 
     commit_message = details.get("message")
 
@@ -1170,7 +2417,7 @@ async def get_bugs_from_cl(
     ]
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def post_review_comment(
     change_id: str,
     file_path: str,
@@ -1202,10 +2449,10 @@ async def post_review_comment(
     if labels:
         payload["labels"] = labels
 
-    args = _create_post_args(url, payload)
+    args, body = _create_post_args(url, payload)
 
     try:
-        result_str = await run_curl(args, base_url)
+        result_str = await run_curl(args, base_url, body=body)
         # A successful response should contain the updated review information
         if '"done": true' in result_str or '"labels"' in result_str or '"comments"' in result_str:
             return [
@@ -1229,7 +2476,7 @@ async def post_review_comment(
         raise e
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def post_draft_comment(
     change_id: str,
     file_path: str,
@@ -1278,11 +2525,11 @@ async def post_draft_comment(
         # Gerrit requires line to equal end_line when a range is provided.
         payload["line"] = end_line
 
-    args = _create_put_args(url, payload)
+    args, body = _create_put_args(url, payload)
 
     try:
-        result_str = await run_curl(args, base_url)
-        result = json.loads(result_str)
+        result_str = await run_curl(args, base_url, body=body)
+        result = json_codec.loads(result_str)
         if "id" in result:
             return [
                 {
@@ -1305,13 +2552,110 @@ async def post_draft_comment(
         raise e
 
 
-@mcp.tool()
+@_gerrit_tool(cost=2)
+async def post_comments(
+    change_id: str,
+    comments: List[Dict[str, Any]],
+    as_drafts: bool = False,
+    message: Optional[str] = None,
+    labels: Optional[Dict[str, int]] = None,
+    unresolved: bool = True,
+    gerrit_base_url: Optional[str] = None,
+):
+    """
+    Posts many inline comments on a CL at once. Each comment is an object with
+    file_path and message, and optionally line_number (omit for a file
+    comment), start_line/start_character/end_line/end_character, suggestion,
+    in_reply_to and unresolved. All comments are validated before anything is
+    sent. By default they are published in a single review, together with the
+    optional message and labels; with as_drafts=True they are saved as drafts.
+    """
+    config = load_gerrit_config()
+    gerrit_hosts = config.get("gerrit_hosts", [])
+    base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
+
+    try:
+        inputs = comment_batch.comment_inputs(comments, unresolved)
+    except comment_batch.CommentBatchError as e:
+        return [{"type": "text", "text": f"No comments were posted: {e}"}]
+
+    if as_drafts:
+        if message or labels:
+            return [
+                {
+                    "type": "text",
+                    "text": "A message or labels can only be sent with published comments.",
+                }
+            ]
+        # A review cannot create drafts, so the drafts are created with one
+        # request each, all through a single curl process.
+        url = f"{base_url}/changes/{change_id}/revisions/current/drafts"
+        transfers, bodies = zip(*(_create_put_args(url, comment) for comment in inputs))
+        try:
+            results = await run_curl_batch(list(transfers), base_url, bodies=list(bodies))
+        except Exception as e:
+            results = [BatchResult(0, b"", error=str(e))] * len(inputs)
+        errors = [
+            f"  {comment['path']}:{comment.get('line', 'file')}: {result.describe_error()}"
+            for comment, result in zip(inputs, results)
+            if not result.ok
+        ]
+        output = f"Created {len(inputs) - len(errors)} draft comment(s) on CL {change_id}."
+        if errors:
+            output += f"\n{len(errors)} error(s):\n" + "\n".join(errors)
+        return [{"type": "text", "text": output}]
+
+    url = f"{base_url}/changes/{change_id}/revisions/current/review"
+    payload: Dict[str, Any] = {"comments": comment_batch.review_comments(inputs)}
+    if message:
+        payload["message"] = message
+    if labels:
+        payload["labels"] = labels
+    args, body = _create_post_args(url, payload)
+
+    try:
+        result_str = await run_curl(args, base_url, body=body)
+        try:
+            review_result = json_codec.loads(result_str)
+        except json.JSONDecodeError:
+            review_result = None
+        if not isinstance(review_result, dict) or "error" in review_result:
+            return [
+                {
+                    "type": "text",
+                    "text": f"Failed to post comments. Response: {result_str}",
+                }
+            ]
+        output = (
+            f"Posted {len(inputs)} comment(s) on {len(payload['comments'])} file(s) "
+            f"of CL {change_id} in one review."
+        )
+        if review_result.get("labels"):
+            output += " Labels: " + ", ".join(
+                f"{label} {value:+d}" for label, value in review_result["labels"].items()
+            )
+        return [{"type": "text", "text": output}]
+    except Exception as e:
+        with open(LOG_FILE_PATH, "a") as log_file:
+            log_file.write(
+                f"[gerrit-mcp-server] Error posting comments to CL {change_id}: {e}\n"
+            )
+        raise e
+
+
+@_gerrit_tool()
 async def list_draft_comments(
-    change_id: str, gerrit_base_url: Optional[str] = None
+    change_id: str, gerrit_base_url: Optional[str] = None, select: Optional[Dict[str, Any]] = None
 ):
     """
     Lists all draft comments on a CL.
+    select filters and projects the drafts like the select of query_changes;
+    each draft has path, id, line, message, unresolved and updated.
     """
+    try:
+        selection = Selection.from_spec(select)
+    except SelectionError as e:
+        return [{"type": "text", "text": f"Invalid select: {e}"}]
     config = load_gerrit_config()
     gerrit_hosts = config.get("gerrit_hosts", [])
     base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
@@ -1319,13 +2663,22 @@ async def list_draft_comments(
 
     result_str = await run_curl([url], base_url)
     try:
-        drafts_by_file = json.loads(result_str)
+        drafts_by_file = await _parse_json(result_str)
     except json.JSONDecodeError:
         return [{"type": "text", "text": f"Failed to parse drafts response.\n{result_str}"}]
 
     if not drafts_by_file:
         return [{"type": "text", "text": f"No draft comments on CL {change_id}."}]
 
+    if selection is not None:
+        rows = selection.apply(row_filters.file_rows(drafts_by_file))
+        if selection.fields is not None:
+            title = f"Draft comments on CL {change_id}"
+            return [{"type": "text", "text": row_filters.format_rows(title, rows, selection)}]
+        if not rows:
+            return [{"type": "text", "text": f"No draft comments on CL {change_id} match the selection."}]
+        drafts_by_file = row_filters.group_by_path(rows)
+
     output = f"Draft comments on CL {change_id}:\n"
     total = 0
     for file_path, drafts in drafts_by_file.items():
@@ -1348,7 +2701,7 @@ async def _delete_draft_comment(base_url: str, change_id: str, draft_id: str):
     await run_curl(_create_delete_args(delete_url), base_url)
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def delete_draft_comment(
     change_id: str, draft_id: str, gerrit_base_url: Optional[str] = None
 ):
@@ -1370,7 +2723,7 @@ async def delete_draft_comment(
         raise e
 
 
-@mcp.tool()
+@_gerrit_tool(cost=2)
 async def delete_draft_comments(
     change_id: str, gerrit_base_url: Optional[str] = None
 ):
@@ -1385,25 +2738,39 @@ async def delete_draft_comments(
     list_url = f"{base_url}/changes/{change_id}/revisions/current/drafts"
     result_str = await run_curl([list_url], base_url)
     try:
-        drafts_by_file = json.loads(result_str)
+        drafts_by_file = json_codec.loads(result_str)
     except json.JSONDecodeError:
         return [{"type": "text", "text": f"Failed to parse drafts response.\n{result_str}"}]
 
     if not drafts_by_file:
         return [{"type": "text", "text": f"No draft comments to delete on CL {change_id}."}]
 
+    targets = [
+        (file_path, draft["id"])
+        for file_path, drafts in drafts_by_file.items()
+        for draft in drafts
+        if draft.get("id")
+    ]
     deleted = 0
     errors = []
-    for file_path, drafts in drafts_by_file.items():
-        for draft in drafts:
-            draft_id = draft.get("id")
-            if not draft_id:
-                continue
-            try:
-                await _delete_draft_comment(base_url, change_id, draft_id)
-                deleted += 1
-            except Exception as e:
-                errors.append(f"  Failed to delete {draft_id} on {file_path}: {e}")
+    try:
+        # All deletes go through one curl process instead of one per draft.
+        results = await run_curl_batch(
+            [
+                _create_delete_args(
+                    f"{base_url}/changes/{change_id}/revisions/current/drafts/{draft_id}"
+                )
+                for _, draft_id in targets
+            ],
+            base_url,
+        )
+    except Exception as e:
+        results = [BatchResult(0, b"", error=str(e))] * len(targets)
+    for (file_path, draft_id), result in zip(targets, results):
+        if result.ok:
+            deleted += 1
+        else:
+            errors.append(f"  Failed to delete {draft_id} on {file_path}: {result.describe_error()}")
 
     output = f"Deleted {deleted} draft comment(s) on CL {change_id}."
     if errors:
@@ -1411,7 +2778,7 @@ async def delete_draft_comments(
     return [{"type": "text", "text": output}]
 
 
-@mcp.tool()
+@_gerrit_tool()
 async def publish_drafts(
     change_id: str,
     message: Optional[str] = None,
@@ -1435,10 +2802,10 @@ async def publish_drafts(
     if labels:
         payload["labels"] = labels
 
-    args = _create_post_args(url, payload)
+    args, body = _create_post_args(url, payload)
 
     try:
-        await run_curl(args, base_url)
+        await run_curl(args, base_url, body=body)
         return [
             {
                 "type": "text",
@@ -1453,6 +2820,275 @@ async def publish_drafts(
         raise e
 
 
+@_gerrit_tool(cost=8, timeout_seconds=900)
+async def bulk_mutate_changes(
+    action: str,
+    query: Optional[str] = None,
+    change_ids: Optional[List[str]] = None,
+    message: Optional[str] = None,
+    topic: Optional[str] = None,
+    labels: Optional[Dict[str, int]] = None,
+    reviewers: Optional[List[str]] = None,
+    ccs: Optional[List[str]] = None,
+    notify: Optional[str] = None,
+    dry_run: bool = False,
+    restart: bool = False,
+    gerrit_base_url: Optional[str] = None,
+):
+    """
+    Applies one action to every CL matching a query, or to a list of CLs.
+    Actions: abandon, set_topic, set_work_in_progress, set_ready_for_review,
+    review (a message and/or label votes) and add_reviewers (reviewers and
+    ccs, with optional notify). Use dry_run=True to see which
+    CLs would be changed. Progress is checkpointed until every CL succeeds:
+    calling again with the same arguments skips the CLs that already
+    succeeded, unless restart=True.
+    """
+    config = load_gerrit_config()
+    gerrit_hosts = config.get("gerrit_hosts", [])
+    base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
+
+    bulk_action = bulk_mutations.ACTIONS.get(action)
+    if bulk_action is None:
+        return [
+            {
+                "type": "text",
+                "text": f"Unknown action '{action}'. Supported actions: "
+                + ", ".join(sorted(bulk_mutations.ACTIONS)),
+            }
+        ]
+    if bool(query) == bool(change_ids):
+        return [{"type": "text", "text": "Provide either a query or a list of change_ids."}]
+    params = {
+        "message": message,
+        "topic": topic,
+        "labels": labels,
+        "reviewers": reviewers,
+        "ccs": ccs,
+        "notify": notify,
+    }
+    missing = [name for name in bulk_action.required if not params.get(name)]
+    if missing:
+        return [{"type": "text", "text": f"The {action} action requires: {', '.join(missing)}."}]
+    try:
+        bulk_action.request(base_url, "0", params)
+    except ValueError as e:
+        return [{"type": "text", "text": f"Invalid arguments for {action}: {e}"}]
+
+    settings = _runtime_settings("bulk_mutations", config)
+    max_changes = settings.get("max_changes", DEFAULT_BULK_MAX_CHANGES)
+    selector = {"query": query} if query else {"change_ids": change_ids}
+    job_id = bulk_mutations.job_id_for(base_url, action, params, selector)
+    checkpoint = Checkpoint(
+        os.path.join(settings.get("checkpoint_dir") or private_directory("bulk"), f"{job_id}.json")
+    )
+    if restart:
+        checkpoint.delete()
+        checkpoint = Checkpoint(checkpoint.path)
+
+    if checkpoint.targets is None or dry_run:
+        if query:
+            # One more than the limit, to tell a query that matches too many
+            # CLs from one that matches exactly max_changes.
+            url = f"{base_url}/changes/?q={quote(query)}&n={max_changes + 1}"
+            url += "".join(f"&o={option}" for option in _BULK_TARGET_FIELDS.options())
+            changes = await _parse_json(await run_curl([url], base_url)) or []
+        else:
+            changes = [{"_number": change_id} for change_id in change_ids]
+        if len(changes) > max_changes:
+            return [
+                {
+                    "type": "text",
+                    "text": f"More than {max_changes} CLs match; narrow the query or "
+                    f"raise max_changes in the bulk_mutations configuration.",
+                }
+            ]
+        if dry_run:
+            return [{"type": "text", "text": bulk_mutations.format_plan(bulk_action, changes, job_id)}]
+        # The targets are fixed when a job starts, so that resuming it acts on
+        # the same CLs even after the mutations changed what the query matches.
+        checkpoint.targets = [str(change["_number"]) for change in changes]
+        checkpoint.save()
+
+    limiter = _get_bulk_rate_limiters().get(host_key(base_url))
+
+    concurrency = settings.get("concurrency", DEFAULT_BULK_CONCURRENCY)
+
+    async def execute_batch(change_ids: List[str]) -> List[Tuple[bool, str]]:
+        transfers, bodies = [], []
+        for change_id in change_ids:
+            method, url, payload = bulk_action.request(base_url, change_id, params)
+            create_args = _create_put_args if method == "PUT" else _create_post_args
+            args, body = create_args(url, payload)
+            transfers.append(args)
+            bodies.append(body)
+            await limiter.acquire()
+        outcomes = []
+        results = await run_curl_batch(transfers, base_url, max_parallel=concurrency, bodies=bodies)
+        for result in results:
+            error = bulk_action.check(result.text()) if result.ok else result.describe_error()
+            outcomes.append((error is None, error or ""))
+        return outcomes
+
+    outcomes = await bulk_mutations.run_bulk(
+        checkpoint.targets, execute_batch, batch_size=concurrency, checkpoint=checkpoint
+    )
+    if all(outcome.ok for outcome in outcomes):
+        # A finished job is forgotten, so that calling again applies it anew.
+        checkpoint.delete()
+    for outcome in outcomes:
+        if not outcome.ok:
+            with open(LOG_FILE_PATH, "a") as log_file:
+                log_file.write(
+                    f"[gerrit-mcp-server] Bulk {action} failed on CL {outcome.change_id}: "
+                    f"{outcome.detail}\n"
+                )
+    return [{"type": "text", "text": bulk_mutations.format_outcomes(bulk_action, outcomes, job_id)}]
+
+
+@_gerrit_tool(cost=8, timeout_seconds=900)
+async def sync_local_change_index(gerrit_base_url: Optional[str] = None):
+    """
+    Syncs the local change index for a host with the changes updated since the
+    last sync. Only available for hosts listed under local_change_index in the
+    server configuration.
+    """
+    config = load_gerrit_config()
+    gerrit_hosts = config.get("gerrit_hosts", [])
+    base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
+    local_index = _get_local_change_index(config, base_url)
+    if not local_index:
+        return [
+            {
+                "type": "text",
+                "text": f"The local change index is not enabled for {base_url}.",
+            }
+        ]
+
+    index, settings = local_index
+    # Joins a sync a query already started; a call that times out leaves it
+    # running, and the next call joins it again.
+    synced = await asyncio.shield(_start_local_change_index_sync(index, base_url, settings))
+
+    state = index.sync_state(base_url)
+    return [
+        {
+            "type": "text",
+            "text": (
+                f"Synced {synced} changes from {base_url} into the local change index. "
+                f"Covers changes updated from {state['sync_since']} to "
+                f"{state['cursor'] or state['sync_since']}."
+            ),
+        }
+    ]
+
+
+async def _poll_watch_query(base_url: str, query: str) -> List[Dict[str, Any]]:
+    """Runs a watch poll, with only the options for the fields a watch shows."""
+    url = f"{base_url}/changes/?q={quote(query)}"
+    url += "".join(f"&o={option}" for option in _WATCH_FIELDS.options())
+    return await run_curl_json([url], base_url) or []
+
+
+async def _notify_watch_updated(session: Any, uri: str):
+    """Tells a subscribed MCP session that a watch resource has new state."""
+    await session.send_resource_updated(uri)
+
+
+_change_watcher = ChangeWatcher(poll=_poll_watch_query, notify=_notify_watch_updated)
+
+
+@mcp.resource("gerrit-watch://{watch_id}")
+async def read_watch(watch_id: str) -> str:
+    """The latest known state of the changes covered by a watch."""
+    watch = _change_watcher.get(watch_id)
+    if watch is None:
+        return f"No active watch with ID {watch_id}."
+    return format_watch(watch)
+
+
+@_gerrit_tool()
+async def watch_changes(
+    change_id: Optional[str] = None,
+    query: Optional[str] = None,
+    gerrit_base_url: Optional[str] = None,
+    ctx: Optional[Context] = None,
+):
+    """
+    Watches a CL or a change query for updates instead of polling for them.
+    The server polls Gerrit in the background and sends a resources/updated
+    notification for the returned watch resource whenever a matching change
+    is added, updated or drops out of the query. Read the resource to get the
+    latest state. Watchers of the same CL or query share a single poller.
+    """
+    if bool(change_id) == bool(query):
+        return [{"type": "text", "text": "Provide exactly one of change_id or query."}]
+    if ctx is None:
+        return [{"type": "text", "text": "Watching changes requires an MCP session."}]
+    if mcp.settings.stateless_http:
+        # Notifications need a session that outlives a single request.
+        return [
+            {
+                "type": "text",
+                "text": "Watching changes is not available when the server runs multiple workers.",
+            }
+        ]
+
+    config = load_gerrit_config()
+    gerrit_hosts = config.get("gerrit_hosts", [])
+    base_url = _normalize_gerrit_url(_get_gerrit_base_url(gerrit_base_url), gerrit_hosts)
+    watch_query = f"change:{change_id}" if change_id else query
+
+    try:
+        watch = await _change_watcher.watch(base_url, watch_query, ctx.session)
+    except Exception as e:
+        with open(LOG_FILE_PATH, "a") as log_file:
+            log_file.write(f"[gerrit-mcp-server] Error watching '{watch_query}': {e}\n")
+        return [{"type": "text", "text": f"Failed to watch '{watch_query}': {e}"}]
+
+    output = f"Watching with ID {watch.id}. Updates are announced for {watch.uri}.\n"
+    output += format_watch(watch)
+    return [{"type": "text", "text": output}]
+
+
+@_gerrit_tool()
+async def unwatch_changes(watch_id: str, ctx: Optional[Context] = None):
+    """
+    Stops watching a CL or query previously registered with watch_changes.
+    """
+    session = ctx.session if ctx is not None else None
+    if session is None or not _change_watcher.unwatch(watch_id, session):
+        return [{"type": "text", "text": f"You are not watching {watch_id}."}]
+    return [{"type": "text", "text": f"Stopped watching {watch_id}."}]
+
+
+@_gerrit_tool()
+async def get_result_page(cursor: str):
+    """
+    Returns the next page of a tool result that was too large to return at
+    once. Pass the cursor from the end of the previous page. Pages are served
+    from the server without querying Gerrit again.
+    """
+    try:
+        page = result_store.read_page(_get_result_store(), cursor, _result_page_budget())
+    except ValueError as e:
+        return [{"type": "text", "text": str(e)}]
+    if page is None:
+        return [
+            {
+                "type": "text",
+                "text": f"The result for cursor '{cursor}' has expired. Run the original tool again.",
+            }
+        ]
+    return [{"type": "text", "text": page}]
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> JSONResponse:
+    """Serves the server metrics as JSON (HTTP transport only)."""
+    return JSONResponse(metrics.snapshot())
+
+
 def cli_main(argv: List[str]):
     """
     The main entry point for the command-line interface.
@@ -1473,8 +3109,28 @@ def cli_main(argv: List[str]):
             default=6322,
             help="Port to bind the server to. Defaults to 6322 (close to 'gerrit' in leetspeak).",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=WORKERS,
+            help="Number of worker processes. More than one runs stateless HTTP.",
+        )
         args = parser.parse_args(argv[1:])
 
+        if args.workers > 1:
+            # Every worker imports this module afresh and reads its settings
+            # from the environment.
+            import uvicorn
+
+            os.environ["GERRIT_MCP_WORKERS"] = str(args.workers)
+            uvicorn.run(
+                "gerrit_mcp_server.main:app",
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+            )
+            return
+
         # Update the server's settings with the parsed arguments
         mcp.settings.host = args.host
         mcp.settings.port = args.port
@@ -0,0 +1,64 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module keeps simple in-process server metrics: counters, gauges and
+timing summaries. They are exposed as JSON on the `/metrics` HTTP route.
+"""
+
+import threading
+from typing import Any, Dict
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_gauges: Dict[str, Any] = {}
+_timings: Dict[str, Dict[str, float]] = {}
+
+
+def increment(name: str, value: float = 1):
+    """Adds to a counter."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def set_gauge(name: str, value: Any):
+    """Records the current value of a gauge."""
+    with _lock:
+        _gauges[name] = value
+
+
+def observe(name: str, seconds: float):
+    """Adds a duration to a timing summary."""
+    with _lock:
+        summary = _timings.setdefault(name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+        summary["count"] += 1
+        summary["total_seconds"] += seconds
+        summary["max_seconds"] = max(summary["max_seconds"], seconds)
+
+
+def snapshot() -> Dict[str, Any]:
+    """Returns a copy of all metrics."""
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "timings": {name: dict(summary) for name, summary in _timings.items()},
+        }
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _timings.clear()
@@ -0,0 +1,125 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module moves CPU-heavy parsing, decoding and rendering of large responses
+off the asyncio event loop so that one big response does not stall every other
+session. Work below a size threshold runs inline, where a pool hop would cost
+more than it saves.
+
+JSON parsing and base64 decoding run in C code that holds the GIL for the
+whole call, so a thread would stall the event loop just as much as running
+them inline. By default they run in a process pool, and rendering, which is
+Python code that releases the GIL between bytecodes, runs in a thread pool
+(see benchmarks/bench_offload.py).
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import multiprocessing
+import time
+from typing import Any, Callable, Dict, Optional
+
+from gerrit_mcp_server import json_codec, metrics
+
+DEFAULT_THRESHOLD_BYTES = 256 * 1024
+
+# The kinds of work that hold the GIL throughout, run in processes by "auto".
+PROCESS_KINDS = frozenset({"parse", "decode"})
+
+_EXECUTORS = ("auto", "thread", "process")
+
+
+def _process_context():
+    # Workers are forked from a single-threaded server process where possible,
+    # since forking the multi-threaded server itself is unsafe.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _run_in_process(backend: str, func: Callable[..., Any], *args: Any) -> Any:
+    # Workers started by forkserver or spawn import json_codec afresh, with
+    # its default backend, so the server's choice is passed along with the work.
+    if json_codec.backend() != backend:
+        json_codec.use_backend(backend)
+    return func(*args)
+
+
+class Offloader:
+    """Runs callables inline or in a worker pool depending on their input size."""
+
+    def __init__(
+        self,
+        threshold_bytes: int = DEFAULT_THRESHOLD_BYTES,
+        executor: str = "auto",
+        max_workers: Optional[int] = None,
+    ):
+        if executor not in _EXECUTORS:
+            raise ValueError(
+                f"Unknown offload executor '{executor}'. Use one of: {', '.join(_EXECUTORS)}."
+            )
+        self.threshold_bytes = threshold_bytes
+        self.executor_kind = executor
+        self.max_workers = max_workers
+        self._executors: Dict[str, concurrent.futures.Executor] = {}
+
+    def pool_for(self, kind: str) -> str:
+        """Returns the pool, "thread" or "process", that runs offloaded work of a kind."""
+        if self.executor_kind == "auto":
+            return "process" if kind in PROCESS_KINDS else "thread"
+        return self.executor_kind
+
+    def _get_executor(self, pool: str) -> concurrent.futures.Executor:
+        executor = self._executors.get(pool)
+        if executor is None:
+            if pool == "process":
+                executor = concurrent.futures.ProcessPoolExecutor(
+                    self.max_workers, mp_context=_process_context()
+                )
+            else:
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="gerrit-mcp-offload"
+                )
+            self._executors[pool] = executor
+        return executor
+
+    async def run(self, kind: str, size: int, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs func(*args), in the worker pool if size is at least the threshold.
+        The kind labels the work in the metrics (e.g. "parse", "decode", "render")
+        and picks the pool. Work for the process pool must be picklable.
+        """
+        start = time.perf_counter()
+        if size < self.threshold_bytes:
+            result = func(*args)
+            metrics.increment(f"offload.{kind}.inline")
+        else:
+            pool = self.pool_for(kind)
+            if pool == "process":
+                # The input is copied to the worker anyway; views cannot be pickled.
+                args = tuple(bytes(arg) if isinstance(arg, memoryview) else arg for arg in args)
+                call = functools.partial(_run_in_process, json_codec.backend(), func, *args)
+            else:
+                call = functools.partial(func, *args)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(pool), call)
+            metrics.increment(f"offload.{kind}.offloaded")
+            metrics.observe(f"offload.{kind}.offloaded_duration", time.perf_counter() - start)
+        return result
+
+    def shutdown(self, cancel_futures: bool = True):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=cancel_futures)
+        self._executors.clear()
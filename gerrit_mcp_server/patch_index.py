@@ -0,0 +1,254 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module indexes a whole revision patch by file so that per-file diffs can
+be served locally after a single download.
+
+The patch is streamed out of Gerrit's zip download into an anonymous temporary
+file and memory-mapped, so only the slice for the requested file is ever
+decoded into memory.
+"""
+
+import asyncio
+import mmap
+import shutil
+import tempfile
+import time
+import zipfile
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+_DIFF_HEADER = b"diff --git "
+_SIGNATURE_MARKERS = (b"\n-- \n", b"\n--\n")
+
+
+def _section_path(header: bytes) -> Optional[str]:
+    """Extracts the file path from the header of a single `diff --git` section."""
+    lines = header.split(b"\n")
+
+    old_path = None
+    for line in lines[1:]:
+        if line.startswith(b"+++ b/"):
+            return line[6:].decode("utf-8", "replace")
+        if line.startswith(b"rename to ") or line.startswith(b"copy to "):
+            return line.split(b" to ", 1)[1].decode("utf-8", "replace")
+        if line.startswith(b"--- a/"):
+            old_path = line[6:].decode("utf-8", "replace")
+    if old_path is not None:
+        return old_path
+
+    # Binary or mode-only changes have no ---/+++ lines, so fall back to the
+    # `diff --git a/<path> b/<path>` header, where both paths are identical.
+    names = lines[0][len(_DIFF_HEADER):].decode("utf-8", "replace")
+    if names.startswith("a/"):
+        path_length = (len(names) - 5) // 2
+        candidate = names[2 : 2 + path_length]
+        if candidate and names == f"a/{candidate} b/{candidate}":
+            return candidate
+    return None
+
+
+class PatchIndex:
+    """A memory-mapped revision patch with the byte range of every file."""
+
+    def __init__(self, patch_file):
+        self._file = patch_file
+        self._file.seek(0, 2)
+        size = self._file.tell()
+        self._map = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if size
+            else None
+        )
+        self.size = size
+        self._ranges: Dict[str, Tuple[int, int]] = {}
+        if self._map is not None:
+            self._build_index()
+
+    @classmethod
+    def from_zip_file(cls, zip_path: str) -> "PatchIndex":
+        """Builds an index from Gerrit's `?zip` patch download."""
+        try:
+            with zipfile.ZipFile(zip_path) as archive:
+                members = archive.namelist()
+                if len(members) != 1:
+                    raise ValueError(
+                        f"Expected a single patch file in the archive, found {len(members)}."
+                    )
+                patch_file = tempfile.TemporaryFile()
+                with archive.open(members[0]) as member:
+                    shutil.copyfileobj(member, patch_file)
+        except zipfile.BadZipFile:
+            # Gerrit answers errors (e.g. "Not found") with a plain text body.
+            with open(zip_path, "rb") as f:
+                response = f.read(1024).decode("utf-8", "replace").strip()
+            raise ValueError(f"Failed to download patch. Response: {response}")
+        return cls(patch_file)
+
+    def _build_index(self):
+        data = self._map
+        if data[: len(_DIFF_HEADER)] == _DIFF_HEADER:
+            start = 0
+        else:
+            start = data.find(b"\n" + _DIFF_HEADER)
+            start = -1 if start == -1 else start + 1
+
+        starts = []
+        while start != -1:
+            starts.append(start)
+            next_start = data.find(b"\n" + _DIFF_HEADER, start)
+            start = -1 if next_start == -1 else next_start + 1
+
+        for i, section_start in enumerate(starts):
+            if i + 1 < len(starts):
+                section_end = starts[i + 1]
+            else:
+                section_end = self._strip_signature(section_start)
+            header_end = data.find(b"\n@@", section_start, section_end)
+            if header_end == -1:
+                header_end = section_end
+            path = _section_path(data[section_start:header_end])
+            if path is not None:
+                self._ranges[path] = (section_start, section_end)
+
+    def _strip_signature(self, section_start: int) -> int:
+        """Returns the end of the last section, excluding a format-patch signature."""
+        data = self._map
+        end = len(data)
+        for marker in _SIGNATURE_MARKERS:
+            pos = data.rfind(marker, section_start)
+            # The signature is the marker followed by a single version line.
+            if pos != -1 and data.find(b"\n", pos + len(marker), end - 1) == -1:
+                return pos + 1
+        return end
+
+    def files(self) -> List[str]:
+        """Returns the paths of all files in the patch, in patch order."""
+        return list(self._ranges)
+
+    def get_file_diff(self, file_path: str) -> Optional[str]:
+        """Returns the diff for a single file, or None if it is not in the patch."""
+        byte_range = self._ranges.get(file_path)
+        if byte_range is None:
+            return None
+        start, end = byte_range
+        return self._map[start:end].decode("utf-8", "replace")
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+class PatchIndexCache:
+    """
+    An LRU cache of patch indexes with a TTL. Concurrent requests for the same
+    key share a single download.
+
+    It also remembers the current revision of recently indexed changes for a
+    short while, so reading several files of a change does not look the
+    revision up again for every file.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 8,
+        ttl_seconds: float = 300.0,
+        max_revisions: int = 256,
+        revision_ttl_seconds: float = 30.0,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_revisions = max_revisions
+        self.revision_ttl_seconds = revision_ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, PatchIndex]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._revisions: "OrderedDict[Hashable, Tuple[float, str]]" = OrderedDict()
+
+    def get_revision(self, change_key: Hashable) -> Optional[str]:
+        """Returns the remembered current revision of a change, if still fresh."""
+        entry = self._revisions.get(change_key)
+        if entry is None:
+            return None
+        checked, revision = entry
+        if time.monotonic() - checked > self.revision_ttl_seconds:
+            del self._revisions[change_key]
+            return None
+        self._revisions.move_to_end(change_key)
+        return revision
+
+    def put_revision(self, change_key: Hashable, revision: str):
+        self._revisions.pop(change_key, None)
+        self._revisions[change_key] = (time.monotonic(), revision)
+        while len(self._revisions) > self.max_revisions:
+            self._revisions.popitem(last=False)
+
+    def get(self, key: Hashable) -> Optional[PatchIndex]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created, index = entry
+        if time.monotonic() - created > self.ttl_seconds:
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return index
+
+    def put(self, key: Hashable, index: PatchIndex):
+        if key in self._entries:
+            self._evict(key)
+        self._entries[key] = (time.monotonic(), index)
+        while len(self._entries) > self.max_entries:
+            self._evict(next(iter(self._entries)))
+
+    async def get_or_build(
+        self, key: Hashable, builder: Callable[[], Awaitable[PatchIndex]]
+    ) -> PatchIndex:
+        index = self.get(key)
+        if index is not None:
+            return index
+        build = self._in_flight.get(key)
+        if build is None:
+            # The build runs in its own task, so that a caller that is
+            # cancelled does not cancel it for the others.
+            build = asyncio.get_running_loop().create_task(self._build(key, builder))
+            # Mark a failure as retrieved in case every caller went away.
+            build.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._in_flight[key] = build
+        return await asyncio.shield(build)
+
+    async def _build(self, key: Hashable, builder: Callable[[], Awaitable[PatchIndex]]) -> PatchIndex:
+        try:
+            index = await builder()
+        finally:
+            del self._in_flight[key]
+        self.put(key, index)
+        return index
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]):
+        """Drops every entry and remembered revision whose key matches the predicate."""
+        for key in [k for k in self._entries if predicate(k)]:
+            self._evict(key)
+        for key in [k for k in self._revisions if predicate(k)]:
+            del self._revisions[key]
+
+    def clear(self):
+        for key in list(self._entries):
+            self._evict(key)
+        self._revisions.clear()
+
+    def _evict(self, key: Hashable):
+        _, index = self._entries.pop(key)
+        index.close()
@@ -0,0 +1,201 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module keeps large tool results on the server so that they can be read
+page by page.
+
+A tool whose output exceeds the page budget returns its first page and a
+cursor. The full text is stored here, and get_result_page serves the
+following pages from it without asking Gerrit again. Stored results expire
+after a while, and the least recently used ones are evicted when the stored
+results exceed a memory budget. With a SharedStore, results are also visible
+to the other server workers.
+"""
+
+import secrets
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from gerrit_mcp_server.shared_store import SharedStore
+
+# A rough estimate for turning a token budget into a byte budget.
+BYTES_PER_TOKEN = 4
+
+_NAMESPACE = "results"
+
+# How the footer of every page starts.
+_TRUNCATED = "\n[Output truncated: showing bytes "
+_END = "\n[End of result: bytes "
+
+
+def page_budget(page_bytes: int, page_tokens: Optional[int] = None) -> int:
+    """Returns the byte budget of a page, the smaller of the two limits."""
+    if page_tokens:
+        return min(page_bytes, page_tokens * BYTES_PER_TOKEN)
+    return page_bytes
+
+
+def split_page(data: bytes, offset: int, budget: int) -> Tuple[bytes, Optional[int]]:
+    """
+    Returns the page of UTF-8 `data` that starts at `offset`, and the offset of
+    the next page or None if it is the last one. Pages end after a newline
+    where possible and never in the middle of a character.
+    """
+    end = offset + budget
+    if end >= len(data):
+        return data[offset:], None
+    newline = data.rfind(b"\n", offset, end)
+    if newline >= offset:
+        end = newline + 1
+    else:
+        while end > offset + 1 and data[end] & 0xC0 == 0x80:
+            end -= 1
+    return data[offset:end], end
+
+
+def make_cursor(result_id: str, offset: int) -> str:
+    return f"{result_id}:{offset}"
+
+
+def parse_cursor(cursor: str) -> Tuple[str, int]:
+    """Returns the result ID and offset of a cursor; raises ValueError if it is malformed."""
+    result_id, sep, offset = cursor.strip().rpartition(":")
+    if not sep or not result_id or not offset.isdigit():
+        raise ValueError(f"Invalid cursor: '{cursor}'")
+    return result_id, int(offset)
+
+
+class ResultStore:
+    """Stored tool results by ID, least recently used first."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 600.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        store: Optional[SharedStore] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.store = store
+        self._clock = clock
+        self._results: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """The number of bytes of all results held in memory."""
+        return self._size
+
+    def put(self, data: bytes) -> Optional[str]:
+        """Stores a result and returns its ID, or None if it exceeds the memory budget."""
+        if len(data) > self.max_bytes:
+            return None
+        self._purge_expired()
+        result_id = secrets.token_hex(8)
+        self._results[result_id] = (self._clock() + self.ttl_seconds, data)
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, (_, evicted) = self._results.popitem(last=False)
+            self._size -= len(evicted)
+        if self.store is not None:
+            # The shared copies are bounded like the ones in memory.
+            self.store.purge_expired()
+            self.store.set(_NAMESPACE, result_id, data.decode("utf-8"), self.ttl_seconds)
+            self.store.trim(_NAMESPACE, self.max_bytes)
+        return result_id
+
+    def get(self, result_id: str) -> Optional[bytes]:
+        """Returns a stored result, or None if it is unknown or has expired."""
+        entry = self._results.get(result_id)
+        if entry is not None:
+            if entry[0] > self._clock():
+                self._results.move_to_end(result_id)
+                return entry[1]
+            self._remove(result_id)
+        if self.store is not None:
+            # The result may have been stored by another worker.
+            text = self.store.get(_NAMESPACE, result_id)
+            if text is not None:
+                return text.encode("utf-8")
+        return None
+
+    def clear(self):
+        self._results.clear()
+        self._size = 0
+
+    def _remove(self, result_id: str):
+        _, data = self._results.pop(result_id)
+        self._size -= len(data)
+
+    def _purge_expired(self):
+        now = self._clock()
+        for result_id in [k for k, (expires, _) in self._results.items() if expires <= now]:
+            self._remove(result_id)
+
+
+class Page(str):
+    """
+    The text of a page of a result, with its footer. A tool that returns the
+    output of another paged tool passes its pages on, and they are not paged
+    again.
+    """
+
+
+def paginate(store: ResultStore, text: str, budget: int) -> str:
+    """
+    Returns `text` if it fits in a page or is already a Page. Otherwise stores
+    it and returns its first page with a footer that holds the cursor of the
+    next page.
+    """
+    if isinstance(text, Page):
+        return text
+    data = text.encode("utf-8")
+    if len(data) <= budget:
+        return text
+    page, next_offset = split_page(data, 0, budget)
+    result_id = store.put(data)
+    if result_id is None:
+        footer = f"{_TRUNCATED}0-{next_offset} of {len(data)}. The result is too large to keep for paging.]\n"
+    else:
+        footer = _footer(len(data), 0, next_offset, make_cursor(result_id, next_offset))
+    return Page(page.decode("utf-8") + footer)
+
+
+def read_page(store: ResultStore, cursor: str, budget: int) -> Optional[str]:
+    """
+    Returns the page a cursor points to, with a footer that holds the cursor
+    of the next page, or None if the result has expired. Raises ValueError
+    for a malformed cursor.
+    """
+    result_id, offset = parse_cursor(cursor)
+    data = store.get(result_id)
+    if data is None:
+        return None
+    if offset >= len(data):
+        raise ValueError(f"Cursor '{cursor}' is past the end of the result.")
+    page, next_offset = split_page(data, offset, budget)
+    next_cursor = make_cursor(result_id, next_offset) if next_offset is not None else None
+    return Page(page.decode("utf-8") + _footer(len(data), offset, next_offset or len(data), next_cursor))
+
+
+def _footer(total: int, start: int, end: int, cursor: Optional[str]) -> str:
+    if cursor is None:
+        return f"{_END}{start}-{end} of {total}.]\n"
+    return (
+        f"{_TRUNCATED}{start}-{end} of {total}. "
+        f'Call get_result_page with cursor "{cursor}" for the next page.]\n'
+    )
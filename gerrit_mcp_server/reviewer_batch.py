@@ -0,0 +1,89 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module builds the review that adds several reviewers and CCs to a change
+at once, and reads the outcome of each of them from Gerrit's ReviewResult.
+
+Gerrit applies such a review atomically: if one reviewer cannot be added,
+none are, and the result says which entry failed.
+"""
+
+from typing import Any, Dict, List, Optional
+
+NOTIFY_VALUES = ("NONE", "OWNER", "OWNER_REVIEWERS", "ALL")
+
+
+def review_input(
+    reviewers: Optional[List[str]] = None,
+    ccs: Optional[List[str]] = None,
+    notify: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Returns a ReviewInput adding the reviewers and CCs; raises ValueError if invalid."""
+    entries = [{"reviewer": r, "state": "REVIEWER"} for r in reviewers or []]
+    entries += [{"reviewer": c, "state": "CC"} for c in ccs or []]
+    if not entries:
+        raise ValueError("at least one reviewer or CC is required")
+    payload: Dict[str, Any] = {"reviewers": entries}
+    if notify is not None:
+        if notify.upper() not in NOTIFY_VALUES:
+            raise ValueError(f"notify must be one of {', '.join(NOTIFY_VALUES)}, got '{notify}'")
+        payload["notify"] = notify.upper()
+    return payload
+
+
+def _account_names(accounts: List[Dict[str, Any]]) -> List[str]:
+    return [a.get("email") or a.get("name") or str(a.get("_account_id")) for a in accounts]
+
+
+def entry_results(payload: Dict[str, Any], result: Any) -> List[Dict[str, Any]]:
+    """
+    Returns one outcome per requested entry, in request order: the reviewer,
+    the requested state, whether it was added, and the accounts added or the
+    error.
+    """
+    by_input = result.get("reviewers", {}) if isinstance(result, dict) else {}
+    outcomes = []
+    for entry in payload["reviewers"]:
+        added = by_input.get(entry["reviewer"]) or {}
+        accounts = added.get("reviewers", []) + added.get("ccs", [])
+        error = added.get("error")
+        if error is None and added.get("confirm"):
+            error = "the group is large and must be confirmed; add it on its own"
+        if error is None and not added:
+            error = (result.get("error") if isinstance(result, dict) else result) or "not in the response"
+        outcomes.append(
+            {
+                "reviewer": entry["reviewer"],
+                "state": entry["state"],
+                "ok": error is None,
+                "accounts": _account_names(accounts),
+                "error": error,
+            }
+        )
+    return outcomes
+
+
+def check_result(result: Any) -> Optional[str]:
+    """Returns None if every entry of a ReviewResult was added, else what failed."""
+    if not isinstance(result, dict) or not isinstance(result.get("reviewers"), dict):
+        return f"Response: {result}"
+    failures = [
+        f"{reviewer}: {added.get('error') or 'must be confirmed'}"
+        for reviewer, added in result["reviewers"].items()
+        if added.get("error") or added.get("confirm")
+    ]
+    if result.get("error") and not failures:
+        failures.append(result["error"])
+    return "; ".join(failures) or None
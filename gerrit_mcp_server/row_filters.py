@@ -0,0 +1,253 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module filters and projects the rows of a listing (changes, comments,
+files) on the server, so that only the rows a caller asked for are rendered.
+
+A selection is plain data, for example:
+
+    {
+        "where": {"unresolved": true, "author.email": "a@example.com"},
+        "fields": ["path", "line", "message"],
+        "limit": 20
+    }
+
+`where` is a condition. An object maps field paths to a value (equality) or
+to an object of operators; all of its entries must hold. `all`, `any` and
+`not` combine conditions. A path is dotted (`labels.Code-Review.all.value`);
+it fans out over lists and holds if any of the values it reaches matches.
+`fields` renders only those paths of each row, and `limit` caps the number of
+rows. Nothing in a selection is evaluated as code or as a regular expression,
+and its size is bounded.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+# The number of conditions, operators and fields a selection may contain.
+MAX_SELECTION_NODES = 200
+
+_MISSING = object()
+
+
+def _compare(op: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def compare(value, operand):
+        try:
+            return op(value, operand)
+        except TypeError:
+            return False
+
+    return compare
+
+
+def _contains(value: Any, operand: Any) -> bool:
+    if isinstance(value, str) and isinstance(operand, str):
+        return operand.lower() in value.lower()
+    return False
+
+
+def _starts_with(value: Any, operand: Any) -> bool:
+    return isinstance(value, str) and isinstance(operand, str) and value.startswith(operand)
+
+
+def _is_in(value: Any, operand: Any) -> bool:
+    return isinstance(operand, list) and value in operand
+
+
+# Operators that hold if any value of a path satisfies them.
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda value, operand: value == operand,
+    "lt": _compare(lambda value, operand: value < operand),
+    "le": _compare(lambda value, operand: value <= operand),
+    "gt": _compare(lambda value, operand: value > operand),
+    "ge": _compare(lambda value, operand: value >= operand),
+    "in": _is_in,
+    "contains": _contains,
+    "startswith": _starts_with,
+}
+
+# Operators that look at all values of a path at once.
+_NEGATED_OPERATORS = {"ne": "eq", "not_in": "in"}
+
+
+class SelectionError(ValueError):
+    """Raised for a selection that is not well formed."""
+
+
+def _values(row: Any, path: str) -> List[Any]:
+    """Returns every value a dotted path reaches in a row, fanning out over lists."""
+    current = [row]
+    for key in path.split("."):
+        reached = []
+        for item in current:
+            if not isinstance(item, dict):
+                continue
+            value = item.get(key, _MISSING)
+            if value is _MISSING:
+                continue
+            if isinstance(value, list):
+                reached.extend(value)
+            else:
+                reached.append(value)
+        current = reached
+    return current
+
+
+class Selection:
+    """A validated filter, projection and limit over the rows of a listing."""
+
+    def __init__(
+        self,
+        where: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ):
+        self._nodes = 0
+        self._paths: Set[str] = set()
+        self._match = self._compile(where) if where is not None else (lambda row: True)
+        if fields is not None:
+            if not isinstance(fields, list) or not all(isinstance(f, str) and f for f in fields):
+                raise SelectionError("'fields' must be a list of field paths.")
+            self._count(len(fields))
+            self._paths.update(fields)
+        self.fields = fields
+        if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+            raise SelectionError("'limit' must be a positive integer.")
+        self.limit = limit
+
+    @classmethod
+    def from_spec(cls, spec: Optional[Dict[str, Any]]) -> Optional["Selection"]:
+        """Returns the selection for a tool's `select` argument, or None if it is empty."""
+        if not spec:
+            return None
+        if not isinstance(spec, dict):
+            raise SelectionError("A selection must be an object with 'where', 'fields' and/or 'limit'.")
+        unknown = sorted(set(spec) - {"where", "fields", "limit"})
+        if unknown:
+            raise SelectionError(f"Unknown selection keys: {', '.join(unknown)}")
+        return cls(spec.get("where"), spec.get("fields"), spec.get("limit"))
+
+    def paths(self) -> Set[str]:
+        """The field paths the selection reads, which the fetched rows must contain."""
+        return set(self._paths)
+
+    def matches(self, row: Any) -> bool:
+        return self._match(row)
+
+    def apply(self, rows: Iterable[Any], as_row: Callable[[Any], Any] = lambda item: item) -> List[Any]:
+        """Returns the matching items, up to the limit; `as_row` gives the row of an item."""
+        selected = []
+        for row in rows:
+            if self._match(as_row(row)):
+                selected.append(row)
+                if self.limit is not None and len(selected) >= self.limit:
+                    break
+        return selected
+
+    def project(self, row: Any) -> Dict[str, Any]:
+        """Returns the selected fields of a row; all of it if no fields were selected."""
+        if self.fields is None:
+            return row
+        projected = {}
+        for path in self.fields:
+            values = _values(row, path)
+            if values:
+                projected[path] = values[0] if len(values) == 1 else values
+        return projected
+
+    def _count(self, nodes: int):
+        self._nodes += nodes
+        if self._nodes > MAX_SELECTION_NODES:
+            raise SelectionError(f"The selection has more than {MAX_SELECTION_NODES} conditions or fields.")
+
+    def _compile(self, condition: Any) -> Callable[[Any], bool]:
+        if not isinstance(condition, dict) or not condition:
+            raise SelectionError(f"A condition must be a non-empty object, got: {condition!r}")
+        self._count(1)
+        checks = []
+        for key, value in condition.items():
+            if key in ("all", "any"):
+                if not isinstance(value, list) or not value:
+                    raise SelectionError(f"'{key}' takes a non-empty list of conditions.")
+                parts = [self._compile(c) for c in value]
+                combine = all if key == "all" else any
+                checks.append(lambda row, parts=parts, combine=combine: combine(p(row) for p in parts))
+            elif key == "not":
+                part = self._compile(value)
+                checks.append(lambda row, part=part: not part(row))
+            else:
+                checks.append(self._compile_path(key, value))
+        return lambda row: all(check(row) for check in checks)
+
+    def _compile_path(self, path: str, test: Any) -> Callable[[Any], bool]:
+        self._paths.add(path)
+        if not isinstance(test, dict):
+            test = {"eq": test}
+        checks = []
+        for op, operand in test.items():
+            self._count(1)
+            if op == "exists":
+                checks.append(lambda values, wanted=bool(operand): bool(values) == wanted)
+            elif op in _NEGATED_OPERATORS:
+                positive = _OPERATORS[_NEGATED_OPERATORS[op]]
+                checks.append(
+                    lambda values, positive=positive, operand=operand: not any(
+                        positive(v, operand) for v in values
+                    )
+                )
+            elif op in _OPERATORS:
+                operator = _OPERATORS[op]
+                checks.append(
+                    lambda values, operator=operator, operand=operand: any(
+                        operator(v, operand) for v in values
+                    )
+                )
+            else:
+                raise SelectionError(
+                    f"Unknown operator '{op}' for '{path}'. Use one of: "
+                    + ", ".join(sorted([*_OPERATORS, *_NEGATED_OPERATORS, "exists"]))
+                )
+        return lambda row: all(check(_values(row, path)) for check in checks)
+
+
+def file_rows(by_file: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Flattens a response keyed by file path into rows that carry their `path`."""
+    return [dict(item, path=path) for path, items in by_file.items() for item in items]
+
+
+def group_by_path(rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """The inverse of file_rows, keeping the order of the rows."""
+    by_file: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_file.setdefault(row["path"], []).append(row)
+    return by_file
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, list):
+        return "[" + ", ".join(_format_value(v) for v in value) + "]"
+    if isinstance(value, str):
+        return value.replace("\n", " ")
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{k}: {_format_value(v)}" for k, v in value.items()) + "}"
+    return str(value)
+
+
+def format_rows(title: str, rows: List[Any], selection: Selection) -> str:
+    """Renders the selected fields of each row on one line."""
+    output = f"{title}: {len(rows)} matching\n"
+    for row in rows:
+        projected = selection.project(row)
+        output += "- " + ", ".join(f"{k}={_format_value(v)}" for k, v in projected.items()) + "\n"
+    return output
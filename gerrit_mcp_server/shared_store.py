@@ -0,0 +1,157 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module provides a small key-value store with expiry that several server
+processes on the same machine can share.
+
+When the HTTP server runs multiple workers, each worker has its own in-memory
+caches. Backing the caches that save upstream requests with this store lets a
+lookup made by one worker serve all of them. The store is a SQLite database in
+WAL mode, so readers do not block each other or the writer. Expired entries
+are deleted by the writes that follow, at most once per purge interval.
+
+The default location of the store is a directory that only the current user
+can access, as the entries hold account details and tool results.
+"""
+
+import json
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+"""
+
+
+def private_directory(*parts: str) -> str:
+    """
+    Returns a directory under the current user's private server directory,
+    creating it if needed. The server directory is in $XDG_RUNTIME_DIR, or in
+    the system temporary directory with the user ID in its name. Raises
+    PermissionError if it is a symlink, is owned by another user or can be
+    accessed by other users.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        root = os.path.join(runtime_dir, "gerrit-mcp-server")
+    else:
+        root = os.path.join(tempfile.gettempdir(), f"gerrit-mcp-server-{os.getuid()}")
+    os.makedirs(root, mode=0o700, exist_ok=True)
+    info = os.lstat(root)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f"{root} is not a directory owned by the current user.")
+    if info.st_mode & 0o077:
+        raise PermissionError(f"{root} can be accessed by other users; restrict it with chmod 700.")
+    path = os.path.join(root, *parts)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+class SharedStore:
+    """A JSON key-value store with per-entry expiry, shared through a file."""
+
+    def __init__(
+        self, path: str, busy_timeout_seconds: float = 5.0, purge_interval_seconds: float = 300.0
+    ):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+        self.path = path
+        self.purge_interval_seconds = purge_interval_seconds
+        self._next_purge = time.monotonic() + purge_interval_seconds
+        self._db = sqlite3.connect(
+            path, timeout=busy_timeout_seconds, check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Returns a value, or None if it is missing or has expired."""
+        return self.get_many(namespace, [key]).get(key)
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """Returns the unexpired values of the given keys that are present."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        placeholders = ", ".join("?" for _ in keys)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT key, value FROM entries WHERE namespace = ? AND key IN ({placeholders}) "
+                "AND expires > ?",
+                [namespace, *keys, time.time()],
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: float):
+        self.set_many(namespace, {key: value}, ttl_seconds)
+
+    def set_many(self, namespace: str, values: Dict[str, Any], ttl_seconds: float):
+        """Stores several values that expire after ttl_seconds."""
+        if not values:
+            return
+        expires = time.time() + ttl_seconds
+        rows = [(namespace, key, json.dumps(value), expires) for key, value in values.items()]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", rows)
+        if time.monotonic() >= self._next_purge:
+            self.purge_expired()
+
+    def delete_namespace(self, namespace: str):
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+
+    def trim(self, namespace: str, max_bytes: int) -> int:
+        """
+        Deletes the entries of a namespace that expire first until its values
+        take at most max_bytes, and returns how many were removed.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, length(value) FROM entries WHERE namespace = ? ORDER BY expires DESC, rowid DESC",
+                (namespace,),
+            ).fetchall()
+            total = 0
+            dropped = []
+            for key, size in rows:
+                total += size
+                if total > max_bytes:
+                    dropped.append((namespace, key))
+            if dropped:
+                self._db.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", dropped)
+        return len(dropped)
+
+    def purge_expired(self) -> int:
+        """Deletes expired entries and returns how many were removed."""
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM entries WHERE expires <= ?", (time.time(),))
+            self._next_purge = time.monotonic() + self.purge_interval_seconds
+        return cursor.rowcount
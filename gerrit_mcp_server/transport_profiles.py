@@ -0,0 +1,149 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module compiles the configured Gerrit hosts into transport profiles: the
+ready-made curl command prefix for each host URL.
+
+A configuration is compiled once, the first time a request is made with it.
+Requests then find their profile with a single dictionary lookup instead of
+re-walking `gerrit_hosts` and re-dispatching on the authentication type. For
+`git_cookies`, the cookie file is only read again when it changes on disk.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from gerrit_mcp_server import gerrit_auth
+
+
+def host_key(gerrit_url: str) -> str:
+    """
+    Returns a URL without its scheme, trailing slash and `/a` suffix, which
+    identifies the host it points at.
+    """
+    key = gerrit_url.replace("https://", "").replace("http://", "").rstrip("/")
+    if key.endswith("/a"):
+        key = key[:-2]
+    return key
+
+
+class TransportProfile:
+    """How to reach one configured Gerrit host."""
+
+    def __init__(self, host: Dict[str, Any]):
+        self.host = host
+        self.name = host.get("name")
+        self.auth_config = host.get("authentication") or {}
+        self.auth_type = self.auth_config.get("type")
+        self._command: Optional[Tuple[str, ...]] = None
+        self._error: Optional[Exception] = None
+        self._cookie_state: Optional[Tuple[Any, str, Tuple[str, ...]]] = None
+
+        try:
+            if self.auth_type == "gob_curl":
+                self._command = tuple(gerrit_auth._get_auth_for_gob(self.auth_config))
+            elif self.auth_type == "http_basic":
+                self._command = tuple(gerrit_auth._get_auth_for_http_basic(self.auth_config))
+            elif self.auth_type != "git_cookies":
+                raise ValueError(
+                    "No valid authentication method found in gerrit_config.json. "
+                    "Please configure a supported 'type' (e.g., 'http_basic', 'gob_curl', "
+                    "'git_cookies') for the relevant host."
+                )
+        except ValueError as e:
+            # Only requests to this host should fail because of its settings.
+            self._error = e
+
+    def command(self, gerrit_base_url: str) -> List[str]:
+        """Returns the curl command prefix for a request to this host."""
+        if self._error is not None:
+            raise self._error
+        if self._command is not None:
+            return list(self._command)
+        return list(self._gitcookies_command(gerrit_base_url))
+
+    def _gitcookies_command(self, gerrit_base_url: str) -> Tuple[str, ...]:
+        gitcookies_path = self.auth_config.get("gitcookies_path")
+        try:
+            stat = os.stat(os.path.expanduser(gitcookies_path)) if gitcookies_path else None
+            file_state = (stat.st_mtime_ns, stat.st_size) if stat else None
+        except OSError:
+            file_state = None
+        domain = host_key(gerrit_base_url).split("/")[0]
+        if (
+            self._cookie_state is not None
+            and self._cookie_state[0] == file_state
+            and self._cookie_state[1] == domain
+        ):
+            return self._cookie_state[2]
+        command = tuple(gerrit_auth._get_auth_for_gitcookies(gerrit_base_url, self.auth_config))
+        if file_state is not None:
+            self._cookie_state = (file_state, domain, command)
+        return command
+
+
+class TransportProfiles:
+    """
+    The transport profiles of one configuration, by host URL. Profiles of
+    hosts whose settings are unchanged from a previous configuration are
+    reused, together with their cached cookies.
+    """
+
+    def __init__(self, config: Dict[str, Any], previous: Optional["TransportProfiles"] = None):
+        self.config = config
+        self._by_host: Dict[str, TransportProfile] = {}
+        for host in config.get("gerrit_hosts", []):
+            profile = previous._reusable(host) if previous else None
+            if profile is None:
+                profile = TransportProfile(host)
+            for url in (host.get("internal_url"), host.get("external_url")):
+                if url:
+                    # As before, the first host listed for a URL wins.
+                    self._by_host.setdefault(host_key(url), profile)
+
+    def get(self, gerrit_base_url: str) -> TransportProfile:
+        profile = self._by_host.get(host_key(gerrit_base_url))
+        if profile is None:
+            raise ValueError(
+                f"No configured Gerrit host found for URL: {gerrit_base_url}. "
+                f"Please check your gerrit_config.json file."
+            )
+        return profile
+
+    def hosts(self) -> List[str]:
+        return list(self._by_host)
+
+    def _reusable(self, host: Dict[str, Any]) -> Optional[TransportProfile]:
+        """Returns the profile of a host with exactly these settings, if there is one."""
+        for url in (host.get("internal_url"), host.get("external_url")):
+            profile = self._by_host.get(host_key(url)) if url else None
+            if profile is not None and profile.host == host:
+                return profile
+        return None
+
+
+_compiled: Optional[TransportProfiles] = None
+
+
+def profiles_for(config: Dict[str, Any]) -> TransportProfiles:
+    """
+    Returns the compiled profiles of a configuration. The configuration loader
+    returns the same object until the file changes, so this compiles once per
+    configuration, and then only the hosts whose settings changed.
+    """
+    global _compiled
+    if _compiled is None or _compiled.config is not config:
+        _compiled = TransportProfiles(config, previous=_compiled)
+    return _compiled
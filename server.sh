@@ -22,7 +22,11 @@ SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
 # The command to run your server.
 # IMPORTANT: This should not include redirection (>) or backgrounding (&).
 # The script handles that automatically.
-SERVER_COMMAND=".venv/bin/uvicorn gerrit_mcp_server.main:app --host localhost --port 6322"
+# Set WORKERS to serve from several processes; more than one runs stateless HTTP
+# with caches shared through a local store (see docs/configuration.md).
+WORKERS="${WORKERS:-1}"
+export GERRIT_MCP_WORKERS="$WORKERS"
+SERVER_COMMAND=".venv/bin/uvicorn gerrit_mcp_server.main:app --host localhost --port 6322 --workers $WORKERS"
 
 # The file to store the Process ID (PID) of the running server.
 PID_FILE="$SCRIPT_DIR/server.pid"
@@ -33,6 +33,12 @@ def mock_run_curl():
     with patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock) as m:
         yield m
 
+@pytest.fixture
+def mock_exec_curl():
+    """Provides a mocked _exec_curl, which returns the response body as bytes."""
+    with patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock) as m:
+        yield m
+
 @pytest.fixture
 def mock_exec():
     """Provides a mocked asyncio.create_subprocess_exec."""
@@ -48,9 +54,9 @@ def mock_load_config():
 # --- Tests ---
 
 @pytest.mark.asyncio
-async def test_query_changes(mock_run_curl):
+async def test_query_changes(mock_exec_curl):
     """Tests querying changes from Gerrit."""
-    mock_run_curl.return_value = json.dumps([
+    mock_exec_curl.return_value = json.dumps([
         {
             "_number": 1,
             "subject": "Test Change 1",
@@ -63,7 +69,7 @@ async def test_query_changes(mock_run_curl):
             "work_in_progress": True,
             "updated": "2025-07-01T10:00:00Z",
         },
-    ])
+    ]).encode()
 
     result = await main.query_changes(
         gerrit_base_url="https://fuchsia-review.googlesource.com",
@@ -74,9 +80,9 @@ async def test_query_changes(mock_run_curl):
     assert "2: [WIP] Test Change 2" in result[0]["text"]
 
 @pytest.mark.asyncio
-async def test_query_changes_no_results(mock_run_curl):
+async def test_query_changes_no_results(mock_exec_curl):
     """Tests querying changes when no results are returned."""
-    mock_run_curl.return_value = json.dumps([])
+    mock_exec_curl.return_value = json.dumps([]).encode()
     result = await main.query_changes(
         gerrit_base_url="https://fuchsia-review.googlesource.com",
         query="status:open",
@@ -84,9 +90,9 @@ async def test_query_changes_no_results(mock_run_curl):
     assert "No changes found" in result[0]["text"]
 
 @pytest.mark.asyncio
-async def test_get_change_details(mock_run_curl):
+async def test_get_change_details(mock_exec_curl):
     """Tests retrieving details for a specific change."""
-    mock_run_curl.return_value = json.dumps({
+    mock_exec_curl.return_value = json.dumps({
         "_number": 123,
         "subject": "Test Subject",
         "owner": {"email": "owner@example.com"},
@@ -99,7 +105,7 @@ async def test_get_change_details(mock_run_curl):
             {"_revision_number": 1, "message": "First message"},
             {"_revision_number": 2, "message": "Second message"},
         ],
-    })
+    }).encode()
 
     result = await main.get_change_details(
         gerrit_base_url="https://fuchsia-review.googlesource.com", change_id="123"
@@ -112,14 +118,14 @@ async def test_get_change_details(mock_run_curl):
     assert "- (Patch Set 2) [No date] (Gerrit): Second message" in text
 
 @pytest.mark.asyncio
-async def test_get_change_details_missing_fields(mock_run_curl):
+async def test_get_change_details_missing_fields(mock_exec_curl):
     """Tests retrieving change details when optional fields are missing."""
-    mock_run_curl.return_value = json.dumps({
+    mock_exec_curl.return_value = json.dumps({
         "_number": 123,
         "subject": "Test Subject",
         "owner": {"email": "owner@example.com"},
         "status": "NEW",
-    })
+    }).encode()
     result = await main.get_change_details(
         gerrit_base_url="https://fuchsia-review.googlesource.com", change_id="123"
     )
@@ -178,9 +184,9 @@ async def test_get_file_diff(mock_run_curl):
     assert result[0]["text"] == diff_text
 
 @pytest.mark.asyncio
-async def test_list_change_comments(mock_run_curl):
+async def test_list_change_comments(mock_exec_curl):
     """Tests listing comments on a change."""
-    mock_run_curl.return_value = json.dumps({
+    mock_exec_curl.return_value = json.dumps({
         "file1.txt": [
             {
                 "id": "comment-aaa",
@@ -209,7 +215,7 @@ async def test_list_change_comments(mock_run_curl):
                 "updated": "2025-07-15T11:10:00Z",
             },
         ],
-    })
+    }).encode()
 
     result = await main.list_change_comments(
         gerrit_base_url="https://fuchsia-review.googlesource.com", change_id="123"
@@ -226,9 +232,9 @@ async def test_list_change_comments(mock_run_curl):
     assert "Comment 3" in text
 
 @pytest.mark.asyncio
-async def test_list_change_comments_no_unresolved(mock_run_curl):
+async def test_list_change_comments_no_unresolved(mock_exec_curl):
     """Tests listing comments when all are resolved."""
-    mock_run_curl.return_value = json.dumps({
+    mock_exec_curl.return_value = json.dumps({
         "file1.txt": [
             {
                 "line": 12,
@@ -238,7 +244,7 @@ async def test_list_change_comments_no_unresolved(mock_run_curl):
                 "updated": "2025-07-15T11:05:00Z",
             },
         ]
-    })
+    }).encode()
     result = await main.list_change_comments(
         gerrit_base_url="https://fuchsia-review.googlesource.com", change_id="123"
     )
@@ -247,9 +253,9 @@ async def test_list_change_comments_no_unresolved(mock_run_curl):
     assert "L12: [user2@example.com] (2025-07-15T11:05:00Z) - RESOLVED" in text
 
 @pytest.mark.asyncio
-async def test_list_change_comments_json_decode_error(mock_run_curl):
+async def test_list_change_comments_json_decode_error(mock_exec_curl):
     """Tests handling of invalid JSON response when listing comments."""
-    mock_run_curl.return_value = "this is not json"
+    mock_exec_curl.return_value = b"this is not json"
     result = await main.list_change_comments(
         gerrit_base_url="https://fuchsia-review.googlesource.com", change_id="123"
     )
@@ -322,15 +328,15 @@ async def test_get_most_recent_cl_no_results(mock_run_curl):
     assert "No changes found for user" in result[0]["text"]
 
 @pytest.mark.asyncio
-async def test_gerrit_base_url_override(mock_run_curl):
+async def test_gerrit_base_url_override(mock_exec_curl):
     """Tests that the environment variable overrides the default base URL."""
-    mock_run_curl.return_value = json.dumps([])
+    mock_exec_curl.return_value = json.dumps([]).encode()
     
     # We need to override the fixture's env var for this specific test
     with patch.dict(os.environ, {"GERRIT_BASE_URL": "https://another-gerrit.com"}):
         await main.query_changes(query="status:open")
-        mock_run_curl.assert_called_once()
-        assert "https://another-gerrit.com/changes" in mock_run_curl.call_args[0][0][0]
+        mock_exec_curl.assert_called_once()
+        assert "https://another-gerrit.com/changes" in mock_exec_curl.call_args[0][0][0]
 
 @pytest.mark.asyncio
 async def test_run_curl_auth_error(mock_exec, mock_load_config):
@@ -381,9 +387,9 @@ async def test_run_curl_generic_error(mock_exec, mock_load_config):
         await main.run_curl(["https://fakegerrit.com"], "https://fakegerrit.com")
 
 @pytest.mark.asyncio
-async def test_tool_functions_with_invalid_change_id(mock_run_curl):
+async def test_tool_functions_with_invalid_change_id(mock_exec_curl):
     """Tests that tool functions handle invalid change IDs gracefully."""
-    mock_run_curl.side_effect = Exception(
+    mock_exec_curl.side_effect = Exception(
         "curl command failed with exit code 1.\nSTDERR:\nNot Found"
     )
 
@@ -420,22 +426,23 @@ async def test_tool_functions_with_invalid_change_id(mock_run_curl):
         )
 
 @pytest.mark.asyncio
-async def test_tool_functions_with_malformed_json(mock_run_curl):
+async def test_tool_functions_with_malformed_json(mock_exec_curl):
     """Tests that tool functions handle malformed JSON responses."""
-    mock_run_curl.return_value = "this is not json"
+    mock_exec_curl.return_value = b"this is not json"
 
     result = await main.query_changes(
         gerrit_base_url="https://fuchsia-review.googlesource.com",
         query="status:open",
     )
     assert "Failed to parse JSON" in result[0]["text"]
+    assert "this is not json" in result[0]["text"]
 
 @pytest.mark.asyncio
-async def test_tool_functions_with_unexpected_json(mock_run_curl):
+async def test_tool_functions_with_unexpected_json(mock_exec_curl):
     """Tests that tool functions handle unexpected JSON structures."""
-    mock_run_curl.return_value = json.dumps(
+    mock_exec_curl.return_value = json.dumps(
         {"unexpected_field": "unexpected_value"}
-    )
+    ).encode()
 
     with pytest.raises(KeyError):
         await main.get_change_details(
@@ -444,9 +451,9 @@ async def test_tool_functions_with_unexpected_json(mock_run_curl):
         )
 
 @pytest.mark.asyncio
-async def test_concurrent_requests(mock_run_curl):
+async def test_concurrent_requests(mock_exec_curl):
     """Tests that multiple requests can be handled concurrently."""
-    mock_run_curl.return_value = json.dumps([])
+    mock_exec_curl.return_value = json.dumps([]).encode()
 
     tasks = [
         main.query_changes(
@@ -461,7 +468,7 @@ async def test_concurrent_requests(mock_run_curl):
     results = await asyncio.gather(*tasks)
 
     assert len(results) == 2
-    assert mock_run_curl.call_count == 2
+    assert mock_exec_curl.call_count == 2
 
 @pytest.mark.asyncio
 async def test_command_injection(mock_exec):
@@ -506,11 +513,10 @@ async def test_post_review_comment_with_labels(mock_run_curl):
         },
         "labels": {"Verified": 1}
     }    
-    # The payload is passed as the argument after '--data'
+    # The payload is written to curl's stdin rather than passed as an argument
     curl_args = mock_run_curl.call_args[0][0]
-    data_index = curl_args.index("--data")
-    actual_payload_str = curl_args[data_index + 1]
-    actual_payload = json.loads(actual_payload_str)
+    assert "--data-binary" in curl_args and "@-" in curl_args
+    actual_payload = json.loads(mock_run_curl.call_args.kwargs["body"])
     
     assert actual_payload == expected_payload
 
@@ -74,9 +74,9 @@ class TestAbandonChange(unittest.TestCase):
 
             # Verify that the message was included in the curl arguments
             mock_run_curl.assert_called_once()
-            args, _ = mock_run_curl.call_args
-            self.assertIn("--data", args[0])
-            self.assertIn('{"message": "No longer needed"}', args[0])
+            args, kwargs = mock_run_curl.call_args
+            self.assertIn("--data-binary", args[0])
+            self.assertEqual(kwargs["body"], b'{"message": "No longer needed"}')
 
         asyncio.run(run_test())
 
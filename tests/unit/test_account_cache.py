@@ -0,0 +1,139 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.account_cache import AccountCache
+
+HOST = "https://gerrit.example.com"
+
+
+class TestAccountCache(unittest.TestCase):
+    def test_seed_indexes_by_id_email_and_username(self):
+        cache = AccountCache()
+        cache.seed(
+            HOST,
+            {
+                "owner": {"_account_id": 1, "email": "Owner@example.com", "username": "owner"},
+                "labels": {"Code-Review": {"all": [{"_account_id": 2, "name": "Rev", "value": 1}]}},
+            },
+        )
+        self.assertEqual(cache.get(HOST, 1)["email"], "Owner@example.com")
+        self.assertEqual(cache.get(HOST, "owner@example.com")["_account_id"], 1)
+        self.assertEqual(cache.get(HOST, "owner")["_account_id"], 1)
+        self.assertEqual(cache.get(HOST, "2")["name"], "Rev")
+        self.assertNotIn("value", cache.get(HOST, 2))
+        self.assertIsNone(cache.get("https://other.com", 1))
+
+    def test_lean_accounts_are_not_cached(self):
+        cache = AccountCache()
+        cache.seed(HOST, {"owner": {"_account_id": 1}})
+        self.assertIsNone(cache.get(HOST, 1))
+
+    def test_entries_expire(self):
+        cache = AccountCache(ttl_seconds=-1)
+        cache.put(HOST, {"_account_id": 1, "name": "A"})
+        self.assertIsNone(cache.get(HOST, 1))
+
+    def test_fill_in_fetches_misses_in_one_batch(self):
+        async def run_test():
+            cache = AccountCache()
+            fetch = AsyncMock(
+                return_value=[
+                    {"_account_id": 2, "email": "two@example.com"},
+                    {"_account_id": 3, "email": "three@example.com"},
+                ]
+            )
+            payload = {
+                "owner": {"_account_id": 1, "email": "one@example.com"},
+                "reviewers": {"REVIEWER": [{"_account_id": 1}, {"_account_id": 2}, {"_account_id": 3}]},
+            }
+
+            await cache.fill_in(HOST, payload, fetch)
+
+            fetch.assert_called_once_with(HOST, [2, 3])
+            emails = [r["email"] for r in payload["reviewers"]["REVIEWER"]]
+            self.assertEqual(emails, ["one@example.com", "two@example.com", "three@example.com"])
+
+            # Everything is cached now.
+            await cache.fill_in(HOST, {"owner": {"_account_id": 3}}, fetch)
+            fetch.assert_called_once()
+
+        asyncio.run(run_test())
+
+    def test_concurrent_resolves_share_lookups(self):
+        async def run_test():
+            cache = AccountCache()
+
+            async def fetch(host, ids):
+                await asyncio.sleep(0.01)
+                return [{"_account_id": i, "name": f"user{i}"} for i in ids]
+
+            fetch_mock = AsyncMock(side_effect=fetch)
+            first, second = await asyncio.gather(
+                cache.resolve(HOST, [1, 2], fetch_mock),
+                cache.resolve(HOST, [1, 2], fetch_mock),
+            )
+            self.assertEqual(fetch_mock.call_count, 1)
+            self.assertEqual(first[1]["name"], "user1")
+            self.assertEqual(second[2]["name"], "user2")
+
+        asyncio.run(run_test())
+
+    def test_failed_lookup_leaves_accounts_unresolved(self):
+        async def run_test():
+            cache = AccountCache()
+            fetch = AsyncMock(side_effect=Exception("boom"))
+            self.assertEqual(await cache.resolve(HOST, [1], fetch), {})
+
+        asyncio.run(run_test())
+
+
+class TestGetChangeDetailsWithLeanAccounts(unittest.TestCase):
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_lean_accounts_are_resolved(self, mock_exec_curl):
+        async def run_test():
+            details = {
+                "_number": 12345,
+                "subject": "Test Subject",
+                "owner": {"_account_id": 100},
+                "status": "NEW",
+                "reviewers": {"REVIEWER": [{"_account_id": 101}]},
+                "labels": {"Code-Review": {"all": [{"value": 1, "_account_id": 101}]}},
+            }
+            accounts = [
+                {"_account_id": 100, "email": "owner@example.com"},
+                {"_account_id": 101, "email": "reviewer@example.com"},
+            ]
+            mock_exec_curl.side_effect = [json.dumps(details).encode(), json.dumps(accounts).encode()]
+            main._account_cache.invalidate_host("https://lean-gerrit.com")
+
+            result = await main.get_change_details(
+                "12345", gerrit_base_url="https://lean-gerrit.com"
+            )
+
+            self.assertIn("Owner: owner@example.com", result[0]["text"])
+            self.assertIn("- reviewer@example.com (Code-Review: +1)", result[0]["text"])
+            account_url = mock_exec_curl.call_args_list[1][0][0][0]
+            self.assertIn("/accounts/?q=100%20OR%20101&o=DETAILS", account_url)
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    unittest.main()
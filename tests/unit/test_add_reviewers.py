@@ -0,0 +1,113 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server import reviewer_batch
+
+
+BASE_URL = "https://gerrit-review.googlesource.com"
+
+
+class TestReviewerBatch(unittest.TestCase):
+    def test_review_input(self):
+        payload = reviewer_batch.review_input(["a@example.com"], ["team"], notify="owner")
+        self.assertEqual(
+            payload,
+            {
+                "reviewers": [
+                    {"reviewer": "a@example.com", "state": "REVIEWER"},
+                    {"reviewer": "team", "state": "CC"},
+                ],
+                "notify": "OWNER",
+            },
+        )
+
+    def test_review_input_rejects_invalid(self):
+        with self.assertRaisesRegex(ValueError, "at least one reviewer"):
+            reviewer_batch.review_input()
+        with self.assertRaisesRegex(ValueError, "notify must be one of"):
+            reviewer_batch.review_input(["a"], notify="everyone")
+
+    def test_check_result(self):
+        self.assertIsNone(reviewer_batch.check_result({"reviewers": {"a": {"input": "a", "reviewers": []}}}))
+        self.assertEqual(
+            reviewer_batch.check_result({"reviewers": {"x": {"input": "x", "error": "x does not exist"}}}),
+            "x: x does not exist",
+        )
+        self.assertEqual(reviewer_batch.check_result("Not found"), "Response: Not found")
+
+
+class TestAddReviewers(unittest.TestCase):
+    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
+    def test_adds_all_in_one_review(self, mock_run_curl):
+        async def run_test():
+            mock_run_curl.return_value = json.dumps(
+                {
+                    "reviewers": {
+                        "a@example.com": {
+                            "input": "a@example.com",
+                            "reviewers": [{"_account_id": 1, "email": "a@example.com"}],
+                        },
+                        "team": {
+                            "input": "team",
+                            "ccs": [
+                                {"_account_id": 2, "email": "b@example.com"},
+                                {"_account_id": 3, "email": "c@example.com"},
+                            ],
+                        },
+                    }
+                }
+            )
+
+            result = await main.add_reviewers(
+                "123", reviewers=["a@example.com"], ccs=["team"], notify="OWNER", gerrit_base_url=BASE_URL
+            )
+
+            text = result[0]["text"]
+            self.assertIn("Added 2 reviewer(s) and CC(s) to CL 123", text)
+            self.assertIn("- team as CC: b@example.com, c@example.com", text)
+            mock_run_curl.assert_awaited_once()
+            args = mock_run_curl.call_args[0][0]
+            self.assertEqual(args[-1], f"{BASE_URL}/changes/123/revisions/current/review")
+            payload = json.loads(mock_run_curl.call_args.kwargs["body"])
+            self.assertEqual(len(payload["reviewers"]), 2)
+            self.assertEqual(payload["notify"], "OWNER")
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
+    def test_reports_failed_entry(self, mock_run_curl):
+        async def run_test():
+            mock_run_curl.return_value = json.dumps(
+                {
+                    "reviewers": {
+                        "a@example.com": {"input": "a@example.com"},
+                        "nobody": {"input": "nobody", "error": "nobody does not identify a registered user"},
+                    },
+                    "error": "error adding reviewer",
+                }
+            )
+
+            result = await main.add_reviewers(
+                "123", reviewers=["a@example.com", "nobody"], gerrit_base_url=BASE_URL
+            )
+
+            text = result[0]["text"]
+            self.assertIn("none were added", text)
+            self.assertIn("- a@example.com as REVIEWER: already added", text)
+            self.assertIn("- nobody as REVIEWER: FAILED: nobody does not identify", text)
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
+    def test_requires_someone(self, mock_run_curl):
+        result = asyncio.run(main.add_reviewers("123", gerrit_base_url=BASE_URL))
+
+        self.assertIn("No reviewers were added", result[0]["text"])
+        mock_run_curl.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
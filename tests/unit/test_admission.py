@@ -0,0 +1,130 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from gerrit_mcp_server import main, metrics
+from gerrit_mcp_server.admission import AdmissionController, Overloaded
+
+
+class TestAdmissionController(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_calls_queue_in_order_once_capacity_is_used(self):
+        async def run_test():
+            controller = AdmissionController(capacity=4, max_queue=4)
+            order = []
+            release = asyncio.Event()
+
+            async def call(name, cost):
+                async with controller.admit(name, cost):
+                    order.append(name)
+                    await release.wait()
+
+            tasks = [
+                asyncio.create_task(call("diff", 4)),
+                asyncio.create_task(call("small", 1)),
+                asyncio.create_task(call("other", 1)),
+            ]
+            await asyncio.sleep(0)
+            self.assertEqual(order, ["diff"])
+            self.assertEqual(controller.queued, 2)
+
+            release.set()
+            await asyncio.gather(*tasks)
+            self.assertEqual(order, ["diff", "small", "other"])
+            self.assertEqual(controller.in_use, 0)
+            self.assertEqual(metrics.snapshot()["timings"]["admission.queue_wait"]["count"], 3)
+
+        asyncio.run(run_test())
+
+    def test_full_queue_fails_fast(self):
+        async def run_test():
+            controller = AdmissionController(capacity=1, max_queue=1)
+            release = asyncio.Event()
+
+            async def call():
+                async with controller.admit("get_file_diff"):
+                    await release.wait()
+
+            tasks = [asyncio.create_task(call()), asyncio.create_task(call())]
+            await asyncio.sleep(0)
+            with self.assertRaisesRegex(Overloaded, "retry"):
+                async with controller.admit("get_file_diff"):
+                    pass
+            self.assertEqual(metrics.snapshot()["counters"]["admission.rejected"], 1)
+            release.set()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run_test())
+
+    def test_queue_timeout_releases_the_slot(self):
+        async def run_test():
+            controller = AdmissionController(capacity=1, queue_timeout_seconds=0.01)
+            release = asyncio.Event()
+
+            async def hold():
+                async with controller.admit("a"):
+                    await release.wait()
+
+            holder = asyncio.create_task(hold())
+            await asyncio.sleep(0)
+            with self.assertRaises(Overloaded):
+                async with controller.admit("b"):
+                    pass
+            self.assertEqual(controller.queued, 0)
+            release.set()
+            await holder
+            self.assertEqual(controller.in_use, 0)
+
+        asyncio.run(run_test())
+
+
+class TestAdmittedTools(unittest.TestCase):
+    @patch("gerrit_mcp_server.main._get_admission_controller")
+    def test_tools_are_admitted_with_their_cost(self, mock_get_controller):
+        async def run_test():
+            controller = AdmissionController(capacity=2, max_queue=0)
+            mock_get_controller.return_value = controller
+            controller.in_use = 2
+
+            with self.assertRaises(Overloaded):
+                await main.get_file_diff("123", "a.txt", gerrit_base_url="https://my-gerrit.com")
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main._get_admission_controller")
+    def test_tools_built_on_other_tools_are_admitted_once(self, mock_get_controller, mock_exec_curl):
+        async def run_test():
+            controller = AdmissionController(capacity=2, queue_timeout_seconds=0.01)
+            mock_get_controller.return_value = controller
+            mock_exec_curl.return_value = b"[]"
+
+            result = await main.query_changes_by_date_and_filters(
+                "2025-01-01", "2025-01-02", gerrit_base_url="https://my-gerrit.com"
+            )
+
+            self.assertIn("No changes found", result[0]["text"])
+            self.assertEqual(controller.in_use, 0)
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.bulk_mutations import ACTIONS, Checkpoint, RateLimiter, run_bulk
+from gerrit_mcp_server.curl_batch import BatchResult
+
+
+HOST = "https://gerrit-review.googlesource.com"
+
+
+class TestActions(unittest.TestCase):
+    def test_abandon_request_and_check(self):
+        action = ACTIONS["abandon"]
+        method, url, payload = action.request(HOST, "123", {"message": "stale"})
+        self.assertEqual((method, url, payload), ("POST", f"{HOST}/changes/123/abandon", {"message": "stale"}))
+        self.assertIsNone(action.check(json.dumps({"id": "x", "status": "ABANDONED"})))
+        self.assertIn("change is abandoned", action.check("change is abandoned"))
+
+    def test_empty_response_actions(self):
+        self.assertIsNone(ACTIONS["set_work_in_progress"].check(""))
+        self.assertIsNotNone(ACTIONS["set_ready_for_review"].check("change is not wip"))
+
+    def test_review_payload(self):
+        _, url, payload = ACTIONS["review"].request(HOST, "7", {"labels": {"Code-Review": -1}})
+        self.assertEqual(url, f"{HOST}/changes/7/revisions/current/review")
+        self.assertEqual(payload, {"labels": {"Code-Review": -1}})
+        self.assertIsNone(ACTIONS["review"].check(json.dumps({"labels": {"Code-Review": -1}})))
+
+
+class TestRunBulk(unittest.TestCase):
+    def test_batches_are_bounded_and_order_kept(self):
+        batches = []
+
+        async def execute_batch(change_ids):
+            batches.append(change_ids)
+            return [(c != "3", "" if c != "3" else "conflict") for c in change_ids]
+
+        outcomes = asyncio.run(run_bulk([str(n) for n in range(1, 7)], execute_batch, batch_size=4))
+
+        self.assertEqual(batches, [["1", "2", "3", "4"], ["5", "6"]])
+        self.assertEqual([o.change_id for o in outcomes], ["1", "2", "3", "4", "5", "6"])
+        self.assertEqual([o.ok for o in outcomes], [True, True, False, True, True, True])
+        self.assertEqual(outcomes[2].detail, "conflict")
+
+    def test_exception_is_an_outcome(self):
+        async def execute_batch(change_ids):
+            raise RuntimeError("curl failed")
+
+        outcomes = asyncio.run(run_bulk(["1", "2"], execute_batch))
+
+        self.assertEqual([o.ok for o in outcomes], [False, False])
+        self.assertEqual(outcomes[0].detail, "curl failed")
+
+    def test_checkpoint_skips_succeeded(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "job.json")
+            checkpoint = Checkpoint(path)
+            checkpoint.targets = ["1", "2"]
+            checkpoint.record("1", True, "")
+            checkpoint.record("2", False, "conflict")
+            executed = []
+
+            async def execute_batch(change_ids):
+                executed.extend(change_ids)
+                return [(True, "")] * len(change_ids)
+
+            outcomes = asyncio.run(run_bulk(["1", "2"], execute_batch, checkpoint=Checkpoint(path)))
+
+            self.assertEqual(executed, ["2"])
+            self.assertTrue(outcomes[0].resumed)
+            self.assertTrue(Checkpoint(path).outcomes["2"]["ok"])
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_waits_for_tokens(self):
+        now = [0.0]
+        slept = []
+
+        async def fake_sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(2.0, burst=1, clock=lambda: now[0])
+
+        async def run_test():
+            with patch("gerrit_mcp_server.bulk_mutations.asyncio.sleep", fake_sleep):
+                for _ in range(3):
+                    await limiter.acquire()
+
+        asyncio.run(run_test())
+
+        self.assertEqual(slept, [0.5, 0.5])
+
+
+class TestBulkMutateChangesTool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config = {
+            "gerrit_hosts": [{"external_url": HOST, "authentication": {"type": "gob_curl"}}],
+            "bulk_mutations": {"checkpoint_dir": self.temp_dir.name, "rate_per_second": 1000},
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @patch("gerrit_mcp_server.main._bulk_rate_limiters", None)
+    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_dry_run_does_not_mutate(self, mock_load_config, mock_run_curl):
+        mock_load_config.return_value = self.config
+        mock_run_curl.return_value = json.dumps(
+            [{"_number": 1, "subject": "Old fix"}, {"_number": 2, "subject": "Older fix"}]
+        )
+
+        result = asyncio.run(
+            main.bulk_mutate_changes("abandon", query="status:open age:1y", dry_run=True, gerrit_base_url=HOST)
+        )
+
+        self.assertIn("Abandon 2 CL(s)", result[0]["text"])
+        self.assertIn("- 2: Older fix", result[0]["text"])
+        mock_run_curl.assert_awaited_once()
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    @patch("gerrit_mcp_server.main._bulk_rate_limiters", None)
+    @patch("gerrit_mcp_server.main.run_curl_batch", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_resume_retries_only_failures(self, mock_load_config, mock_run_curl):
+        mock_load_config.return_value = self.config
+        responses = {"1": BatchResult(204, b""), "2": BatchResult(409, b"change is closed")}
+
+        async def fake_run_curl_batch(transfers, base_url, max_parallel, bodies):
+            return [responses[args[-1].split("/")[-2]] for args in transfers]
+
+        mock_run_curl.side_effect = fake_run_curl_batch
+
+        first = asyncio.run(
+            main.bulk_mutate_changes("set_work_in_progress", change_ids=["1", "2"], gerrit_base_url=HOST)
+        )
+        self.assertIn("1 succeeded, 1 failed", first[0]["text"])
+        self.assertIn("- 2: FAILED: HTTP 409: change is closed", first[0]["text"])
+
+        responses["2"] = BatchResult(204, b"")
+        mock_run_curl.reset_mock()
+        second = asyncio.run(
+            main.bulk_mutate_changes("set_work_in_progress", change_ids=["1", "2"], gerrit_base_url=HOST)
+        )
+        self.assertIn("1 succeeded, 0 failed, 1 already done", second[0]["text"])
+        transfers = mock_run_curl.call_args[0][0]
+        self.assertEqual([args[-1] for args in transfers], [f"{HOST}/changes/2/wip"])
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+        # Once every CL succeeded, the same call is a new job.
+        mock_run_curl.reset_mock()
+        third = asyncio.run(
+            main.bulk_mutate_changes("set_work_in_progress", change_ids=["1", "2"], gerrit_base_url=HOST)
+        )
+        self.assertIn("2 succeeded, 0 failed, 0 already done", third[0]["text"])
+        self.assertEqual(len(mock_run_curl.call_args[0][0]), 2)
+
+    @patch("gerrit_mcp_server.main._bulk_rate_limiters", None)
+    @patch("gerrit_mcp_server.main.run_curl_batch", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_add_reviewers_to_each_change(self, mock_load_config, mock_run_curl):
+        mock_load_config.return_value = self.config
+        response = json.dumps({"reviewers": {"a@example.com": {"input": "a@example.com"}}}).encode()
+        mock_run_curl.return_value = [BatchResult(200, response)] * 2
+
+        result = asyncio.run(
+            main.bulk_mutate_changes(
+                "add_reviewers", change_ids=["1", "2"], reviewers=["a@example.com"], gerrit_base_url=HOST
+            )
+        )
+
+        self.assertIn("2 succeeded, 0 failed", result[0]["text"])
+        mock_run_curl.assert_awaited_once()
+        transfers = mock_run_curl.call_args[0][0]
+        self.assertEqual(len(transfers), 2)
+        self.assertEqual(
+            json.loads(mock_run_curl.call_args.kwargs["bodies"][0]),
+            {"reviewers": [{"reviewer": "a@example.com", "state": "REVIEWER"}]},
+        )
+
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_rejects_missing_arguments(self, mock_load_config):
+        mock_load_config.return_value = self.config
+
+        result = asyncio.run(main.bulk_mutate_changes("set_topic", change_ids=["1"], gerrit_base_url=HOST))
+        self.assertIn("requires: topic", result[0]["text"])
+
+        result = asyncio.run(main.bulk_mutate_changes("rebase", change_ids=["1"], gerrit_base_url=HOST))
+        self.assertIn("Unknown action 'rebase'", result[0]["text"])
+
+        result = asyncio.run(main.bulk_mutate_changes("add_reviewers", change_ids=["1"], gerrit_base_url=HOST))
+        self.assertIn("Invalid arguments for add_reviewers: at least one reviewer", result[0]["text"])
+
+        result = asyncio.run(main.bulk_mutate_changes("review", change_ids=["1"], gerrit_base_url=HOST))
+        self.assertIn("Invalid arguments for review: a message or labels are required.", result[0]["text"])
+
+    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_refuses_too_many_matches(self, mock_load_config, mock_run_curl):
+        self.config["bulk_mutations"]["max_changes"] = 1
+        mock_load_config.return_value = self.config
+        mock_run_curl.return_value = json.dumps([{"_number": 1}, {"_number": 2}])
+
+        result = asyncio.run(main.bulk_mutate_changes("abandon", query="status:open", gerrit_base_url=HOST))
+
+        self.assertIn("More than 1 CLs match", result[0]["text"])
+        self.assertIn("&n=2", mock_run_curl.call_args[0][0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.change_batcher import ChangeBatcher, matches
+
+HOST = "https://my-gerrit.com"
+
+
+def _change(number, change_id=None, project="p"):
+    return {
+        "_number": number,
+        "project": project,
+        "change_id": change_id or f"I{number:040d}",
+        "id": f"{project}~main~{change_id or f'I{number:040d}'}",
+        "subject": f"Change {number}",
+    }
+
+
+class TestChangeBatcher(unittest.TestCase):
+    def test_matches(self):
+        change = _change(7, "Iabc")
+        self.assertTrue(matches("7", change))
+        self.assertTrue(matches("Iabc", change))
+        self.assertTrue(matches("p~7", change))
+        self.assertTrue(matches("p~main~Iabc", change))
+        self.assertFalse(matches("8", change))
+        self.assertFalse(matches("q~7", change))
+
+    def test_concurrent_lookups_share_one_query(self):
+        async def run_test():
+            fetch_batch = AsyncMock(return_value=[_change(1), _change(2)])
+            fetch_one = AsyncMock()
+            batcher = ChangeBatcher(fetch_batch, fetch_one, window_seconds=0.01)
+
+            results = await asyncio.gather(
+                batcher.get(HOST, "1"), batcher.get(HOST, "2"), batcher.get(HOST, "1")
+            )
+
+            self.assertEqual([r["_number"] for r in results], [1, 2, 1])
+            fetch_batch.assert_awaited_once_with(HOST, ["1", "2"], (), False)
+            fetch_one.assert_not_awaited()
+
+        asyncio.run(run_test())
+
+    def test_different_options_are_not_merged(self):
+        async def run_test():
+            fetch_one = AsyncMock(side_effect=lambda host, change_id, options, detail: _change(int(change_id)))
+            batcher = ChangeBatcher(AsyncMock(), fetch_one, window_seconds=0.01)
+
+            await asyncio.gather(
+                batcher.get(HOST, "1", ("MESSAGES",)), batcher.get(HOST, "2", detail=True)
+            )
+
+            self.assertEqual(fetch_one.await_count, 2)
+
+        asyncio.run(run_test())
+
+    def test_missing_and_ambiguous_changes_are_looked_up_alone(self):
+        async def run_test():
+            fetch_batch = AsyncMock(
+                return_value=[_change(1), _change(5, "Idup"), _change(6, "Idup")]
+            )
+            fetch_one = AsyncMock(side_effect=[ValueError("Not found: 404"), _change(5, "Idup")])
+            batcher = ChangeBatcher(fetch_batch, fetch_one, window_seconds=0.01)
+
+            results = await asyncio.gather(
+                batcher.get(HOST, "1"),
+                batcher.get(HOST, "404"),
+                batcher.get(HOST, "Idup"),
+                return_exceptions=True,
+            )
+
+            self.assertEqual(results[0]["_number"], 1)
+            self.assertIsInstance(results[1], ValueError)
+            self.assertEqual(results[2]["_number"], 5)
+            self.assertEqual(
+                [c.args[1] for c in fetch_one.await_args_list], ["404", "Idup"]
+            )
+
+        asyncio.run(run_test())
+
+    def test_full_batch_is_sent_without_waiting(self):
+        async def run_test():
+            fetch_batch = AsyncMock(return_value=[_change(1), _change(2)])
+            batcher = ChangeBatcher(fetch_batch, AsyncMock(), window_seconds=60, max_batch_size=2)
+
+            results = await asyncio.wait_for(
+                asyncio.gather(batcher.get(HOST, "1"), batcher.get(HOST, "2")), 1
+            )
+
+            self.assertEqual(len(results), 2)
+
+        asyncio.run(run_test())
+
+    def test_batch_errors_reach_every_caller(self):
+        async def run_test():
+            batcher = ChangeBatcher(
+                AsyncMock(side_effect=Exception("Gerrit is down")), AsyncMock(), window_seconds=0.01
+            )
+            results = await asyncio.gather(
+                batcher.get(HOST, "1"), batcher.get(HOST, "2"), return_exceptions=True
+            )
+            self.assertEqual([str(r) for r in results], ["Gerrit is down"] * 2)
+
+        asyncio.run(run_test())
+
+
+class TestChangeBatchingInTools(unittest.TestCase):
+    @patch("gerrit_mcp_server.main._change_batcher", None)
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_concurrent_get_change_details(self, mock_load_config, mock_exec_curl):
+        mock_load_config.return_value = {
+            "gerrit_hosts": [{"external_url": HOST, "authentication": {"type": "gob_curl"}}],
+            "change_batching": {"enabled": True, "window_seconds": 0.01},
+        }
+        changes = [dict(_change(n), owner={"email": "o@example.com"}, status="NEW") for n in (1, 2)]
+        mock_exec_curl.return_value = json.dumps(changes).encode()
+
+        async def run_test():
+            return await asyncio.gather(
+                main.get_change_details("1", gerrit_base_url=HOST),
+                main.get_change_details("2", gerrit_base_url=HOST),
+            )
+
+        results = asyncio.run(run_test())
+
+        self.assertIn("Summary for CL 1", results[0][0]["text"])
+        self.assertIn("Summary for CL 2", results[1][0]["text"])
+        mock_exec_curl.assert_awaited_once()
+        url = mock_exec_curl.call_args[0][0][0]
+        self.assertIn("change%3A1%20OR%20change%3A2", url)
+        self.assertIn("o=DETAILED_LABELS", url)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.change_graph import ChangeGraph, StackEdges, parse_related
+
+
+HOST = "https://gerrit-review.googlesource.com"
+
+
+def _change(number, revision, approved=True, **fields):
+    label = {"approved": {"_account_id": 1}} if approved else {}
+    change = {
+        "_number": number,
+        "subject": f"Change {number}",
+        "status": "NEW",
+        "current_revision": revision,
+        "labels": {"Code-Review": label},
+        "submittable": approved,
+    }
+    change.update(fields)
+    return change
+
+
+class TestChangeGraph(unittest.TestCase):
+    def test_edges_are_keyed_by_revision(self):
+        graph = ChangeGraph()
+        edges = StackEdges(["1", "2"], [], [])
+        graph.put(HOST, "2", "rev-a", edges)
+
+        self.assertIs(graph.get(HOST, "2", "rev-a"), edges)
+        self.assertIsNone(graph.get(HOST, "2", "rev-b"))
+
+    def test_edges_expire(self):
+        now = [0.0]
+        graph = ChangeGraph(ttl_seconds=60, clock=lambda: now[0])
+        edges = StackEdges(["1", "2"], [], ["7"])
+        graph.put(HOST, "2", "rev-a", edges)
+
+        now[0] = 59.0
+        self.assertIs(graph.get(HOST, "2", "rev-a"), edges)
+        now[0] = 60.0
+        self.assertIsNone(graph.get(HOST, "2", "rev-a"))
+
+    def test_new_member_revision_drops_groups_containing_it(self):
+        graph = ChangeGraph()
+        graph.put(HOST, "2", "rev-2", StackEdges(["1", "2"], [], []))
+        graph.put(HOST, "5", "rev-5", StackEdges(["5"], [], []))
+        self.assertFalse(graph.observe(HOST, "1", "rev-1"))
+
+        self.assertTrue(graph.observe(HOST, "1", "rev-1b"))
+
+        self.assertIsNone(graph.get(HOST, "2", "rev-2"))
+        self.assertIsNotNone(graph.get(HOST, "5", "rev-5"))
+
+    def test_seen_revisions_are_bounded(self):
+        graph = ChangeGraph(max_revisions=2)
+        graph.observe(HOST, "1", "rev-1")
+        graph.observe(HOST, "2", "rev-2")
+        graph.observe(HOST, "1", "rev-1")
+        graph.observe(HOST, "3", "rev-3")
+
+        self.assertEqual(len(graph._revisions), 2)
+        # Change 2 was seen least recently, so its revision was forgotten.
+        self.assertFalse(graph.observe(HOST, "2", "rev-2b"))
+        self.assertTrue(graph.observe(HOST, "3", "rev-3b"))
+
+    def test_parse_related(self):
+        response = {
+            "changes": [
+                {"_change_number": 3, "_revision_number": 1, "_current_revision_number": 1},
+                {"_change_number": 2, "_revision_number": 1, "_current_revision_number": 2},
+                {"_change_number": 1, "_revision_number": 4, "_current_revision_number": 4},
+            ]
+        }
+
+        self.assertEqual(parse_related(response), (["1", "2", "3"], ["2"]))
+
+
+class TestGetStackStatus(unittest.TestCase):
+    def setUp(self):
+        self.changes = {
+            "1": _change(1, "a1", status="MERGED"),
+            "2": _change(2, "a2"),
+            "3": _change(3, "a3", approved=False),
+        }
+        self.related = {
+            "changes": [
+                {"_change_number": n, "_revision_number": 1, "_current_revision_number": 1}
+                for n in (3, 2, 1)
+            ]
+        }
+        self.requests = []
+
+        async def fake_exec_curl(args, base_url, body=None):
+            url = args[-1]
+            self.requests.append(url)
+            if url.endswith("/related"):
+                return json.dumps(self.related).encode()
+            if "/submitted_together" in url:
+                return json.dumps({"changes": [self.changes["2"], self.changes["3"]], "non_visible_changes": 0}).encode()
+            number = url.split("/changes/")[1].split("?")[0]
+            return json.dumps(self.changes[number]).encode()
+
+        patcher = patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock, side_effect=fake_exec_curl)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        graph_patcher = patch("gerrit_mcp_server.main._change_graph", ChangeGraph())
+        graph_patcher.start()
+        self.addCleanup(graph_patcher.stop)
+
+    def _edge_requests(self):
+        return [u for u in self.requests if u.endswith("/related") or "/submitted_together" in u]
+
+    def test_reports_blocking_members(self):
+        result = asyncio.run(main.get_stack_status("3", gerrit_base_url=HOST))
+
+        text = result[0]["text"]
+        self.assertIn("Stack of 3 CL(s) around CL 3", text)
+        self.assertIn("- 1 [MERGED] Change 1", text)
+        self.assertIn("- 2 [NEW] Change 2: Code-Review approved; ready", text)
+        self.assertIn("- 3 [NEW] Change 3: Code-Review missing; blocked: Code-Review missing", text)
+        self.assertIn("1 of 2 open CL(s) are ready. Blocking: 3 (Code-Review missing)", text)
+        self.assertIn("o=CURRENT_REVISION", self.requests[0])
+
+    def test_edges_are_cached_until_a_member_moves(self):
+        asyncio.run(main.get_stack_status("3", gerrit_base_url=HOST))
+        self.assertEqual(len(self._edge_requests()), 2)
+
+        self.changes["3"] = _change(3, "a3")
+        result = asyncio.run(main.get_stack_status("3", gerrit_base_url=HOST))
+        self.assertEqual(len(self._edge_requests()), 2)
+        self.assertIn("All 2 open CL(s) are approved and ready.", result[0]["text"])
+
+        # Change 2 was rebased: the chain is fetched again.
+        self.changes["2"]["current_revision"] = "b2"
+        asyncio.run(main.get_stack_status("3", gerrit_base_url=HOST))
+        self.assertEqual(len(self._edge_requests()), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+from urllib.parse import unquote
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.change_index import LocalChangeIndex
+
+HOST = "https://gerrit.example.com"
+
+
+def _change(number, updated, status="MERGED", message="Fix the frobnicator", project="proj"):
+    return {
+        "_number": number,
+        "project": project,
+        "branch": "main",
+        "subject": message.splitlines()[0],
+        "owner": {"_account_id": 1, "email": "owner@example.com"},
+        "status": status,
+        "created": updated,
+        "updated": updated,
+        "current_revision": "rev",
+        "revisions": {"rev": {"commit": {"message": message}}},
+    }
+
+
+def _gerrit_response(value):
+    return b")]}'\n" + json.dumps(value).encode("utf-8")
+
+
+class TestLocalChangeIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = LocalChangeIndex(":memory:")
+        self.index.upsert_changes(
+            HOST,
+            [
+                _change(1, "2025-01-10 10:00:00.000000000"),
+                _change(2, "2025-01-11 10:00:00.000000000", message="Add widget\n\nBug: 12"),
+                _change(3, "2025-01-11 12:00:00.000000000", status="ABANDONED"),
+                _change(4, "2025-01-12 10:00:00.000000000", project="other"),
+            ],
+        )
+        self.index.finish_sync(HOST, "2025-01-01", "2025-02-01 00:00:00.000000000")
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_covers_only_settled_ranges_inside_the_synced_window(self):
+        self.assertTrue(self.index.covers(HOST, "merged", "2025-01-10", "2025-01-12"))
+        self.assertFalse(self.index.covers(HOST, "open", "2025-01-10", "2025-01-12"))
+        self.assertFalse(self.index.covers(HOST, "merged", "2024-12-01", "2025-01-12"))
+        self.assertFalse(self.index.covers(HOST, "merged", "2025-01-10", "2025-03-01"))
+        self.assertFalse(self.index.covers("https://other.com", "merged", "2025-01-10", "2025-01-12"))
+
+    def test_query_filters_by_date_status_and_project(self):
+        changes = self.index.query(HOST, "merged", "2025-01-10", "2025-01-13", project="proj")
+        self.assertEqual([c["_number"] for c in changes], [2, 1])
+        changes = self.index.query(HOST, "closed", "2025-01-11", "2025-01-12")
+        self.assertEqual([c["_number"] for c in changes], [3, 2])
+
+    def test_query_by_message_substring(self):
+        changes = self.index.query(
+            HOST, "merged", "2025-01-01", "2025-02-01", message_substring="Bug: 12"
+        )
+        self.assertEqual([c["_number"] for c in changes], [2])
+
+    def test_upsert_replaces_existing_rows(self):
+        self.index.upsert_changes(
+            HOST, [_change(1, "2025-01-20 10:00:00.000000000", message="Renamed")]
+        )
+        changes = self.index.query(HOST, "merged", "2025-01-10", "2025-01-11")
+        self.assertEqual(changes, [])
+        changes = self.index.query(
+            HOST, "merged", "2025-01-01", "2025-02-01", message_substring="Renamed"
+        )
+        self.assertEqual([c["_number"] for c in changes], [1])
+
+
+class TestSyncLocalChangeIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = LocalChangeIndex(":memory:")
+        self.queries = []
+
+    def tearDown(self):
+        self.index.close()
+
+    def _fake_exec_curl(self, fail_after=None):
+        async def fake_exec_curl(args, base_url, body=None):
+            query = unquote(args[0].split("q=")[1].split("&")[0])
+            self.queries.append(query)
+            if fail_after is not None and len(self.queries) > fail_after:
+                raise Exception("curl command failed with exit code 28.")
+            if query.startswith("after:2025-01-01 "):
+                return _gerrit_response([_change(1, "2025-01-10 10:00:00.000000000")])
+            return _gerrit_response([])
+
+        return fake_exec_curl
+
+    def test_history_is_synced_in_windows_oldest_first(self):
+        with patch("gerrit_mcp_server.main._exec_curl", side_effect=self._fake_exec_curl()):
+            synced = asyncio.run(main._sync_local_change_index(self.index, HOST, "2025-01-01", window_days=100))
+
+        self.assertEqual(synced, 1)
+        self.assertEqual(self.queries[0], 'after:2025-01-01 before:"2025-04-11 00:00:00"')
+        self.assertEqual(self.queries[1], 'after:"2025-04-11 00:00:00" before:"2025-07-20 00:00:00"')
+        self.assertNotIn("before:", self.queries[-1])
+        self.assertIsNotNone(self.index.sync_state(HOST)["synced_at"])
+
+    def test_interrupted_sync_keeps_the_windows_it_finished(self):
+        with patch("gerrit_mcp_server.main._exec_curl", side_effect=self._fake_exec_curl(fail_after=1)):
+            with self.assertRaises(Exception):
+                asyncio.run(main._sync_local_change_index(self.index, HOST, "2025-01-01", window_days=100))
+
+        state = self.index.sync_state(HOST)
+        self.assertEqual(state["cursor"], "2025-04-11 00:00:00")
+        self.assertIsNone(state["synced_at"])
+        self.assertTrue(self.index.covers(HOST, "merged", "2025-01-01", "2025-04-11"))
+        self.assertFalse(self.index.covers(HOST, "merged", "2025-01-01", "2025-05-01"))
+
+        # The next sync resumes after the last finished window.
+        self.queries.clear()
+        with patch("gerrit_mcp_server.main._exec_curl", side_effect=self._fake_exec_curl()):
+            asyncio.run(main._sync_local_change_index(self.index, HOST, "2025-01-01", window_days=100))
+        self.assertTrue(self.queries[0].startswith('after:"2025-04-11 00:00:00"'))
+
+
+class TestQueryChangesFromLocalIndex(unittest.TestCase):
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_historical_query_is_served_locally_after_sync(self, mock_load_config, mock_exec_curl):
+        async def run_test():
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                mock_load_config.return_value = {
+                    "gerrit_hosts": [{"external_url": HOST, "authentication": {"type": "gob_curl"}}],
+                    "local_change_index": {
+                        "path": os.path.join(tmp_dir, "index.sqlite3"),
+                        "hosts": [HOST],
+                        "sync_since": "2025-01-01",
+                        "sync_window_days": 3650,
+                    },
+                }
+                page = [
+                    _change(2, "2025-02-01 10:00:00.000000000"),
+                    _change(1, "2025-01-10 10:00:00.000000000"),
+                ]
+                mock_exec_curl.return_value = _gerrit_response(page)
+
+                # The first query starts the sync in the background and goes to Gerrit.
+                await main.query_changes_by_date_and_filters(
+                    "2025-01-01", "2025-01-31", gerrit_base_url=HOST
+                )
+                live_url = mock_exec_curl.call_args_list[0][0][0][0]
+                self.assertIn("before%3A2025-02-01", live_url)
+                await main._local_index_syncs[HOST]
+                self.assertEqual(mock_exec_curl.call_count, 2)
+                self.assertIn("after%3A2025-01-01", mock_exec_curl.call_args[0][0][0])
+
+                result = await main.query_changes_by_date_and_filters(
+                    "2025-01-01", "2025-01-31", gerrit_base_url=HOST
+                )
+
+                self.assertEqual(mock_exec_curl.call_count, 2)
+                self.assertIn("- 1: Fix the frobnicator", result[0]["text"])
+                self.assertIn("local change index", result[0]["text"])
+
+                # Ranges past the synced window still go to Gerrit.
+                mock_exec_curl.return_value = _gerrit_response([])
+                await main.query_changes_by_date_and_filters(
+                    "2025-01-01", "2025-03-01", gerrit_base_url=HOST
+                )
+                self.assertIn("before%3A2025-03-02", mock_exec_curl.call_args[0][0][0])
+
+                for index in main._local_change_indexes.values():
+                    index.close()
+                main._local_change_indexes.clear()
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.change_watcher import ChangeWatcher
+
+
+def _gerrit_response(value):
+    return b")]}'\n" + json.dumps(value).encode("utf-8")
+
+
+class Session:
+    pass
+
+
+class TestChangeWatcher(unittest.TestCase):
+    def test_watchers_share_one_poller(self):
+        async def run_test():
+            poll = AsyncMock(return_value=[{"_number": 1, "updated": "t1"}])
+            watcher = ChangeWatcher(poll, AsyncMock(), min_interval=60)
+            first, second = Session(), Session()
+
+            watch_a = await watcher.watch("https://g.com", "change:1", first)
+            watch_b = await watcher.watch("https://g.com", "change:1", second)
+
+            self.assertIs(watch_a, watch_b)
+            self.assertEqual(poll.call_count, 1)
+            self.assertEqual(len(watcher.watches()), 1)
+
+            self.assertTrue(watcher.unwatch(watch_a.id, first))
+            self.assertIsNotNone(watcher.get(watch_a.id))
+            self.assertTrue(watcher.unwatch(watch_a.id, second))
+            self.assertIsNone(watcher.get(watch_a.id))
+
+        asyncio.run(run_test())
+
+    def test_incremental_polls_use_age_and_detect_updates(self):
+        async def run_test():
+            poll = AsyncMock(return_value=[{"_number": 1, "updated": "t1"}])
+            watcher = ChangeWatcher(poll, AsyncMock(), min_interval=60)
+            watch = await watcher.watch("https://g.com", "status:open", Session())
+
+            poll.return_value = []
+            self.assertEqual(await watcher.poll_once(watch), [])
+            self.assertIn("(status:open) -age:", poll.call_args[0][1])
+
+            poll.return_value = [{"_number": 1, "updated": "t2"}]
+            self.assertEqual(await watcher.poll_once(watch), [1])
+            watcher.stop_all()
+
+        asyncio.run(run_test())
+
+    def test_full_refresh_detects_changes_leaving_the_query(self):
+        async def run_test():
+            poll = AsyncMock(return_value=[{"_number": 1, "updated": "t1"}])
+            watcher = ChangeWatcher(poll, AsyncMock(), full_refresh_every=1)
+            watch = await watcher.watch("https://g.com", "status:open", Session())
+
+            poll.return_value = []
+            self.assertEqual(await watcher.poll_once(watch), [1])
+            self.assertEqual(poll.call_args[0][1], "status:open")
+            self.assertEqual(watch.snapshot, {})
+            watcher.stop_all()
+
+        asyncio.run(run_test())
+
+    def test_notifies_subscribers_and_backs_off(self):
+        async def run_test():
+            poll = AsyncMock(return_value=[{"_number": 1, "updated": "t1"}])
+            notify = AsyncMock()
+            watcher = ChangeWatcher(poll, notify, min_interval=0.01, max_interval=1)
+            session = Session()
+            watch = await watcher.watch("https://g.com", "change:1", session)
+
+            await asyncio.sleep(0.05)
+            self.assertGreater(watch.interval, 0.01)
+            notify.assert_not_called()
+
+            poll.return_value = [{"_number": 1, "updated": "t2"}]
+            watch.interval = 0.01
+            await asyncio.sleep(0.05)
+            notify.assert_any_call(session, watch.uri)
+            watcher.stop_all()
+
+        asyncio.run(run_test())
+
+
+class TestWatchTools(unittest.TestCase):
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_watch_and_unwatch_change(self, mock_exec_curl):
+        async def run_test():
+            mock_exec_curl.return_value = _gerrit_response(
+                [{"_number": 123, "subject": "Fix it", "status": "NEW", "updated": "t1"}]
+            )
+            ctx = MagicMock()
+
+            result = await main.watch_changes(
+                change_id="123", gerrit_base_url="https://my-gerrit.com", ctx=ctx
+            )
+            text = result[0]["text"]
+            self.assertIn("Watching with ID", text)
+            self.assertIn("- 123: Fix it [NEW]", text)
+            self.assertIn("change%3A123", mock_exec_curl.call_args[0][0][0])
+
+            watch = main._change_watcher.watches()[0]
+            resource = await main.read_watch(watch.id)
+            self.assertIn("Fix it", resource)
+
+            result = await main.unwatch_changes(watch.id, ctx=ctx)
+            self.assertIn("Stopped watching", result[0]["text"])
+            self.assertEqual(main._change_watcher.watches(), [])
+
+        asyncio.run(run_test())
+
+    def test_watch_requires_exactly_one_target(self):
+        async def run_test():
+            result = await main.watch_changes(ctx=MagicMock())
+            self.assertIn("exactly one", result[0]["text"])
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from gerrit_mcp_server import main, metrics
+from gerrit_mcp_server.curl_batch import MARKER
+from gerrit_mcp_server.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "my-gerrit.com", failure_threshold=3, reset_timeout_seconds=30, clock=self.clock
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(3):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaisesRegex(CircuitOpenError, "my-gerrit.com is unavailable"):
+            self.breaker.before_call()
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["gauges"]["circuit_breaker.my-gerrit.com.state"], OPEN)
+        self.assertEqual(snapshot["counters"]["circuit_breaker.my-gerrit.com.rejected"], 1)
+
+    def test_opens_on_high_error_rate(self):
+        breaker = CircuitBreaker("h", failure_threshold=100, window_size=10, min_calls=10)
+        for i in range(10):
+            breaker.before_call()
+            breaker.record_failure() if i % 2 else breaker.record_success()
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_half_open_lets_one_probe_through(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 31
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        with self.assertRaisesRegex(CircuitOpenError, "probe"):
+            self.breaker.before_call()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.before_call()
+
+    def test_failed_probe_reopens(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 31
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.opened_at, 31)
+
+    def test_abandoned_probe_allows_another(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 31
+        self.breaker.before_call()
+        self.breaker.record_abandoned()
+        self.breaker.before_call()
+
+    def test_check_does_not_take_the_probe(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.check()
+        self.clock.now = 31
+        self.breaker.check()
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        with self.assertRaisesRegex(CircuitOpenError, "probe"):
+            self.breaker.check()
+
+    def test_breakers_are_per_host(self):
+        breakers = CircuitBreakers(failure_threshold=1)
+        breakers.get("a").record_failure()
+        self.assertEqual(breakers.get("a").state, OPEN)
+        self.assertEqual(breakers.get("b").state, CLOSED)
+
+
+class TestRunCurlCircuitBreaker(unittest.TestCase):
+    @patch("gerrit_mcp_server.main._circuit_breakers", CircuitBreakers(failure_threshold=2))
+    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_unreachable_host_fails_fast(self, mock_load_config, mock_exec):
+        mock_load_config.return_value = {
+            "gerrit_hosts": [{"external_url": "https://down.com", "authentication": {"type": "gob_curl"}}]
+        }
+        process = MagicMock()
+        process.communicate = AsyncMock(return_value=(b"", b"Failed to connect"))
+        process.returncode = 7
+        mock_exec.return_value = process
+
+        async def run_test():
+            for _ in range(2):
+                with self.assertRaisesRegex(Exception, "exit code 7"):
+                    await main.run_curl(["https://down.com/a/changes/1"], "https://down.com/a")
+            with self.assertRaises(CircuitOpenError):
+                await main.run_curl(["https://down.com/a/changes/1"], "https://down.com")
+            self.assertEqual(mock_exec.await_count, 2)
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main._circuit_breakers", CircuitBreakers(failure_threshold=2))
+    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_server_errors_open_the_circuit_and_client_errors_do_not(self, mock_load_config, mock_exec):
+        mock_load_config.return_value = {
+            "gerrit_hosts": [{"external_url": "https://gateway.com", "authentication": {"type": "gob_curl"}}]
+        }
+
+        def answer(status):
+            process = MagicMock()
+            process.communicate = AsyncMock(
+                return_value=(b"Bad Gateway", f"\n@@gerrit-mcp-status {status}\n".encode())
+            )
+            process.returncode = 0
+            return process
+
+        async def run_test():
+            breaker = main._circuit_breakers.get("gateway.com")
+            mock_exec.return_value = answer(404)
+            for _ in range(3):
+                await main.run_curl(["https://gateway.com/changes/1"], "https://gateway.com")
+            self.assertEqual(breaker.state, CLOSED)
+
+            mock_exec.return_value = answer(502)
+            for _ in range(2):
+                await main.run_curl(["https://gateway.com/changes/1"], "https://gateway.com")
+            self.assertEqual(breaker.state, OPEN)
+            command = mock_exec.call_args[0]
+            self.assertIn("--write-out", command)
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main._circuit_breakers", CircuitBreakers(failure_threshold=1))
+    @patch("gerrit_mcp_server.curl_batch.build_config", side_effect=OSError("No space left on device"))
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_failed_batch_setup_releases_the_probe(self, mock_load_config, _):
+        mock_load_config.return_value = {
+            "gerrit_hosts": [
+                {
+                    "external_url": "https://recovering.com",
+                    "authentication": {"type": "http_basic", "username": "u", "auth_token": "t"},
+                }
+            ]
+        }
+        breaker = main._circuit_breakers.get("recovering.com")
+        breaker.record_failure()
+        breaker.opened_at -= breaker.reset_timeout_seconds + 1
+
+        with self.assertRaises(OSError):
+            asyncio.run(main.run_curl_batch([["https://recovering.com/a"]], "https://recovering.com"))
+
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.before_call()
+
+    @patch("gerrit_mcp_server.main._circuit_breakers", CircuitBreakers(failure_threshold=1))
+    @patch("gerrit_mcp_server.main.get_curl_command_for_gerrit_url", return_value=["gob-curl", "-s"])
+    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_separate_transfers_probe_a_half_open_circuit(self, mock_load_config, mock_exec, _):
+        mock_load_config.return_value = {"gerrit_hosts": []}
+        breaker = main._circuit_breakers.get("recovered.com")
+        breaker.record_failure()
+        breaker.opened_at -= breaker.reset_timeout_seconds + 1
+
+        async def fake_exec(*command, **kwargs):
+            index = os.path.basename(command[command.index("--output") + 1])
+            process = MagicMock()
+            process.communicate = AsyncMock(return_value=(f"\n{MARKER} {index} 200 0 \n".encode(), b""))
+            process.returncode = 0
+            return process
+
+        mock_exec.side_effect = fake_exec
+
+        results = asyncio.run(
+            main._run_curl_transfers_separately(
+                [["https://recovered.com/a"], ["https://recovered.com/b"]], "https://recovered.com", 4, None
+            )
+        )
+
+        self.assertEqual([result.status for result in results], [200, 200])
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(mock_exec.await_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
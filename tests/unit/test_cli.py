@@ -16,6 +16,7 @@
 Tests for the command-line interface of the Gerrit MCP server.
 """
 
+import os
 import unittest
 from unittest.mock import patch
 from gerrit_mcp_server import main
@@ -45,6 +46,18 @@ class TestCli(unittest.TestCase):
         self.assertEqual(mock_mcp.settings.port, 9999)
         mock_mcp.run.assert_called_once_with(transport="streamable-http")
 
+    @patch.dict(os.environ, {}, clear=False)
+    @patch("uvicorn.run")
+    @patch("gerrit_mcp_server.main.mcp")
+    def test_cli_main_http_mode_multiple_workers(self, mock_mcp, mock_uvicorn_run):
+        """Tests that several workers are started through uvicorn."""
+        main.cli_main(["main.py", "--workers", "4"])
+        mock_uvicorn_run.assert_called_once_with(
+            "gerrit_mcp_server.main:app", host="localhost", port=6322, workers=4
+        )
+        self.assertEqual(os.environ["GERRIT_MCP_WORKERS"], "4")
+        mock_mcp.run.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
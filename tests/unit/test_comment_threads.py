@@ -0,0 +1,116 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from gerrit_mcp_server.comment_threads import CommentThreadIndex, format_threads
+
+
+def _comment(comment_id, updated, in_reply_to=None, unresolved=False, line=10):
+    comment = {
+        "id": comment_id,
+        "line": line,
+        "updated": updated,
+        "unresolved": unresolved,
+        "author": {"name": "user"},
+        "message": f"message {comment_id}",
+    }
+    if in_reply_to:
+        comment["in_reply_to"] = in_reply_to
+    return comment
+
+
+class TestCommentThreadIndex(unittest.TestCase):
+    def test_builds_threads_from_reply_chains(self):
+        index = CommentThreadIndex()
+        index.merge(
+            {
+                "a.py": [
+                    _comment("c1", "2025-01-01 10:00:00", unresolved=True),
+                    _comment("c2", "2025-01-01 11:00:00", in_reply_to="c1", unresolved=True),
+                    _comment("c3", "2025-01-01 12:00:00", in_reply_to="c2"),
+                    _comment("c4", "2025-01-01 09:00:00", unresolved=True, line=20),
+                ]
+            }
+        )
+
+        threads = index.threads()
+
+        self.assertEqual(len(threads), 2)
+        self.assertEqual([c["id"] for c in threads[0].comments], ["c1", "c2", "c3"])
+        self.assertFalse(threads[0].unresolved)
+        self.assertEqual(threads[0].last_updated, "2025-01-01 12:00:00")
+        self.assertTrue(threads[1].unresolved)
+
+    def test_reply_to_unknown_comment_starts_thread(self):
+        index = CommentThreadIndex()
+        index.merge({"a.py": [_comment("c2", "2025-01-01 11:00:00", in_reply_to="gone")]})
+        self.assertEqual(len(index.threads()), 1)
+
+    def test_merge_only_counts_new_or_edited_comments(self):
+        index = CommentThreadIndex()
+        first = {"a.py": [_comment("c1", "2025-01-01 10:00:00")]}
+        self.assertEqual(index.merge(first), 1)
+        self.assertEqual(index.merge(first), 0)
+        second = {
+            "a.py": [
+                _comment("c1", "2025-01-01 10:00:00"),
+                _comment("c2", "2025-01-01 11:00:00", in_reply_to="c1"),
+            ]
+        }
+        self.assertEqual(index.merge(second), 1)
+        self.assertEqual(len(index.threads()[0].replies), 1)
+
+    def test_changed_since_last_view_is_tracked_per_viewer(self):
+        class Viewer:
+            pass
+
+        index = CommentThreadIndex()
+        index.merge(
+            {
+                "a.py": [
+                    _comment("c1", "2025-01-01 10:00:00"),
+                    _comment("c2", "2025-01-01 11:00:00", line=30),
+                ]
+            }
+        )
+        first_viewer, second_viewer = Viewer(), Viewer()
+
+        self.assertEqual(len(index.changed_since_last_view(first_viewer)), 2)
+        self.assertEqual(index.changed_since_last_view(first_viewer), [])
+
+        index.merge({"a.py": [_comment("c3", "2025-01-02 10:00:00", in_reply_to="c1")]})
+        changed = index.changed_since_last_view(first_viewer)
+        self.assertEqual([t.root["id"] for t in changed], ["c1"])
+        self.assertEqual(len(index.changed_since_last_view(second_viewer)), 2)
+
+    def test_format_threads(self):
+        index = CommentThreadIndex()
+        index.merge(
+            {
+                "a.py": [
+                    _comment("c1", "2025-01-01 10:00:00", unresolved=True),
+                    _comment("c2", "2025-01-01 11:00:00", in_reply_to="c1", unresolved=True),
+                ]
+            }
+        )
+        output = format_threads("123", index.threads())
+        self.assertIn("Comment threads for CL 123:", output)
+        self.assertIn("File: a.py", output)
+        self.assertIn("Thread L10 - UNRESOLVED, 1 replies", output)
+        self.assertIn("    [user] (2025-01-01 11:00:00) id=c2", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.account_cache import AccountCache
+from gerrit_mcp_server.config_watcher import ConfigWatcher, changed_hosts, changed_sections
+from gerrit_mcp_server.transport_profiles import profiles_for
+
+
+FOO = {"external_url": "https://foo.example.com/", "authentication": {"type": "gob_curl"}}
+BAR = {"external_url": "https://bar.example.com/", "authentication": {"type": "gob_curl"}}
+
+
+class TestConfigDiff(unittest.TestCase):
+    def test_changed_hosts(self):
+        old = {"gerrit_hosts": [FOO, BAR]}
+        new = {"gerrit_hosts": [FOO, dict(BAR, authentication={"type": "http_basic"})]}
+
+        self.assertEqual(changed_hosts(old, new), {"bar.example.com"})
+        self.assertEqual(changed_hosts(old, {"gerrit_hosts": [FOO]}), {"bar.example.com"})
+        self.assertEqual(changed_hosts(old, old), set())
+
+    def test_changed_sections(self):
+        old = {"gerrit_hosts": [FOO], "offload": {"max_workers": 2}, "timeouts": {}}
+        new = {"gerrit_hosts": [], "offload": {"max_workers": 4}, "dashboard": {}}
+
+        self.assertEqual(changed_sections(old, new), {"offload", "timeouts", "dashboard"})
+
+
+class TestConfigWatcher(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = Path(tmp_dir.name) / "gerrit_config.json"
+        self.changes = []
+        self.errors = []
+        self.watcher = ConfigWatcher(
+            self._read,
+            lambda old, new: self.changes.append((old, new)),
+            lambda path, error: self.errors.append(str(error)),
+            interval_seconds=3600,
+        )
+
+    @staticmethod
+    def _read(path):
+        with open(path) as f:
+            return json.load(f)
+
+    def _write(self, text):
+        with open(self.path, "w") as f:
+            f.write(text)
+        # Make sure the change is visible even on coarse mtime resolution.
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def test_invalid_file_keeps_the_previous_config(self):
+        self._write('{"gerrit_hosts": []}')
+        first = self.watcher.check(self.path)
+
+        self._write('{"gerrit_hosts": [')
+        self.assertIs(self.watcher.check(self.path), first)
+        self.assertIs(self.watcher.check(self.path), first)
+        self.assertEqual(len(self.errors), 1)
+
+        self._write('{"gerrit_hosts": [], "offload": {}}')
+        second = self.watcher.check(self.path)
+        self.assertEqual(second, {"gerrit_hosts": [], "offload": {}})
+        self.assertEqual(self.changes, [(first, second)])
+
+    def test_first_load_of_an_invalid_file_raises(self):
+        self._write("not json")
+
+        with self.assertRaises(json.JSONDecodeError):
+            self.watcher.check(self.path)
+
+    def test_poller_serves_the_snapshot_and_swaps_in_changes(self):
+        async def run():
+            self._write('{"gerrit_hosts": []}')
+            first = self.watcher.check(self.path)
+            self.watcher.start_polling()
+            self.assertIs(self.watcher.current(self.path), first)
+
+            self._write('{"gerrit_hosts": [], "dashboard": {}}')
+            # Until the poller runs, callers keep the snapshot.
+            self.assertIs(self.watcher.current(self.path), first)
+            self.assertTrue(await self.watcher.poll_once())
+            self.assertEqual(self.watcher.current(self.path), {"gerrit_hosts": [], "dashboard": {}})
+            self.watcher.stop()
+
+        asyncio.run(run())
+        self.assertIsNone(self.watcher.current(self.path))
+
+
+class TestConfigReload(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "gerrit_config.json")
+        watcher = ConfigWatcher(
+            main._read_gerrit_config, main._apply_config_change, main._report_config_error, 3600
+        )
+        for target, value in (
+            ("gerrit_mcp_server.main._config_watcher", watcher),
+            ("gerrit_mcp_server.main._account_cache", AccountCache()),
+            ("gerrit_mcp_server.main._offloader", None),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        env_patcher = patch.dict(os.environ, {"GERRIT_CONFIG_PATH": self.path})
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+    def _write(self, config):
+        with open(self.path, "w") as f:
+            json.dump(config, f)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def test_only_the_changed_host_is_invalidated(self):
+        async def run():
+            self._write({"gerrit_hosts": [FOO, BAR]})
+            old = main.load_gerrit_config()
+            foo_profile = profiles_for(old).get("https://foo.example.com")
+            for host in ("https://foo.example.com", "https://bar.example.com"):
+                main._account_cache.put(host, {"_account_id": 1, "email": "a@example.com"})
+            offloader = main._get_offloader()
+
+            self._write(
+                {
+                    "gerrit_hosts": [FOO, dict(BAR, authentication={"type": "git_cookies"})],
+                    "offload": {"threshold_bytes": 1},
+                }
+            )
+            self.assertIs(main.load_gerrit_config(), old)
+            await main._config_watcher.poll_once()
+            new = main.load_gerrit_config()
+
+            self.assertIsNot(new, old)
+            self.assertIs(profiles_for(new).get("https://foo.example.com"), foo_profile)
+            self.assertIsNotNone(main._account_cache.get("https://foo.example.com", 1))
+            self.assertIsNone(main._account_cache.get("https://bar.example.com", 1))
+            self.assertIsNot(main._get_offloader(), offloader)
+
+            # A broken file is reported and the last good configuration stays.
+            with open(self.path, "w") as f:
+                f.write("{")
+            with patch("sys.stderr"):
+                await main._config_watcher.poll_once()
+            self.assertIs(main.load_gerrit_config(), new)
+            main._config_watcher.stop()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import functools
+import http.server
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from gerrit_mcp_server import main, metrics
+from gerrit_mcp_server.curl_batch import (
+    MARKER,
+    build_config,
+    parse_resolved_args,
+    parse_results,
+    split_status,
+)
+
+
+class TestCurlBatch(unittest.TestCase):
+    def test_build_config_repeats_common_args_per_transfer(self):
+        config = build_config(
+            ["-b", "o=token", "-L"],
+            [["https://g.com/a"], ["-X", "DELETE", "-H", "X: 1", "--data", '{"m": "a\\"b"}', "https://g.com/b"]],
+            "/out",
+        )
+        segments = config.split("\nnext\n")
+        self.assertEqual(len(segments), 2)
+        for segment in segments:
+            self.assertIn('-b "o=token"', segment)
+            self.assertIn("-L", segment)
+        self.assertIn('url = "https://g.com/a"', segments[0])
+        self.assertIn('--output "/out/0"', segments[0])
+        self.assertIn('-X "DELETE"', segments[1])
+        self.assertIn('--data "{\\"m\\": \\"a\\\\\\"b\\"}"', segments[1])
+
+    def test_build_config_writes_stdin_bodies_to_files(self):
+        transfer, body = main._create_put_args("https://g.com/drafts", {"message": "hi"})
+        with tempfile.TemporaryDirectory() as output_dir:
+            config = build_config([], [transfer], output_dir, [body])
+            body_path = os.path.join(output_dir, "0.body")
+
+            self.assertIn(f'--data-binary "@{body_path}"', config)
+            with open(body_path, "rb") as f:
+                self.assertEqual(f.read(), b'{"message": "hi"}')
+
+    def test_parse_resolved_args(self):
+        stdout = b"noise\n@@gerrit-mcp-resolved-args\n-s\0-H\0Authorization: Bearer t\0https://g.com/x\0"
+        self.assertEqual(
+            parse_resolved_args(stdout, "https://g.com/x"), ["-s", "-H", "Authorization: Bearer t"]
+        )
+        # The stand-in was not run.
+        self.assertIsNone(parse_resolved_args(b"<html>", "https://g.com/x"))
+        # An option whose value would be taken for a URL.
+        unknown = b"@@gerrit-mcp-resolved-args\n--proxy\0p:1\0https://g.com/x\0"
+        self.assertIsNone(parse_resolved_args(unknown, "https://g.com/x"))
+
+    def test_split_status(self):
+        self.assertEqual(
+            split_status(b"warning\n\n@@gerrit-mcp-status 503\n"), (503, b"warning\n")
+        )
+        self.assertEqual(split_status(b"\n@@gerrit-mcp-status 000\n"), (None, b""))
+        self.assertEqual(split_status(b"curl: (7) Failed to connect"), (None, b"curl: (7) Failed to connect"))
+
+    def test_parse_results(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            with open(os.path.join(output_dir, "1"), "wb") as f:
+                f.write(b")]}'\n{}")
+            stdout = (
+                f"\n{MARKER} 1 200 0 \n"
+                f"\n{MARKER} 0 000 7 Failed to connect\n"
+            ).encode()
+            results = parse_results(stdout, 3, output_dir)
+
+        self.assertFalse(results[0].ok)
+        self.assertEqual(results[0].exit_code, 7)
+        self.assertEqual(results[0].describe_error(), "Failed to connect")
+        self.assertTrue(results[1].ok)
+        self.assertEqual(results[1].text(), "{}")
+        self.assertIn("did not report", results[2].describe_error())
+
+
+@unittest.skipUnless(shutil.which("curl"), "curl is not installed")
+class TestRunCurlBatch(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.root.name, "one"), "w") as f:
+            f.write(")]}'\n[1]")
+        self.authorizations = []
+        authorizations = self.authorizations
+
+        class Handler(http.server.SimpleHTTPRequestHandler):
+            def do_GET(self):
+                authorizations.append(self.headers.get("Authorization"))
+                super().do_GET()
+
+            def log_message(self, *args):
+                pass
+
+        handler = functools.partial(Handler, directory=self.root.name)
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.root.cleanup()
+
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_one_process_for_many_requests(self, mock_load_config):
+        mock_load_config.return_value = {
+            "gerrit_hosts": [
+                {
+                    "external_url": self.base_url,
+                    "authentication": {"type": "http_basic", "username": "u", "auth_token": "t"},
+                }
+            ]
+        }
+        real_exec = asyncio.create_subprocess_exec
+        spawned = []
+
+        async def recording_exec(*args, **kwargs):
+            spawned.append(args)
+            return await real_exec(*args, **kwargs)
+
+        async def run_test():
+            with patch("asyncio.create_subprocess_exec", recording_exec):
+                return await main.run_curl_batch(
+                    [[f"{self.base_url}/one"], [f"{self.base_url}/missing"]] * 5, self.base_url
+                )
+
+        results = asyncio.run(run_test())
+        self.assertEqual(len(spawned), 1)
+        self.assertEqual([r.status for r in results], [200, 404] * 5)
+        self.assertEqual(results[0].text(), "[1]")
+
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_single_request_reports_its_status_to_the_breaker(self, mock_load_config):
+        mock_load_config.return_value = {
+            "gerrit_hosts": [
+                {
+                    "external_url": self.base_url,
+                    "authentication": {"type": "http_basic", "username": "u", "auth_token": "t"},
+                }
+            ]
+        }
+
+        with patch("gerrit_mcp_server.main._record_curl_outcome") as record_outcome:
+            body = asyncio.run(main.run_curl([f"{self.base_url}/missing"], self.base_url))
+
+        _, returncode, status = record_outcome.call_args[0]
+        self.assertEqual((returncode, status), (0, 404))
+        self.assertNotIn("@@gerrit-mcp-status", body)
+
+    def _run_wrapped_batch(self, wrapper_script):
+        real_exec = asyncio.create_subprocess_exec
+        spawned = []
+
+        async def recording_exec(*args, **kwargs):
+            spawned.append(args)
+            return await real_exec(*args, **kwargs)
+
+        with tempfile.TemporaryDirectory() as bin_dir:
+            wrapper = os.path.join(bin_dir, "gob-curl")
+            with open(wrapper, "w") as f:
+                f.write(wrapper_script)
+            os.chmod(wrapper, 0o755)
+
+            with patch("gerrit_mcp_server.main.get_curl_command_for_gerrit_url", return_value=[wrapper, "-s"]), \
+                    patch("asyncio.create_subprocess_exec", recording_exec):
+                results = asyncio.run(
+                    main.run_curl_batch(
+                        [[f"{self.base_url}/one"], [f"{self.base_url}/missing"]] * 3,
+                        self.base_url,
+                        max_parallel=2,
+                    )
+                )
+        return results, spawned
+
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_wrapper_is_resolved_into_one_process(self, mock_load_config):
+        mock_load_config.return_value = {
+            "gerrit_hosts": [{"external_url": self.base_url, "authentication": {"type": "gob_curl"}}]
+        }
+        metrics.reset()
+
+        # Like gob-curl, the wrapper adds its authentication to the curl it runs.
+        results, spawned = self._run_wrapped_batch(
+            '#!/bin/sh\nexec curl -H "Authorization: Bearer wrapper" "$@"\n'
+        )
+
+        self.assertEqual([r.status for r in results], [200, 404] * 3)
+        self.assertEqual(results[0].text(), "[1]")
+        self.assertEqual(self.authorizations, ["Bearer wrapper"] * 6)
+        # One run of the wrapper to resolve it, and one curl for the batch.
+        self.assertEqual(len(spawned), 2)
+        self.assertEqual(os.path.basename(spawned[1][0]), "curl")
+        self.assertEqual(metrics.snapshot()["counters"]["curl_batch.batched_transfers"], 6)
+
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_unresolvable_wrapper_authenticates_every_transfer(self, mock_load_config):
+        mock_load_config.return_value = {
+            "gerrit_hosts": [{"external_url": self.base_url, "authentication": {"type": "gob_curl"}}]
+        }
+        metrics.reset()
+        curl = shutil.which("curl")
+
+        # A wrapper that runs curl by its path cannot be resolved.
+        results, _ = self._run_wrapped_batch(
+            f'#!/bin/sh\nexec {curl} -H "Authorization: Bearer wrapper" "$@"\n'
+        )
+
+        self.assertEqual([r.status for r in results], [200, 404] * 3)
+        self.assertEqual(set(self.authorizations), {"Bearer wrapper"})
+        counters = metrics.snapshot()["counters"]
+        self.assertEqual(counters["curl_batch.unbatched_transfers"], 6)
+        self.assertNotIn("curl_batch.batched_transfers", counters)
+
+
+if __name__ == "__main__":
+    unittest.main()
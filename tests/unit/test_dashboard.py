@@ -0,0 +1,108 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.dashboard import Dashboard, DashboardCache, Section, format_dashboard
+
+
+HOST = "https://gerrit-review.googlesource.com"
+
+
+def _change(number, updated="2025-01-01 00:00:00.000000000", **fields):
+    change = {"_number": number, "subject": f"Change {number}", "project": "p", "updated": updated}
+    change.update(fields)
+    return change
+
+
+class TestDashboard(unittest.TestCase):
+    def test_changes_are_listed_under_their_first_section(self):
+        sections = [Section("Attention", "attention:self"), Section("Reviewing", "reviewer:self")]
+        board = Dashboard(sections, [[_change(1)], [_change(1), _change(2)]])
+
+        self.assertEqual(board.members, {"Attention": ["1"], "Reviewing": ["2"]})
+        text = format_dashboard(board)
+        self.assertIn("Dashboard: 2 change(s) in 2 section(s).", text)
+        self.assertIn("- 1: Change 1 (p) (also in: Reviewing)", text)
+
+    def test_cache_expires(self):
+        now = [0.0]
+        cache = DashboardCache(ttl_seconds=10, clock=lambda: now[0])
+        cache.put("k", "board")
+
+        now[0] = 9.0
+        self.assertEqual(cache.get("k"), "board")
+        now[0] = 10.0
+        self.assertIsNone(cache.get("k"))
+
+
+class TestGetDashboard(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            "gerrit_hosts": [{"external_url": HOST, "authentication": {"type": "gob_curl"}}],
+            "dashboard": {
+                "sections": [
+                    {"name": "Attention", "query": "attention:self"},
+                    {"name": "Reviewing", "query": "reviewer:self", "options": ["LABELS"]},
+                ]
+            },
+        }
+        config_patcher = patch("gerrit_mcp_server.main.load_gerrit_config", return_value=self.config)
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+        cache_patcher = patch("gerrit_mcp_server.main._dashboard_cache", None)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_sections_run_concurrently_and_options_are_fetched_once(self, mock_exec_curl):
+        async def fake_exec_curl(args, base_url, body=None):
+            url = args[0]
+            if "attention" in url:
+                await asyncio.sleep(0.01)
+                return json.dumps([_change(1)]).encode()
+            if "reviewer" in url:
+                return json.dumps([_change(1), _change(2)]).encode()
+            return json.dumps(
+                [_change(n, labels={"Code-Review": {"approved": {"_account_id": 1}}}) for n in (1, 2)]
+            ).encode()
+
+        mock_exec_curl.side_effect = fake_exec_curl
+
+        result = asyncio.run(main.get_dashboard(gerrit_base_url=HOST))
+
+        text = result[0]["text"]
+        self.assertIn("Attention (1):\n- 1: Change 1 (p) [Code-Review approved] (also in: Reviewing)", text)
+        self.assertIn("Reviewing (1):\n- 2: Change 2 (p) [Code-Review approved]", text)
+        urls = [call[0][0][0] for call in mock_exec_curl.call_args_list]
+        self.assertEqual(len(urls), 3)
+        self.assertNotIn("o=LABELS", urls[0] + urls[1])
+        self.assertIn("change%3A1%20OR%20change%3A2", urls[2])
+        self.assertIn("o=LABELS", urls[2])
+
+        # A refresh within the TTL is served from the cache.
+        asyncio.run(main.get_dashboard(gerrit_base_url=HOST))
+        self.assertEqual(mock_exec_curl.await_count, 3)
+        asyncio.run(main.get_dashboard(refresh=True, gerrit_base_url=HOST))
+        self.assertEqual(mock_exec_curl.await_count, 6)
+
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_failed_section_is_reported_and_not_cached(self, mock_exec_curl):
+        async def fake_exec_curl(args, base_url, body=None):
+            if "attention" in args[0]:
+                raise Exception("curl command failed with exit code 22.")
+            return b"[]"
+
+        mock_exec_curl.side_effect = fake_exec_curl
+
+        result = asyncio.run(main.get_dashboard(gerrit_base_url=HOST))
+        self.assertIn("Attention (0):\n  Failed to query: curl command failed", result[0]["text"])
+        self.assertIn("Reviewing (0):\n  (none)", result[0]["text"])
+
+        asyncio.run(main.get_dashboard(gerrit_base_url=HOST))
+        self.assertEqual(mock_exec_curl.await_count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import sys
+import unittest
+from unittest.mock import patch
+
+from gerrit_mcp_server import main
+
+HANGING_CURL = [sys.executable, "-c", "import time; time.sleep(60)"]
+
+
+class TestCurlDeadlines(unittest.TestCase):
+    def setUp(self):
+        self.commands = []
+        self.processes = []
+        real_exec = asyncio.create_subprocess_exec
+
+        async def recording_exec(*args, **kwargs):
+            self.commands.append(args)
+            process = await real_exec(*args, **kwargs)
+            self.processes.append(process)
+            return process
+
+        patches = [
+            patch("asyncio.create_subprocess_exec", recording_exec),
+            patch("gerrit_mcp_server.main.get_curl_command_for_gerrit_url", return_value=HANGING_CURL),
+            patch("gerrit_mcp_server.main._CURL_EXIT_GRACE_SECONDS", 0),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_request_timeout_kills_curl(self, mock_load_config):
+        mock_load_config.return_value = {"timeouts": {"request_seconds": 0.2}}
+
+        async def run_test():
+            with self.assertRaises(asyncio.TimeoutError):
+                await main.run_curl(["https://my-gerrit.com/changes/1"], "https://my-gerrit.com")
+            self.assertIn("--max-time", self.commands[0])
+            self.assertIsNotNone(self.processes[0].returncode)
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_cancellation_kills_curl(self, mock_load_config):
+        mock_load_config.return_value = {}
+
+        async def run_test():
+            task = asyncio.create_task(
+                main.run_curl(["https://my-gerrit.com/changes/1"], "https://my-gerrit.com")
+            )
+            while not self.processes:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertIsNotNone(self.processes[0].returncode)
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_tool_deadline_releases_capacity(self, mock_load_config):
+        mock_load_config.return_value = {
+            "gerrit_hosts": [],
+            "timeouts": {"tools": {"get_change_details": 0.2}},
+        }
+
+        async def run_test():
+            with self.assertRaisesRegex(TimeoutError, "get_change_details did not finish"):
+                await main.get_change_details("1", gerrit_base_url="https://my-gerrit.com")
+            self.assertIsNotNone(self.processes[0].returncode)
+            self.assertEqual(main._get_admission_controller().in_use, 0)
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    unittest.main()
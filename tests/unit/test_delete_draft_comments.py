@@ -4,6 +4,7 @@ import unittest
 from unittest.mock import patch, AsyncMock, call
 
 from gerrit_mcp_server import main
+from gerrit_mcp_server.curl_batch import BatchResult
 
 
 BASE_URL = "https://gerrit-review.googlesource.com"
@@ -11,8 +12,9 @@ BASE_URL = "https://gerrit-review.googlesource.com"
 
 class TestDeleteDraftComments(unittest.TestCase):
 
+    @patch("gerrit_mcp_server.main.run_curl_batch", new_callable=AsyncMock)
     @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
-    def test_delete_all_drafts_success(self, mock_run_curl):
+    def test_delete_all_drafts_success(self, mock_run_curl, mock_run_curl_batch):
         async def run_test():
             drafts_response = {
                 "src/main.py": [
@@ -23,20 +25,22 @@ class TestDeleteDraftComments(unittest.TestCase):
                     {"id": "draft-003"},
                 ],
             }
-            # First call returns the list, subsequent calls are deletes
-            mock_run_curl.side_effect = [
-                json.dumps(drafts_response),
-                "",  # delete draft-001
-                "",  # delete draft-002
-                "",  # delete draft-003
-            ]
+            mock_run_curl.return_value = json.dumps(drafts_response)
+            mock_run_curl_batch.return_value = [BatchResult(204, b"")] * 3
 
             result = await main.delete_draft_comments(
                 change_id="123", gerrit_base_url=BASE_URL
             )
 
             self.assertIn("Deleted 3 draft comment(s)", result[0]["text"])
-            self.assertEqual(mock_run_curl.call_count, 4)  # 1 list + 3 deletes
+            # 1 list + 1 batch with all 3 deletes
+            self.assertEqual(mock_run_curl.call_count, 1)
+            transfers = mock_run_curl_batch.call_args[0][0]
+            self.assertEqual(len(transfers), 3)
+            self.assertEqual(
+                transfers[0],
+                ["-X", "DELETE", f"{BASE_URL}/changes/123/revisions/current/drafts/draft-001"],
+            )
 
         asyncio.run(run_test())
 
@@ -66,8 +70,9 @@ class TestDeleteDraftComments(unittest.TestCase):
 
         asyncio.run(run_test())
 
+    @patch("gerrit_mcp_server.main.run_curl_batch", new_callable=AsyncMock)
     @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
-    def test_delete_all_drafts_partial_failure(self, mock_run_curl):
+    def test_delete_all_drafts_partial_failure(self, mock_run_curl, mock_run_curl_batch):
         async def run_test():
             drafts_response = {
                 "file.py": [
@@ -75,10 +80,10 @@ class TestDeleteDraftComments(unittest.TestCase):
                     {"id": "draft-002"},
                 ],
             }
-            mock_run_curl.side_effect = [
-                json.dumps(drafts_response),
-                "",  # draft-001 succeeds
-                Exception("Server error"),  # draft-002 fails
+            mock_run_curl.return_value = json.dumps(drafts_response)
+            mock_run_curl_batch.return_value = [
+                BatchResult(204, b""),  # draft-001 succeeds
+                BatchResult(500, b"Server error"),  # draft-002 fails
             ]
 
             result = await main.delete_draft_comments(
@@ -89,11 +94,30 @@ class TestDeleteDraftComments(unittest.TestCase):
             self.assertIn("Deleted 1 draft comment(s)", text)
             self.assertIn("1 error(s)", text)
             self.assertIn("draft-002", text)
+            self.assertIn("HTTP 500: Server error", text)
 
         asyncio.run(run_test())
 
+    @patch("gerrit_mcp_server.main.run_curl_batch", new_callable=AsyncMock)
     @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
-    def test_delete_all_drafts_skips_missing_ids(self, mock_run_curl):
+    def test_delete_all_drafts_batch_failure(self, mock_run_curl, mock_run_curl_batch):
+        async def run_test():
+            mock_run_curl.return_value = json.dumps({"file.py": [{"id": "draft-001"}]})
+            mock_run_curl_batch.side_effect = Exception("curl not found")
+
+            result = await main.delete_draft_comments(
+                change_id="123", gerrit_base_url=BASE_URL
+            )
+
+            text = result[0]["text"]
+            self.assertIn("Deleted 0 draft comment(s)", text)
+            self.assertIn("draft-001 on file.py: curl not found", text)
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main.run_curl_batch", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
+    def test_delete_all_drafts_skips_missing_ids(self, mock_run_curl, mock_run_curl_batch):
         async def run_test():
             drafts_response = {
                 "file.py": [
@@ -101,21 +125,18 @@ class TestDeleteDraftComments(unittest.TestCase):
                     {"message": "no id field"},  # missing id
                 ],
             }
-            mock_run_curl.side_effect = [
-                json.dumps(drafts_response),
-                "",  # delete draft-001
-            ]
+            mock_run_curl.return_value = json.dumps(drafts_response)
+            mock_run_curl_batch.return_value = [BatchResult(204, b"")]
 
             result = await main.delete_draft_comments(
                 change_id="123", gerrit_base_url=BASE_URL
             )
 
             self.assertIn("Deleted 1 draft comment(s)", result[0]["text"])
-            # 1 list + 1 delete (skipped the one without id)
-            self.assertEqual(mock_run_curl.call_count, 2)
+            # Only draft-001 is deleted (skipped the one without id)
+            self.assertEqual(len(mock_run_curl_batch.call_args[0][0]), 1)
 
         asyncio.run(run_test())
 
-
 if __name__ == "__main__":
     unittest.main()
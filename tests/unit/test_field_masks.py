@@ -0,0 +1,101 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.account_cache import AccountCache
+from gerrit_mcp_server.field_masks import FieldMask
+
+
+class TestFieldMask(unittest.TestCase):
+    def test_default_fields_need_no_options_but_skip_the_diffstat(self):
+        self.assertEqual(FieldMask("_number", "subject").options(), ("SKIP_DIFFSTAT",))
+
+    def test_fields_map_to_their_options(self):
+        mask = FieldMask("revisions.commit", "reviewers.email", "messages")
+        self.assertEqual(
+            mask.options(),
+            (
+                "CURRENT_COMMIT",
+                "CURRENT_REVISION",
+                "DETAILED_ACCOUNTS",
+                "DETAILED_LABELS",
+                "MESSAGES",
+                "SKIP_DIFFSTAT",
+            ),
+        )
+
+    def test_line_counts_keep_the_diffstat(self):
+        self.assertEqual(FieldMask("insertions").options(["SKIP_DIFFSTAT", "LABELS"]), ("LABELS",))
+
+    def test_union_and_extra_options(self):
+        mask = FieldMask("labels") | FieldMask("submittable")
+        self.assertEqual(mask.options(["LABELS", "CHECK"]), ("CHECK", "LABELS", "SKIP_DIFFSTAT", "SUBMITTABLE"))
+
+    def test_unknown_field(self):
+        with self.assertRaisesRegex(ValueError, "Unknown ChangeInfo fields: revision"):
+            FieldMask("revision")
+
+
+class TestToolOptions(unittest.TestCase):
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_query_changes_requests_only_what_it_renders(self, mock_exec_curl):
+        mock_exec_curl.return_value = b"[]"
+
+        asyncio.run(main.query_changes("status:open", gerrit_base_url="https://g.example.com", limit=5))
+
+        self.assertEqual(
+            mock_exec_curl.call_args[0][0][0],
+            "https://g.example.com/changes/?q=status%3Aopen&n=5&o=SKIP_DIFFSTAT",
+        )
+
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_get_change_details_does_not_use_the_detail_endpoint(self, mock_exec_curl):
+        mock_exec_curl.return_value = json.dumps(
+            {"_number": 1, "subject": "s", "owner": {"email": "o@example.com"}, "status": "NEW"}
+        ).encode()
+
+        asyncio.run(main.get_change_details("1", gerrit_base_url="https://g.example.com"))
+
+        url = mock_exec_curl.call_args[0][0][0]
+        self.assertTrue(url.startswith("https://g.example.com/changes/1?"))
+        self.assertEqual(
+            url.split("?")[1].split("&"),
+            [
+                "o=CURRENT_COMMIT",
+                "o=CURRENT_REVISION",
+                "o=DETAILED_LABELS",
+                "o=MESSAGES",
+                "o=SKIP_DIFFSTAT",
+            ],
+        )
+
+    @patch("gerrit_mcp_server.main._account_cache", new_callable=AccountCache)
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_get_change_details_renders_accounts_from_the_account_cache(self, mock_exec_curl, _):
+        change = {
+            "_number": 1,
+            "subject": "s",
+            "owner": {"_account_id": 7},
+            "status": "NEW",
+            "reviewers": {"REVIEWER": [{"_account_id": 8}]},
+            "labels": {"Code-Review": {"all": [{"_account_id": 8, "value": 1}]}},
+        }
+        accounts = [
+            {"_account_id": 7, "name": "Owner", "email": "o@example.com"},
+            {"_account_id": 8, "name": "Reviewer", "email": "r@example.com"},
+        ]
+        mock_exec_curl.side_effect = [json.dumps(change).encode(), json.dumps(accounts).encode()]
+
+        result = asyncio.run(main.get_change_details("1", gerrit_base_url="https://g.example.com"))
+
+        self.assertIn("Owner: o@example.com", result[0]["text"])
+        self.assertIn("- r@example.com (Code-Review: +1)", result[0]["text"])
+        urls = [call.args[0][0] for call in mock_exec_curl.call_args_list]
+        self.assertNotIn("DETAILED_ACCOUNTS", urls[0])
+        self.assertIn("/accounts/?q=", urls[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
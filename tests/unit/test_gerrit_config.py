@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
+from gerrit_mcp_server import main
 from gerrit_mcp_server.main import _normalize_gerrit_url
 
 
@@ -159,6 +163,22 @@ class TestGerritConfig(unittest.TestCase):
             _normalize_gerrit_url("noauth.gerrit.com", gerrit_hosts), "https://noauth.gerrit.com"
         )
 
+    def test_load_gerrit_config_is_cached_until_the_file_changes(self):
+        """Tests that the configuration is only parsed again after it changes."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "gerrit_config.json")
+            with open(path, "w") as f:
+                json.dump({"gerrit_hosts": []}, f)
+            with patch.dict(os.environ, {"GERRIT_CONFIG_PATH": path}):
+                first = main.load_gerrit_config()
+                self.assertIs(main.load_gerrit_config(), first)
+
+                with open(path, "w") as f:
+                    json.dump({"gerrit_hosts": [], "offload": {}}, f)
+                second = main.load_gerrit_config()
+                self.assertIsNot(second, first)
+                self.assertIn("offload", second)
+
 
 if __name__ == "__main__":
     unittest.main()
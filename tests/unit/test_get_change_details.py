@@ -21,8 +21,8 @@ from gerrit_mcp_server import main
 
 
 class TestGetChangeDetails(unittest.TestCase):
-    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
-    def test_get_change_details_success(self, mock_run_curl):
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_get_change_details_success(self, mock_exec_curl):
         async def run_test():
             # Arrange
             change_id = "12345"
@@ -43,7 +43,7 @@ class TestGetChangeDetails(unittest.TestCase):
                     {"_revision_number": 1, "message": "Uploaded patch set 1."}
                 ],
             }
-            mock_run_curl.return_value = json.dumps(mock_response)
+            mock_exec_curl.return_value = json.dumps(mock_response).encode()
             gerrit_base_url = "https://my-gerrit.com"
 
             # Act
@@ -67,6 +67,16 @@ class TestGetChangeDetails(unittest.TestCase):
 
         asyncio.run(run_test())
 
+    def test_index_votes_by_account(self):
+        labels = {
+            "Code-Review": {"all": [{"_account_id": 1, "value": 2}, {"_account_id": 2, "value": -1}]},
+            "Verified": {"all": [{"_account_id": 1, "value": 0}]},
+            "Commit-Queue": {},
+        }
+        votes = main._index_votes_by_account(labels)
+        self.assertEqual(votes[1], ["Code-Review: +2", "Verified: 0"])
+        self.assertEqual(votes[2], ["Code-Review: -1"])
+
 
 if __name__ == "__main__":
     unittest.main()
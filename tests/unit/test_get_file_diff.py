@@ -16,6 +16,9 @@ import unittest
 from unittest.mock import patch, AsyncMock
 import asyncio
 import base64
+import json
+import time
+import zipfile
 
 from gerrit_mcp_server import main
 
@@ -44,6 +47,95 @@ class TestGetFileDiff(unittest.TestCase):
 
         asyncio.run(run_test())
 
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_get_file_diff_with_patch_index(self, mock_exec_curl):
+        async def run_test():
+            # Arrange
+            main_diff = "diff --git a/src/main.py b/src/main.py\n--- a/src/main.py\n+++ b/src/main.py\n@@ -1 +1 @@\n-old\n+new\n"
+            util_diff = "diff --git a/src/util.py b/src/util.py\n--- a/src/util.py\n+++ b/src/util.py\n@@ -1 +1 @@\n-a\n+b\n"
+
+            revision = "abc"
+
+            async def fake_exec_curl(args, base_url, body=None):
+                if "-o" not in args:
+                    return json.dumps({"_number": 54321, "current_revision": revision}).encode()
+                zip_path = args[args.index("-o") + 1]
+                with zipfile.ZipFile(zip_path, "w") as archive:
+                    archive.writestr(f"{revision}.diff", main_diff + util_diff)
+                return b""
+
+            mock_exec_curl.side_effect = fake_exec_curl
+            gerrit_base_url = "https://my-gerrit.com"
+            main._patch_index_cache.clear()
+
+            # Act
+            first = await main.get_file_diff(
+                "54321", "src/main.py", gerrit_base_url=gerrit_base_url, use_patch_index=True
+            )
+            second = await main.get_file_diff(
+                "54321", "src/util.py", gerrit_base_url=gerrit_base_url, use_patch_index=True
+            )
+            missing = await main.get_file_diff(
+                "54321", "README.md", gerrit_base_url=gerrit_base_url, use_patch_index=True
+            )
+
+            # Assert
+            self.assertEqual(first[0]["text"], main_diff)
+            self.assertEqual(second[0]["text"], util_diff)
+            self.assertIn("File README.md not found", missing[0]["text"])
+            downloads = [c.args[0][-1] for c in mock_exec_curl.call_args_list if "-o" in c.args[0]]
+            self.assertEqual(downloads, [f"{gerrit_base_url}/changes/54321/revisions/abc/patch?zip"])
+
+            lookups = [c for c in mock_exec_curl.call_args_list if "-o" not in c.args[0]]
+            self.assertEqual(len(lookups), 1)
+
+            # A new patch set is downloaded again once the revision expires.
+            revision = "def"
+            expired = main._patch_index_cache.revision_ttl_seconds + 1
+            with patch(
+                "gerrit_mcp_server.patch_index.time.monotonic",
+                side_effect=lambda now=time.monotonic: now() + expired,
+            ):
+                await main.get_file_diff(
+                    "54321", "src/main.py", gerrit_base_url=gerrit_base_url, use_patch_index=True
+                )
+            downloads = [c.args[0][-1] for c in mock_exec_curl.call_args_list if "-o" in c.args[0]]
+            self.assertEqual(downloads[-1], f"{gerrit_base_url}/changes/54321/revisions/def/patch?zip")
+            self.assertEqual(len(downloads), 2)
+            main._patch_index_cache.clear()
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_two_diffs_of_an_indexed_change_issue_one_request(self, mock_exec_curl):
+        async def run_test():
+            # Arrange
+            main_diff = "diff --git a/src/main.py b/src/main.py\n--- a/src/main.py\n+++ b/src/main.py\n@@ -1 +1 @@\n-old\n+new\n"
+            util_diff = "diff --git a/src/util.py b/src/util.py\n--- a/src/util.py\n+++ b/src/util.py\n@@ -1 +1 @@\n-a\n+b\n"
+            gerrit_base_url = "https://my-gerrit.com"
+            main._patch_index_cache.clear()
+            main._patch_index_cache.put_revision((gerrit_base_url, "54321"), "abc")
+
+            async def fake_exec_curl(args, base_url, body=None):
+                zip_path = args[args.index("-o") + 1]
+                with zipfile.ZipFile(zip_path, "w") as archive:
+                    archive.writestr("abc.diff", main_diff + util_diff)
+                return b""
+
+            mock_exec_curl.side_effect = fake_exec_curl
+
+            # Act
+            for file_path in ("src/main.py", "src/util.py"):
+                await main.get_file_diff(
+                    "54321", file_path, gerrit_base_url=gerrit_base_url, use_patch_index=True
+                )
+
+            # Assert
+            mock_exec_curl.assert_awaited_once()
+            main._patch_index_cache.clear()
+
+        asyncio.run(run_test())
+
 
 if __name__ == "__main__":
     unittest.main()
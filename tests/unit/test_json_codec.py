@@ -0,0 +1,65 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+
+from gerrit_mcp_server import json_codec
+
+
+@pytest.fixture(params=["json", "orjson"])
+def backend(request):
+    if request.param == "orjson" and json_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    previous = json_codec.backend()
+    json_codec.use_backend(request.param)
+    yield request.param
+    json_codec.use_backend(previous)
+
+
+def test_strip_xssi_does_not_copy():
+    body = bytearray(b')]}\'\n{"a": 1}\n')
+    view = json_codec.strip_xssi(body)
+    assert bytes(view) == b'{"a": 1}'
+    assert view.obj is body
+
+
+def test_strip_xssi_without_prefix():
+    assert bytes(json_codec.strip_xssi(b"  []  ")) == b"[]"
+    assert bytes(json_codec.strip_xssi(b"")) == b""
+
+
+def test_decode_text():
+    assert json_codec.decode_text(b")]}'\nNot found\n") == "Not found"
+
+
+def test_loads_bytes_and_text(backend):
+    assert json_codec.loads(b')]}\'\n{"subject": "Fix \\u00e9"}') == {"subject": "Fix é"}
+    assert json_codec.loads('[1, 2]') == [1, 2]
+
+
+def test_loads_raises_json_decode_error(backend):
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads(b")]}'\nNot JSON")
+
+
+def test_loads_reports_invalid_utf8_as_json_decode_error(backend):
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads(b')]}\'\n{"subject": "\xff"}')
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        json_codec.use_backend("simplejson")
@@ -21,8 +21,8 @@ from gerrit_mcp_server import main
 
 
 class TestListChangeComments(unittest.TestCase):
-    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
-    def test_list_change_comments_unresolved(self, mock_run_curl):
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_list_change_comments_unresolved(self, mock_exec_curl):
         async def run_test():
             # Arrange
             change_id = "11223"
@@ -52,7 +52,7 @@ class TestListChangeComments(unittest.TestCase):
                     }
                 ],
             }
-            mock_run_curl.return_value = json.dumps(mock_response)
+            mock_exec_curl.return_value = json.dumps(mock_response).encode()
             gerrit_base_url = "https://my-gerrit.com"
 
             # Act
@@ -82,8 +82,8 @@ class TestListChangeComments(unittest.TestCase):
 
         asyncio.run(run_test())
 
-    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
-    def test_list_change_comments_none_unresolved(self, mock_run_curl):
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_list_change_comments_none_unresolved(self, mock_exec_curl):
         async def run_test():
             # Arrange
             change_id = "11223"
@@ -98,7 +98,7 @@ class TestListChangeComments(unittest.TestCase):
                     }
                 ]
             }
-            mock_run_curl.return_value = json.dumps(mock_response)
+            mock_exec_curl.return_value = json.dumps(mock_response).encode()
             gerrit_base_url = "https://my-gerrit.com"
 
             # Act
@@ -115,6 +115,59 @@ class TestListChangeComments(unittest.TestCase):
 
         asyncio.run(run_test())
 
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_list_change_comments_threaded_refetches_only_when_updated(self, mock_exec_curl):
+        async def run_test():
+            # Arrange
+            change_id = "11224"
+            root = {
+                "id": "c1",
+                "line": 10,
+                "author": {"name": "user1@example.com"},
+                "message": "Please fix.",
+                "unresolved": True,
+                "updated": "2025-07-15 10:00:00.000000000",
+            }
+            reply = {
+                "id": "c2",
+                "in_reply_to": "c1",
+                "line": 10,
+                "author": {"name": "user2@example.com"},
+                "message": "Done.",
+                "unresolved": False,
+                "updated": "2025-07-15 11:00:00.000000000",
+            }
+            mock_exec_curl.side_effect = [
+                json.dumps({"updated": "2025-07-15 10:00:00.000000000"}).encode(),
+                json.dumps({"src/main.py": [root]}).encode(),
+                json.dumps({"updated": "2025-07-15 10:00:00.000000000"}).encode(),
+                json.dumps({"updated": "2025-07-15 11:00:00.000000000"}).encode(),
+                json.dumps({"src/main.py": [root, reply]}).encode(),
+            ]
+            gerrit_base_url = "https://my-gerrit.com"
+            main._comment_thread_cache.clear()
+
+            # Act
+            first = await main.list_change_comments(
+                change_id, gerrit_base_url=gerrit_base_url, only_changed=True
+            )
+            unchanged = await main.list_change_comments(
+                change_id, gerrit_base_url=gerrit_base_url, only_changed=True
+            )
+            updated = await main.list_change_comments(
+                change_id, gerrit_base_url=gerrit_base_url, only_changed=True
+            )
+
+            # Assert
+            self.assertIn("Thread L10 - UNRESOLVED, 0 replies", first[0]["text"])
+            self.assertIn("No comment threads changed on CL 11224", unchanged[0]["text"])
+            self.assertIn("Thread L10 - RESOLVED, 1 replies", updated[0]["text"])
+            self.assertIn("Done.", updated[0]["text"])
+            self.assertEqual(mock_exec_curl.call_count, 5)
+            main._comment_thread_cache.clear()
+
+        asyncio.run(run_test())
+
 
 if __name__ == "__main__":
     unittest.main()
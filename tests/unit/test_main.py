@@ -33,6 +33,12 @@ def mock_run_curl():
     with patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock) as m:
         yield m
 
+@pytest.fixture
+def mock_exec_curl():
+    """Provides a mocked _exec_curl, which returns the response body as bytes."""
+    with patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock) as m:
+        yield m
+
 @pytest.fixture
 def mock_exec():
     """Provides a mocked asyncio.create_subprocess_exec."""
@@ -196,10 +202,7 @@ async def test_post_review_comment(mock_run_curl, unresolved_arg, expected_unres
     assert "Successfully posted comment" in result[0]["text"]
     
     # Verify the payload
-    args, _ = mock_run_curl.call_args
-    curl_args = args[0]
-    data_index = curl_args.index("--data")
-    request_body = json.loads(curl_args[data_index + 1])
+    request_body = json.loads(mock_run_curl.call_args.kwargs["body"])
     assert request_body["comments"]["file.py"][0]["unresolved"] is expected_unresolved
 
 @pytest.mark.asyncio
@@ -212,27 +215,27 @@ async def test_post_review_comment_failure(mock_run_curl):
 # --- Edge Case Tests ---
 
 @pytest.mark.asyncio
-async def test_get_change_details_handles_missing_reviewers(mock_run_curl):
+async def test_get_change_details_handles_missing_reviewers(mock_exec_curl):
     """Tests that get_change_details handles missing 'reviewers' field gracefully."""
-    mock_run_curl.return_value = json.dumps({
+    mock_exec_curl.return_value = json.dumps({
         "_number": 123,
         "subject": "Test",
         "owner": {"email": "a@b.com"},
         "status": "NEW",
-    })
+    }).encode()
     result = await main.get_change_details("123")
     assert "Reviewers:" not in result[0]["text"]
 
 @pytest.mark.asyncio
-async def test_get_change_details_handles_empty_reviewers_list(mock_run_curl):
+async def test_get_change_details_handles_empty_reviewers_list(mock_exec_curl):
     """Tests that get_change_details handles an empty reviewers list gracefully."""
-    mock_run_curl.return_value = json.dumps({
+    mock_exec_curl.return_value = json.dumps({
         "_number": 123,
         "subject": "Test",
         "owner": {"email": "a@b.com"},
         "status": "NEW",
         "reviewers": {"REVIEWER": []},
-    })
+    }).encode()
     result = await main.get_change_details("123")
     assert "Reviewers:" in result[0]["text"]
 
@@ -0,0 +1,51 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from starlette.testclient import TestClient
+
+from gerrit_mcp_server import main, metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_counters_gauges_and_timings(self):
+        metrics.increment("calls")
+        metrics.increment("calls", 2)
+        metrics.set_gauge("queue_depth", 4)
+        metrics.observe("latency", 0.5)
+        metrics.observe("latency", 1.5)
+
+        snapshot = metrics.snapshot()
+
+        self.assertEqual(snapshot["counters"]["calls"], 3)
+        self.assertEqual(snapshot["gauges"]["queue_depth"], 4)
+        self.assertEqual(
+            snapshot["timings"]["latency"],
+            {"count": 2, "total_seconds": 2.0, "max_seconds": 1.5},
+        )
+
+    def test_metrics_route(self):
+        metrics.increment("calls")
+        client = TestClient(main.mcp.streamable_http_app())
+        response = client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["counters"]["calls"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
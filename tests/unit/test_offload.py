@@ -0,0 +1,102 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import os
+import threading
+import unittest
+
+from gerrit_mcp_server import json_codec, metrics
+from gerrit_mcp_server.offload import Offloader
+
+
+def _current_thread_name(_):
+    return threading.current_thread().name
+
+
+class TestOffloader(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_small_inputs_run_inline(self):
+        async def run_test():
+            offloader = Offloader(threshold_bytes=100)
+            name = await offloader.run("parse", 10, _current_thread_name, None)
+            self.assertEqual(name, threading.current_thread().name)
+            self.assertEqual(metrics.snapshot()["counters"]["offload.parse.inline"], 1)
+
+        asyncio.run(run_test())
+
+    def test_large_inputs_run_in_the_pool(self):
+        async def run_test():
+            offloader = Offloader(threshold_bytes=100)
+            try:
+                name = await offloader.run("render", 100, _current_thread_name, None)
+                self.assertTrue(name.startswith("gerrit-mcp-offload"))
+                snapshot = metrics.snapshot()
+                self.assertEqual(snapshot["counters"]["offload.render.offloaded"], 1)
+                self.assertEqual(snapshot["timings"]["offload.render.offloaded_duration"]["count"], 1)
+            finally:
+                offloader.shutdown()
+
+        asyncio.run(run_test())
+
+    def test_process_pool(self):
+        async def run_test():
+            offloader = Offloader(threshold_bytes=0, executor="process", max_workers=1)
+            try:
+                self.assertEqual(await offloader.run("parse", 7, json.loads, '{"a": 1}'), {"a": 1})
+            finally:
+                offloader.shutdown()
+
+        asyncio.run(run_test())
+
+    def test_auto_runs_gil_bound_work_in_processes(self):
+        async def run_test():
+            offloader = Offloader(threshold_bytes=0, max_workers=1)
+            try:
+                self.assertEqual(offloader.pool_for("parse"), "process")
+                self.assertEqual(offloader.pool_for("decode"), "process")
+                self.assertNotEqual(await offloader.run("parse", 1, os.getpid), os.getpid())
+                body = memoryview(b'{"a": 1}')
+                self.assertEqual(await offloader.run("parse", 8, json_codec.loads, body), {"a": 1})
+                name = await offloader.run("render", 1, _current_thread_name, None)
+                self.assertTrue(name.startswith("gerrit-mcp-offload"))
+            finally:
+                offloader.shutdown()
+
+        asyncio.run(run_test())
+
+    def test_process_workers_use_the_servers_json_backend(self):
+        async def run_test():
+            offloader = Offloader(threshold_bytes=0, executor="process", max_workers=1)
+            previous = json_codec.backend()
+            try:
+                for backend in ("json", "orjson") if json_codec.orjson else ("json",):
+                    json_codec.use_backend(backend)
+                    self.assertEqual(await offloader.run("parse", 1, json_codec.backend), backend)
+            finally:
+                json_codec.use_backend(previous)
+                offloader.shutdown()
+
+        asyncio.run(run_test())
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            Offloader(executor="gpu")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import tempfile
+import unittest
+import zipfile
+
+from gerrit_mcp_server.patch_index import PatchIndex, PatchIndexCache
+
+MAIN_DIFF = (
+    "diff --git a/src/main.py b/src/main.py\n"
+    "index 1111111..2222222 100644\n"
+    "--- a/src/main.py\n"
+    "+++ b/src/main.py\n"
+    "@@ -1,1 +1,1 @@\n"
+    "-old line\n"
+    "+new line\n"
+)
+DELETED_DIFF = (
+    "diff --git a/old.txt b/old.txt\n"
+    "deleted file mode 100644\n"
+    "index 3333333..0000000\n"
+    "--- a/old.txt\n"
+    "+++ /dev/null\n"
+    "@@ -1 +0,0 @@\n"
+    "-gone\n"
+)
+BINARY_DIFF = (
+    "diff --git a/img/logo.png b/img/logo.png\n"
+    "index 4444444..5555555 100644\n"
+    "Binary files differ\n"
+)
+PATCH = (
+    "From 0123456789abcdef Mon Sep 17 00:00:00 2001\n"
+    "From: Test User <test@example.com>\n"
+    "Subject: [PATCH] Test change\n"
+    "\n"
+    "Test change\n"
+    "---\n"
+    "\n" + MAIN_DIFF + DELETED_DIFF + BINARY_DIFF + "-- \n2.40.0\n"
+)
+
+
+def _write_zip(path, content):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("0123456789abcdef.diff", content)
+
+
+class TestPatchIndex(unittest.TestCase):
+    def setUp(self):
+        fd, self.zip_path = tempfile.mkstemp(suffix=".zip")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.zip_path)
+
+    def test_splits_patch_per_file(self):
+        _write_zip(self.zip_path, PATCH)
+        index = PatchIndex.from_zip_file(self.zip_path)
+        try:
+            self.assertEqual(index.files(), ["src/main.py", "old.txt", "img/logo.png"])
+            self.assertEqual(index.get_file_diff("src/main.py"), MAIN_DIFF)
+            self.assertEqual(index.get_file_diff("old.txt"), DELETED_DIFF)
+            # The format-patch signature is not part of the last file.
+            self.assertEqual(index.get_file_diff("img/logo.png"), BINARY_DIFF)
+            self.assertIsNone(index.get_file_diff("missing.py"))
+        finally:
+            index.close()
+
+    def test_error_response_raises_value_error(self):
+        with open(self.zip_path, "w") as f:
+            f.write("Not found: 12345")
+        with self.assertRaisesRegex(ValueError, "Not found: 12345"):
+            PatchIndex.from_zip_file(self.zip_path)
+
+
+class TestPatchIndexCache(unittest.TestCase):
+    def _index(self):
+        fd, path = tempfile.mkstemp(suffix=".zip")
+        os.close(fd)
+        try:
+            _write_zip(path, MAIN_DIFF)
+            return PatchIndex.from_zip_file(path)
+        finally:
+            os.remove(path)
+
+    def test_concurrent_builds_share_one_download(self):
+        async def run_test():
+            cache = PatchIndexCache()
+            calls = 0
+
+            async def builder():
+                nonlocal calls
+                calls += 1
+                await asyncio.sleep(0.01)
+                return self._index()
+
+            results = await asyncio.gather(
+                *[cache.get_or_build(("url", "1"), builder) for _ in range(5)]
+            )
+            self.assertEqual(calls, 1)
+            self.assertTrue(all(r is results[0] for r in results))
+            cache.clear()
+
+        asyncio.run(run_test())
+
+    def test_cancelling_a_caller_does_not_cancel_the_others(self):
+        async def run_test():
+            cache = PatchIndexCache()
+            calls = 0
+
+            async def builder():
+                nonlocal calls
+                calls += 1
+                await asyncio.sleep(0.01)
+                return self._index()
+
+            first = asyncio.create_task(cache.get_or_build(("url", "1"), builder))
+            second = asyncio.create_task(cache.get_or_build(("url", "1"), builder))
+            await asyncio.sleep(0)
+            first.cancel()
+
+            index = await second
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+            self.assertEqual(calls, 1)
+            self.assertIs(cache.get(("url", "1")), index)
+            cache.clear()
+
+        asyncio.run(run_test())
+
+    def test_evicts_least_recently_used(self):
+        cache = PatchIndexCache(max_entries=1)
+        cache.put("a", self._index())
+        cache.put("b", self._index())
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("b"))
+        cache.clear()
+
+    def test_expired_entries_are_dropped(self):
+        cache = PatchIndexCache(ttl_seconds=-1)
+        cache.put("a", self._index())
+        self.assertIsNone(cache.get("a"))
+
+    def test_remembers_revisions_briefly(self):
+        cache = PatchIndexCache(max_revisions=1)
+        cache.put_revision(("url", "1"), "abc")
+        self.assertEqual(cache.get_revision(("url", "1")), "abc")
+        cache.put_revision(("url", "2"), "def")
+        self.assertIsNone(cache.get_revision(("url", "1")))
+        cache.invalidate(lambda key: key[0] == "url")
+        self.assertIsNone(cache.get_revision(("url", "2")))
+
+        expired = PatchIndexCache(revision_ttl_seconds=-1)
+        expired.put_revision(("url", "1"), "abc")
+        self.assertIsNone(expired.get_revision(("url", "1")))
+
+
+if __name__ == "__main__":
+    unittest.main()
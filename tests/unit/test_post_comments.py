@@ -0,0 +1,161 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.comment_batch import CommentBatchError, comment_inputs, review_comments
+from gerrit_mcp_server.curl_batch import BatchResult
+
+
+BASE_URL = "https://gerrit-review.googlesource.com"
+
+
+class TestCommentBatch(unittest.TestCase):
+    def test_builds_comment_inputs(self):
+        inputs = comment_inputs(
+            [
+                {"file_path": "a.py", "line_number": 3, "message": "Nit"},
+                {
+                    "file_path": "a.py",
+                    "message": "Use this",
+                    "start_line": 5,
+                    "start_character": 0,
+                    "end_line": 6,
+                    "end_character": 4,
+                    "suggestion": "x = 1",
+                    "unresolved": False,
+                },
+                {"file_path": "b.py", "message": "File comment", "in_reply_to": "c1"},
+            ]
+        )
+
+        self.assertEqual(inputs[0], {"path": "a.py", "line": 3, "message": "Nit", "unresolved": True})
+        self.assertEqual(inputs[1]["line"], 6)
+        self.assertEqual(inputs[1]["message"], "Use this\n```suggestion\nx = 1\n```")
+        self.assertFalse(inputs[1]["unresolved"])
+        self.assertNotIn("line", inputs[2])
+        self.assertEqual(inputs[2]["in_reply_to"], "c1")
+        self.assertEqual(list(review_comments(inputs)), ["a.py", "b.py"])
+        self.assertEqual(len(review_comments(inputs)["a.py"]), 2)
+
+    def test_names_the_invalid_comment(self):
+        comments = [
+            {"file_path": "a.py", "line_number": 1, "message": "ok"},
+            {"file_path": "b.py", "line_number": 0, "message": "bad line"},
+        ]
+        with self.assertRaisesRegex(CommentBatchError, r"comment 2 \(b.py\): line_number"):
+            comment_inputs(comments)
+
+    def test_rejects_incomplete_or_reversed_range(self):
+        with self.assertRaisesRegex(CommentBatchError, "a range needs all of"):
+            comment_inputs([{"file_path": "a.py", "message": "m", "start_line": 1}])
+        with self.assertRaisesRegex(CommentBatchError, "range ends before it starts"):
+            comment_inputs(
+                [
+                    {
+                        "file_path": "a.py",
+                        "message": "m",
+                        "start_line": 4,
+                        "start_character": 0,
+                        "end_line": 2,
+                        "end_character": 0,
+                    }
+                ]
+            )
+
+    def test_rejects_suggestion_without_line(self):
+        with self.assertRaisesRegex(CommentBatchError, "suggestion needs a line_number"):
+            comment_inputs([{"file_path": "a.py", "message": "m", "suggestion": "x"}])
+
+
+class TestPostComments(unittest.TestCase):
+    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
+    def test_publishes_in_one_review(self, mock_run_curl):
+        async def run_test():
+            mock_run_curl.return_value = json.dumps({"labels": {"Code-Review": -1}})
+
+            result = await main.post_comments(
+                change_id="123",
+                comments=[
+                    {"file_path": "a.py", "line_number": 1, "message": "One"},
+                    {"file_path": "a.py", "line_number": 2, "message": "Two"},
+                    {"file_path": "b.py", "line_number": 3, "message": "Three"},
+                ],
+                message="See inline",
+                labels={"Code-Review": -1},
+                gerrit_base_url=BASE_URL,
+            )
+
+            self.assertIn("Posted 3 comment(s) on 2 file(s) of CL 123", result[0]["text"])
+            self.assertIn("Code-Review -1", result[0]["text"])
+            mock_run_curl.assert_awaited_once()
+            args = mock_run_curl.call_args[0][0]
+            self.assertEqual(args[-1], f"{BASE_URL}/changes/123/revisions/current/review")
+            payload = json.loads(mock_run_curl.call_args.kwargs["body"])
+            self.assertEqual(payload["message"], "See inline")
+            self.assertEqual(len(payload["comments"]["a.py"]), 2)
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
+    def test_invalid_comment_sends_nothing(self, mock_run_curl):
+        async def run_test():
+            result = await main.post_comments(
+                change_id="123",
+                comments=[{"file_path": "a.py", "line_number": 1}],
+                gerrit_base_url=BASE_URL,
+            )
+
+            self.assertIn("No comments were posted: comment 1 (a.py): message is required", result[0]["text"])
+            mock_run_curl.assert_not_awaited()
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
+    def test_review_failure(self, mock_run_curl):
+        async def run_test():
+            mock_run_curl.return_value = "file c.py not found in revision"
+
+            result = await main.post_comments(
+                change_id="123",
+                comments=[{"file_path": "c.py", "line_number": 1, "message": "m"}],
+                gerrit_base_url=BASE_URL,
+            )
+
+            self.assertIn("Failed to post comments", result[0]["text"])
+
+        asyncio.run(run_test())
+
+    @patch("gerrit_mcp_server.main.run_curl_batch", new_callable=AsyncMock)
+    def test_drafts_use_one_batch(self, mock_run_curl_batch):
+        async def run_test():
+            mock_run_curl_batch.return_value = [
+                BatchResult(201, b'{"id": "d1"}'),
+                BatchResult(400, b"invalid line"),
+            ]
+
+            result = await main.post_comments(
+                change_id="123",
+                comments=[
+                    {"file_path": "a.py", "line_number": 1, "message": "One"},
+                    {"file_path": "a.py", "line_number": 900, "message": "Two"},
+                ],
+                as_drafts=True,
+                gerrit_base_url=BASE_URL,
+            )
+
+            self.assertIn("Created 1 draft comment(s) on CL 123", result[0]["text"])
+            self.assertIn("a.py:900: HTTP 400: invalid line", result[0]["text"])
+            transfers = mock_run_curl_batch.call_args[0][0]
+            self.assertEqual(len(transfers), 2)
+            self.assertEqual(transfers[0][:2], ["-X", "PUT"])
+            self.assertEqual(transfers[0][-1], f"{BASE_URL}/changes/123/revisions/current/drafts")
+            bodies = mock_run_curl_batch.call_args.kwargs["bodies"]
+            self.assertEqual([json.loads(body)["line"] for body in bodies], [1, 900])
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    unittest.main()
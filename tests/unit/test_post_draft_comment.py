@@ -25,9 +25,7 @@ class TestPostDraftComment(unittest.TestCase):
             self.assertIn("src/main.py", result[0]["text"])
 
             mock_run_curl.assert_called_once()
-            args, kwargs = mock_run_curl.call_args
-            curl_args = args[0]
-            payload = json.loads(curl_args[curl_args.index("--data") + 1])
+            payload = json.loads(mock_run_curl.call_args.kwargs["body"])
             self.assertEqual(payload["path"], "src/main.py")
             self.assertEqual(payload["line"], 10)
             self.assertEqual(payload["message"], "This needs a fix.")
@@ -51,9 +49,7 @@ class TestPostDraftComment(unittest.TestCase):
 
             self.assertIn("Draft comment created", result[0]["text"])
 
-            args, _ = mock_run_curl.call_args
-            curl_args = args[0]
-            payload = json.loads(curl_args[curl_args.index("--data") + 1])
+            payload = json.loads(mock_run_curl.call_args.kwargs["body"])
             self.assertIn("```suggestion", payload["message"])
             self.assertIn("new_code_here()", payload["message"])
 
@@ -78,9 +74,7 @@ class TestPostDraftComment(unittest.TestCase):
 
             self.assertIn("Draft comment created", result[0]["text"])
 
-            args, _ = mock_run_curl.call_args
-            curl_args = args[0]
-            payload = json.loads(curl_args[curl_args.index("--data") + 1])
+            payload = json.loads(mock_run_curl.call_args.kwargs["body"])
             self.assertEqual(payload["range"]["start_line"], 8)
             self.assertEqual(payload["range"]["end_line"], 12)
             # line should equal end_line when range is provided
@@ -104,9 +98,7 @@ class TestPostDraftComment(unittest.TestCase):
 
             self.assertIn("Draft comment created", result[0]["text"])
 
-            args, _ = mock_run_curl.call_args
-            curl_args = args[0]
-            payload = json.loads(curl_args[curl_args.index("--data") + 1])
+            payload = json.loads(mock_run_curl.call_args.kwargs["body"])
             self.assertEqual(payload["in_reply_to"], "comment-abc123")
 
         asyncio.run(run_test())
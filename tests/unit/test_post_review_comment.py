@@ -16,11 +16,12 @@ class TestPostReviewComment(unittest.TestCase):
                 'POST',
                 '-H',
                 'Content-Type: application/json',
-                '--data',
-                expected_payload_str,
+                '--data-binary',
+                '@-',
                 'https://gerrit-review.googlesource.com/changes/123/revisions/current/review'
             ],
-            'https://gerrit-review.googlesource.com'
+            'https://gerrit-review.googlesource.com',
+            body=expected_payload_str.encode(),
         )
 
 if __name__ == '__main__':
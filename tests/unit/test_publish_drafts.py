@@ -17,9 +17,7 @@ class TestPublishDrafts(unittest.TestCase):
             result = await main.publish_drafts(change_id, gerrit_base_url=gerrit_base_url)
 
             mock_run_curl.assert_called_once()
-            args, _ = mock_run_curl.call_args
-            curl_args = args[0]
-            payload = json.loads(curl_args[curl_args.index("--data") + 1])
+            payload = json.loads(mock_run_curl.call_args.kwargs["body"])
             self.assertEqual(payload["drafts"], "PUBLISH_ALL_REVISIONS")
             self.assertNotIn("message", payload)
             self.assertNotIn("labels", payload)
@@ -41,9 +39,7 @@ class TestPublishDrafts(unittest.TestCase):
                 gerrit_base_url=gerrit_base_url,
             )
 
-            args, _ = mock_run_curl.call_args
-            curl_args = args[0]
-            payload = json.loads(curl_args[curl_args.index("--data") + 1])
+            payload = json.loads(mock_run_curl.call_args.kwargs["body"])
             self.assertEqual(payload["drafts"], "PUBLISH_ALL_REVISIONS")
             self.assertEqual(payload["message"], "Addressed all comments")
             self.assertEqual(payload["labels"], {"Code-Review": 1})
@@ -21,8 +21,8 @@ from gerrit_mcp_server import main
 
 
 class TestQueryChanges(unittest.TestCase):
-    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
-    def test_query_changes_success(self, mock_run_curl):
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_query_changes_success(self, mock_exec_curl):
         async def run_test():
             # Arrange
             query = "status:open"
@@ -40,7 +40,7 @@ class TestQueryChanges(unittest.TestCase):
                     "work_in_progress": True,
                 },
             ]
-            mock_run_curl.return_value = json.dumps(mock_response)
+            mock_exec_curl.return_value = json.dumps(mock_response).encode()
             gerrit_base_url = "https://my-gerrit.com"
 
             # Act
@@ -55,12 +55,12 @@ class TestQueryChanges(unittest.TestCase):
 
         asyncio.run(run_test())
 
-    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
-    def test_query_changes_no_results(self, mock_run_curl):
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_query_changes_no_results(self, mock_exec_curl):
         async def run_test():
             # Arrange
             query = "status:merged"
-            mock_run_curl.return_value = "[]"
+            mock_exec_curl.return_value = b"[]"
             gerrit_base_url = "https://my-gerrit.com"
 
             # Act
@@ -0,0 +1,108 @@
+import asyncio
+import http.server
+import json
+import shutil
+import threading
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from gerrit_mcp_server import main
+
+
+class _EchoHandler(http.server.BaseHTTPRequestHandler):
+    def _echo(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        payload = json.loads(body)
+        response = json.dumps({"method": self.command, "message_length": len(payload["message"])})
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b")]}'\n" + response.encode())
+
+    do_POST = _echo
+    do_PUT = _echo
+
+    def log_message(self, *args):
+        pass
+
+
+class TestBodyArgs(unittest.TestCase):
+    def test_body_is_not_on_the_command_line(self):
+        args, body = main._create_post_args("https://g.com/review", {"message": "hi"})
+
+        self.assertEqual(
+            args,
+            ["-X", "POST", "-H", "Content-Type: application/json", "--data-binary", "@-", "https://g.com/review"],
+        )
+        self.assertEqual(body, b'{"message": "hi"}')
+
+    def test_no_payload_no_body(self):
+        self.assertEqual(main._create_post_args("https://g.com/ready"), (["-X", "POST", "https://g.com/ready"], None))
+
+    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_stdin_carries_the_body_or_nothing(self, mock_load_config, mock_exec):
+        mock_load_config.return_value = {
+            "gerrit_hosts": [{"external_url": "https://g.com", "authentication": {"type": "gob_curl"}}]
+        }
+        process = MagicMock()
+        process.communicate = AsyncMock(return_value=(b"", b""))
+        process.returncode = 0
+        mock_exec.return_value = process
+
+        async def run_test():
+            await main.run_curl(["https://g.com/changes/1"], "https://g.com")
+            self.assertEqual(mock_exec.call_args.kwargs["stdin"], asyncio.subprocess.DEVNULL)
+            process.communicate.assert_awaited_with(None)
+
+            args, body = main._create_post_args("https://g.com/changes/1/review", {"message": "hi"})
+            await main.run_curl(list(args), "https://g.com", body=body)
+            self.assertEqual(mock_exec.call_args.kwargs["stdin"], asyncio.subprocess.PIPE)
+            process.communicate.assert_awaited_with(b'{"message": "hi"}')
+
+        asyncio.run(run_test())
+
+
+@unittest.skipUnless(shutil.which("curl"), "curl is not installed")
+class TestLargeBodies(unittest.TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.config = {
+            "gerrit_hosts": [
+                {
+                    "external_url": self.base_url,
+                    "authentication": {"type": "http_basic", "username": "u", "auth_token": "t"},
+                }
+            ]
+        }
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_body_larger_than_an_argument_can_be(self, mock_load_config):
+        mock_load_config.return_value = self.config
+        # Linux limits a single command line argument to 128 KiB.
+        message = "x" * (1024 * 1024)
+        args, body = main._create_post_args(f"{self.base_url}/review", {"message": message})
+
+        result = asyncio.run(main.run_curl(args, self.base_url, body=body))
+
+        self.assertEqual(json.loads(result), {"method": "POST", "message_length": len(message)})
+
+    @patch("gerrit_mcp_server.main.load_gerrit_config")
+    def test_batch_sends_bodies(self, mock_load_config):
+        mock_load_config.return_value = self.config
+        transfers, bodies = zip(
+            *(main._create_put_args(f"{self.base_url}/drafts", {"message": "y" * n}) for n in (1, 200000))
+        )
+
+        results = asyncio.run(main.run_curl_batch(list(transfers), self.base_url, bodies=list(bodies)))
+
+        self.assertEqual([json.loads(r.text())["message_length"] for r in results], [1, 200000])
+
+
+if __name__ == "__main__":
+    unittest.main()
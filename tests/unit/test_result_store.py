@@ -0,0 +1,165 @@
+import asyncio
+import base64
+import json
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.result_store import ResultStore, page_budget, paginate, read_page, split_page
+from gerrit_mcp_server.shared_store import SharedStore
+
+
+HOST = "https://gerrit-review.googlesource.com"
+
+
+class TestResultStore(unittest.TestCase):
+    def test_pages_end_after_a_newline(self):
+        data = b"aaaa\nbbbb\ncccc\n"
+
+        self.assertEqual(split_page(data, 0, 12), (b"aaaa\nbbbb\n", 10))
+        self.assertEqual(split_page(data, 10, 12), (b"cccc\n", None))
+
+    def test_pages_do_not_split_characters(self):
+        data = "abéé".encode("utf-8")
+
+        self.assertEqual(split_page(data, 0, 3), (b"ab", 2))
+
+    def test_token_budget(self):
+        self.assertEqual(page_budget(65536, page_tokens=1000), 4000)
+        self.assertEqual(page_budget(2000, page_tokens=1000), 2000)
+
+    def test_paging_through_a_result(self):
+        store = ResultStore()
+        text = "".join(f"line {i}\n" for i in range(100))
+
+        page = paginate(store, text, 100)
+        pages = [page]
+        while "cursor" in page:
+            cursor = page.split('cursor "')[1].split('"')[0]
+            page = read_page(store, cursor, 100)
+            pages.append(page)
+
+        self.assertIn("[End of result:", pages[-1])
+        self.assertEqual("".join(p.split("\n[")[0] for p in pages), text)
+
+    def test_pages_are_not_paged_again(self):
+        store = ResultStore()
+        page = paginate(store, "x\n" * 100, 50)
+
+        self.assertEqual(paginate(store, page, 50), page)
+        self.assertEqual(store.size, 200)
+
+    def test_text_ending_like_a_footer_is_paged(self):
+        store = ResultStore()
+        text = "x\n" * 100 + "\n[End of result: bytes 0-10 of 10.]\n"
+
+        page = paginate(store, text, 50)
+
+        self.assertIn("Call get_result_page with cursor", page)
+        self.assertEqual(store.size, len(text))
+
+    def test_small_results_are_not_stored(self):
+        store = ResultStore()
+
+        self.assertEqual(paginate(store, "short", 100), "short")
+        self.assertEqual(store.size, 0)
+
+    def test_results_expire(self):
+        now = [0.0]
+        store = ResultStore(ttl_seconds=10, clock=lambda: now[0])
+        result_id = store.put(b"data")
+
+        now[0] = 10.0
+        self.assertIsNone(store.get(result_id))
+        self.assertEqual(store.size, 0)
+
+    def test_least_recently_used_results_are_evicted(self):
+        store = ResultStore(max_bytes=10)
+        first = store.put(b"1234")
+        second = store.put(b"5678")
+        store.get(first)
+
+        third = store.put(b"9012")
+
+        self.assertIsNone(store.get(second))
+        self.assertEqual(store.get(first), b"1234")
+        self.assertEqual(store.get(third), b"9012")
+        self.assertIsNone(store.put(b"x" * 11))
+
+    def test_results_are_shared_between_workers(self):
+        shared = SharedStore(":memory:")
+        result_id = ResultStore(store=shared).put(b"data")
+
+        self.assertEqual(ResultStore(store=shared).get(result_id), b"data")
+
+    def test_shared_results_are_bounded(self):
+        shared = SharedStore(":memory:")
+        # The shared store keeps each value JSON-encoded, in 6 bytes here.
+        store = ResultStore(max_bytes=14, store=shared)
+        first = store.put(b"1234")
+        second = store.put(b"5678")
+        third = store.put(b"9012")
+        store.clear()
+
+        self.assertIsNone(store.get(first))
+        self.assertEqual(store.get(second), b"5678")
+        self.assertEqual(store.get(third), b"9012")
+
+    def test_invalid_cursor(self):
+        with self.assertRaisesRegex(ValueError, "Invalid cursor"):
+            read_page(ResultStore(), "nonsense", 100)
+
+
+class TestPagedTools(unittest.TestCase):
+    def setUp(self):
+        config = {
+            "gerrit_hosts": [{"external_url": HOST, "authentication": {"type": "gob_curl"}}],
+            "result_pages": {"page_bytes": 1000},
+        }
+        for target, value in (
+            ("gerrit_mcp_server.main.load_gerrit_config", lambda: config),
+            ("gerrit_mcp_server.main._result_store", None),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
+    def test_large_diff_is_paged_without_refetching(self, mock_run_curl):
+        diff = "".join(f"+added line {i}\n" for i in range(300))
+        mock_run_curl.return_value = base64.b64encode(diff.encode("utf-8")).decode("ascii")
+
+        first = asyncio.run(main.get_file_diff("1", "a.txt", gerrit_base_url=HOST))[0]["text"]
+        self.assertLessEqual(len(first.split("\n[")[0]), 1000)
+        self.assertIn("Call get_result_page with cursor", first)
+
+        texts = [first]
+        while "cursor" in texts[-1]:
+            cursor = texts[-1].split('cursor "')[1].split('"')[0]
+            texts.append(asyncio.run(main.get_result_page(cursor))[0]["text"])
+
+        self.assertEqual("".join(t.split("\n[")[0] for t in texts), diff)
+        mock_run_curl.assert_called_once()
+
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_date_query_is_paged_once(self, mock_exec_curl):
+        mock_exec_curl.return_value = json.dumps(
+            [{"_number": n, "subject": f"Change {n}", "updated": "2025-01-01 00:00:00"} for n in range(100)]
+        ).encode()
+
+        text = asyncio.run(
+            main.query_changes_by_date_and_filters("2025-01-01", "2025-01-02", gerrit_base_url=HOST)
+        )[0]["text"]
+
+        self.assertEqual(text.count("get_result_page"), 1)
+        cursor = text.split('cursor "')[1].split('"')[0]
+        self.assertIn("Change", asyncio.run(main.get_result_page(cursor))[0]["text"])
+
+    def test_expired_cursor(self):
+        result = asyncio.run(main.get_result_page("0123456789abcdef:100"))
+
+        self.assertIn("has expired", result[0]["text"])
+
+
+if __name__ == "__main__":
+    unittest.main()
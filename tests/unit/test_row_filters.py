@@ -0,0 +1,133 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from gerrit_mcp_server import main
+from gerrit_mcp_server.field_masks import FieldMask
+from gerrit_mcp_server.row_filters import Selection, SelectionError, format_rows
+
+
+HOST = "https://gerrit-review.googlesource.com"
+
+
+def _change(number, votes):
+    return {
+        "_number": number,
+        "subject": f"Change {number}",
+        "owner": {"email": f"owner{number}@example.com"},
+        "labels": {"Code-Review": {"all": [{"value": v} for v in votes]}},
+    }
+
+
+class TestSelection(unittest.TestCase):
+    def test_paths_fan_out_over_lists(self):
+        selection = Selection({"labels.Code-Review.all.value": -1})
+
+        self.assertTrue(selection.matches(_change(1, [1, -1])))
+        self.assertFalse(selection.matches(_change(2, [1, 0])))
+
+    def test_operators_and_combinators(self):
+        selection = Selection(
+            {
+                "any": [{"line": {"gt": 100}}, {"message": {"contains": "NIT"}}],
+                "not": {"author.email": {"in": ["bot@example.com"]}},
+            }
+        )
+
+        self.assertTrue(selection.matches({"line": 120, "author": {"email": "a@example.com"}}))
+        self.assertTrue(selection.matches({"message": "nit: spacing", "author": {"email": "a@example.com"}}))
+        self.assertFalse(selection.matches({"line": 120, "author": {"email": "bot@example.com"}}))
+        self.assertFalse(selection.matches({"line": "File", "author": {}}))
+
+    def test_ne_and_exists(self):
+        self.assertTrue(Selection({"labels.Code-Review.all.value": {"ne": -2}}).matches(_change(1, [1, -1])))
+        self.assertFalse(Selection({"labels.Code-Review.all.value": {"ne": -1}}).matches(_change(1, [1, -1])))
+        self.assertTrue(Selection({"in_reply_to": {"exists": False}}).matches({"id": "a"}))
+
+    def test_limit_and_projection(self):
+        selection = Selection.from_spec({"fields": ["_number", "owner.email"], "limit": 1})
+        rows = selection.apply([_change(1, []), _change(2, [])])
+
+        self.assertEqual(format_rows("Changes", rows, selection), "Changes: 1 matching\n- _number=1, owner.email=owner1@example.com\n")
+
+    def test_invalid_selections(self):
+        for spec, error in (
+            ({"where": {"line": {"matches": ".*"}}}, "Unknown operator 'matches'"),
+            ({"where": {"any": []}}, "non-empty list"),
+            ({"limit": 0}, "positive integer"),
+            ({"order": "line"}, "Unknown selection keys: order"),
+            ({"where": {"all": [{"line": n} for n in range(300)]}}, "more than 200"),
+        ):
+            with self.assertRaisesRegex(SelectionError, error):
+                Selection.from_spec(spec)
+
+    def test_paths_determine_change_options(self):
+        mask = FieldMask.for_paths(["labels.Code-Review.all.value", "owner.email", "hashtags"])
+
+        self.assertEqual(mask.options(), ("DETAILED_ACCOUNTS", "DETAILED_LABELS", "SKIP_DIFFSTAT"))
+
+
+class TestSelectingTools(unittest.TestCase):
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_query_changes_keeps_matching_changes(self, mock_exec_curl):
+        mock_exec_curl.return_value = json.dumps([_change(1, [1]), _change(2, [-1])]).encode()
+
+        result = asyncio.run(
+            main.query_changes(
+                "status:open",
+                gerrit_base_url=HOST,
+                select={"where": {"labels.Code-Review.all.value": -1}, "fields": ["_number", "subject"]},
+            )
+        )
+
+        self.assertIn("o=DETAILED_LABELS", mock_exec_curl.call_args[0][0][0])
+        self.assertEqual(
+            result[0]["text"], 'Changes for query "status:open": 1 matching\n- _number=2, subject=Change 2\n'
+        )
+
+    @patch("gerrit_mcp_server.main._exec_curl", new_callable=AsyncMock)
+    def test_list_change_comments_renders_only_matching_comments(self, mock_exec_curl):
+        mock_exec_curl.return_value = json.dumps(
+            {
+                "a.py": [
+                    {"id": "1", "line": 1, "message": "Fix this", "unresolved": True, "author": {"_account_id": 1, "name": "A", "email": "a@example.com"}},
+                    {"id": "2", "line": 2, "message": "Done", "unresolved": False, "author": {"_account_id": 1, "name": "A", "email": "a@example.com"}},
+                ],
+                "b.py": [
+                    {"id": "3", "line": 3, "message": "Also", "unresolved": True, "author": {"_account_id": 2, "name": "B", "email": "b@example.com"}},
+                ],
+            }
+        ).encode()
+
+        result = asyncio.run(
+            main.list_change_comments(
+                "1", gerrit_base_url=HOST, select={"where": {"unresolved": True, "author.email": "a@example.com"}}
+            )
+        )
+
+        text = result[0]["text"]
+        self.assertIn("Fix this", text)
+        self.assertNotIn("Done", text)
+        self.assertNotIn("b.py", text)
+
+    @patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock)
+    def test_list_draft_comments_without_matches(self, mock_run_curl):
+        mock_run_curl.return_value = json.dumps({"a.py": [{"id": "d1", "line": 1, "message": "draft"}]})
+
+        result = asyncio.run(
+            main.list_draft_comments("1", gerrit_base_url=HOST, select={"where": {"path": "b.py"}})
+        )
+
+        self.assertEqual(result[0]["text"], "No draft comments on CL 1 match the selection.")
+
+    def test_invalid_select_is_reported_before_any_request(self):
+        with patch("gerrit_mcp_server.main.run_curl", new_callable=AsyncMock) as mock_run_curl:
+            result = asyncio.run(main.list_change_files("1", gerrit_base_url=HOST, select={"limit": -1}))
+
+        self.assertEqual(result[0]["text"], "Invalid select: 'limit' must be a positive integer.")
+        mock_run_curl.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -34,7 +34,7 @@ class TestSetReadyForReview(unittest.TestCase):
             # Assert
             expected_url = "https://my-gerrit.com/changes/12345/ready"
             expected_args = ["-X", "POST", expected_url]
-            mock_run_curl.assert_called_once_with(expected_args, gerrit_base_url)
+            mock_run_curl.assert_called_once_with(expected_args, gerrit_base_url, body=None)
             self.assertEqual(
                 result,
                 [{"type": "text", "text": f"CL {change_id} is now ready for review."}],
@@ -46,11 +46,11 @@ class TestSetTopic(unittest.TestCase):
                 "PUT",
                 "-H",
                 "Content-Type: application/json",
-                "--data",
-                payload,
+                "--data-binary",
+                "@-",
                 f"{gerrit_base_url}/changes/{change_id}/topic",
             ]
-            mock_run_curl.assert_called_once_with(expected_args, gerrit_base_url)
+            mock_run_curl.assert_called_once_with(expected_args, gerrit_base_url, body=payload.encode())
 
         asyncio.run(run_test())
 
@@ -86,8 +86,8 @@ class TestSetTopic(unittest.TestCase):
             # Arrange
             change_id = "12345"
             error_message = "topic not found"
-            # First call raises the error, second call returns the raw text for the error message
-            mock_run_curl.side_effect = [json.JSONDecodeError("", "", 0), error_message]
+            # Gerrit answers with plain text instead of the new topic.
+            mock_run_curl.return_value = error_message
             gerrit_base_url = "https://my-gerrit.com"
 
             # Act
@@ -98,6 +98,8 @@ class TestSetTopic(unittest.TestCase):
             # Assert
             self.assertIn(f"Failed to set topic for CL {change_id}", result[0]["text"])
             self.assertIn(error_message, result[0]["text"])
+            # The PUT is not sent a second time.
+            mock_run_curl.assert_awaited_once()
 
         asyncio.run(run_test())
 
@@ -37,7 +37,7 @@ class TestSetWorkInProgress(unittest.TestCase):
             # Assert
             expected_url = "https://my-gerrit.com/changes/12345/wip"
             expected_args = ["-X", "POST", expected_url]
-            mock_run_curl.assert_called_once_with(expected_args, gerrit_base_url)
+            mock_run_curl.assert_called_once_with(expected_args, gerrit_base_url, body=None)
             self.assertEqual(
                 result,
                 [
@@ -72,11 +72,13 @@ class TestSetWorkInProgress(unittest.TestCase):
                 "POST",
                 "-H",
                 "Content-Type: application/json",
-                "--data",
-                expected_payload,
+                "--data-binary",
+                "@-",
                 expected_url,
             ]
-            mock_run_curl.assert_called_once_with(expected_args, gerrit_base_url)
+            mock_run_curl.assert_called_once_with(
+                expected_args, gerrit_base_url, body=expected_payload.encode()
+            )
             self.assertEqual(
                 result,
                 [
@@ -0,0 +1,116 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from gerrit_mcp_server.account_cache import AccountCache
+from gerrit_mcp_server.shared_store import SharedStore, private_directory
+
+HOST = "https://my-gerrit.com"
+
+
+class TestSharedStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "shared.sqlite3")
+        self.store = SharedStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_values_are_visible_to_other_connections(self):
+        self.store.set("ns", "a", {"x": 1}, ttl_seconds=60)
+        other = SharedStore(self.path)
+        try:
+            self.assertEqual(other.get("ns", "a"), {"x": 1})
+            self.assertIsNone(other.get("other-ns", "a"))
+        finally:
+            other.close()
+
+    def test_expired_values_are_ignored_and_purged(self):
+        with patch("gerrit_mcp_server.shared_store.time.time", return_value=1000.0):
+            self.store.set_many("ns", {"a": 1, "b": 2}, ttl_seconds=10)
+        with patch("gerrit_mcp_server.shared_store.time.time", return_value=1005.0):
+            self.assertEqual(self.store.get_many("ns", ["a", "b", "c"]), {"a": 1, "b": 2})
+        with patch("gerrit_mcp_server.shared_store.time.time", return_value=1011.0):
+            self.assertIsNone(self.store.get("ns", "a"))
+            self.assertEqual(self.store.purge_expired(), 2)
+
+    def test_writes_purge_expired_values_once_per_interval(self):
+        store = SharedStore(self.path, purge_interval_seconds=0)
+        try:
+            with patch("gerrit_mcp_server.shared_store.time.time", return_value=1000.0):
+                store.set("ns", "old", 1, ttl_seconds=10)
+            with patch("gerrit_mcp_server.shared_store.time.time", return_value=1011.0):
+                store.set("ns", "new", 2, ttl_seconds=10)
+            rows = store._db.execute("SELECT key FROM entries").fetchall()
+            self.assertEqual(rows, [("new",)])
+        finally:
+            store.close()
+
+    def test_account_cache_workers_share_lookups(self):
+        async def run_test():
+            fetch = AsyncMock(return_value=[{"_account_id": 7, "name": "Jane"}])
+            first_worker = AccountCache(store=self.store)
+            second_worker = AccountCache(store=SharedStore(self.path))
+
+            await first_worker.resolve(HOST, [7], fetch)
+            resolved = await second_worker.resolve(HOST, [7], fetch)
+
+            self.assertEqual(resolved[7]["name"], "Jane")
+            fetch.assert_awaited_once()
+            second_worker.store.close()
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TestPrivateDirectory(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.env = patch.dict(os.environ, {"XDG_RUNTIME_DIR": self.tmp_dir.name})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.tmp_dir.cleanup()
+
+    def test_directory_is_only_accessible_to_the_user(self):
+        path = private_directory("bulk")
+        root = os.path.join(self.tmp_dir.name, "gerrit-mcp-server")
+        self.assertEqual(path, os.path.join(root, "bulk"))
+        self.assertEqual(os.stat(root).st_mode & 0o777, 0o700)
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o700)
+
+    def test_directory_others_can_access_is_refused(self):
+        root = os.path.join(self.tmp_dir.name, "gerrit-mcp-server")
+        os.makedirs(root)
+        os.chmod(root, 0o777)
+        with self.assertRaises(PermissionError):
+            private_directory()
+
+    def test_symlinked_directory_is_refused(self):
+        target = os.path.join(self.tmp_dir.name, "elsewhere")
+        os.makedirs(target, mode=0o700)
+        os.symlink(target, os.path.join(self.tmp_dir.name, "gerrit-mcp-server"))
+        with self.assertRaises(PermissionError):
+            private_directory()
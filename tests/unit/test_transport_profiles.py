@@ -0,0 +1,124 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for the transport_profiles module.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gerrit_mcp_server import gerrit_auth
+from gerrit_mcp_server.transport_profiles import TransportProfiles, host_key, profiles_for
+
+
+class TestTransportProfiles(unittest.TestCase):
+
+    def test_host_key(self):
+        """Tests that URLs of the same host map to the same key."""
+        for url in (
+            "https://fuchsia-review.googlesource.com",
+            "https://fuchsia-review.googlesource.com/",
+            "http://fuchsia-review.googlesource.com/a",
+            "fuchsia-review.googlesource.com/a/",
+        ):
+            self.assertEqual(host_key(url), "fuchsia-review.googlesource.com")
+
+    @patch("gerrit_mcp_server.gerrit_auth._get_auth_for_http_basic", wraps=gerrit_auth._get_auth_for_http_basic)
+    def test_profiles_are_compiled_once_per_config(self, mock_get_auth):
+        """Tests that repeated requests reuse the compiled profile."""
+        config = {
+            "gerrit_hosts": [
+                {
+                    "internal_url": "https://my-gerrit.corp.com/",
+                    "external_url": "https://my-gerrit.com/",
+                    "authentication": {"type": "http_basic", "username": "u", "auth_token": "t"},
+                }
+            ]
+        }
+        for url in ("https://my-gerrit.com", "https://my-gerrit.com/a", "my-gerrit.corp.com"):
+            command = profiles_for(config).get(url).command(url)
+            self.assertEqual(command, ["curl", "--user", "u:t", "-L"])
+        mock_get_auth.assert_called_once()
+
+    def test_invalid_host_only_fails_its_own_requests(self):
+        """Tests that a misconfigured host does not break requests to other hosts."""
+        profiles = TransportProfiles(
+            {
+                "gerrit_hosts": [
+                    {"external_url": "https://broken.com", "authentication": {"type": "http_basic"}},
+                    {"external_url": "https://fine.com", "authentication": {"type": "gob_curl"}},
+                ]
+            }
+        )
+        self.assertEqual(profiles.get("https://fine.com").command("https://fine.com"), ["gob-curl", "-s"])
+        with self.assertRaisesRegex(ValueError, "both 'username' and 'auth_token'"):
+            profiles.get("https://broken.com").command("https://broken.com")
+
+    def test_first_listed_host_wins(self):
+        """Tests that a URL listed twice resolves to the first host, as before."""
+        profiles = TransportProfiles(
+            {
+                "gerrit_hosts": [
+                    {"external_url": "https://dup.com", "authentication": {"type": "gob_curl"}},
+                    {
+                        "external_url": "https://dup.com",
+                        "authentication": {"type": "http_basic", "username": "u", "auth_token": "t"},
+                    },
+                ]
+            }
+        )
+        self.assertEqual(profiles.get("https://dup.com").auth_type, "gob_curl")
+
+    def test_gitcookies_are_reread_only_when_the_file_changes(self):
+        """Tests that the cookie file is cached until it is modified."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "gitcookies")
+            with open(path, "w") as f:
+                f.write("my-gerrit.com\tFALSE\t/\tTRUE\t2147483647\to\tgit-old\n")
+            profiles = TransportProfiles(
+                {
+                    "gerrit_hosts": [
+                        {
+                            "external_url": "https://my-gerrit.com",
+                            "authentication": {"type": "git_cookies", "gitcookies_path": path},
+                        }
+                    ]
+                }
+            )
+            profile = profiles.get("https://my-gerrit.com")
+            with patch(
+                "gerrit_mcp_server.gerrit_auth._get_auth_for_gitcookies",
+                wraps=gerrit_auth._get_auth_for_gitcookies,
+            ) as mock_get_auth:
+                self.assertEqual(profile.command("https://my-gerrit.com")[2], "o=git-old")
+                self.assertEqual(profile.command("https://my-gerrit.com/a")[2], "o=git-old")
+                self.assertEqual(mock_get_auth.call_count, 1)
+
+                with open(path, "w") as f:
+                    f.write("my-gerrit.com\tFALSE\t/\tTRUE\t2147483647\to\tgit-refreshed\n")
+                os.utime(path, ns=(0, 1))
+                self.assertEqual(profile.command("https://my-gerrit.com")[2], "o=git-refreshed")
+                self.assertEqual(mock_get_auth.call_count, 2)
+
+    def test_unknown_host_raises_error(self):
+        """Tests that a URL outside the configuration is rejected."""
+        with self.assertRaisesRegex(ValueError, "No configured Gerrit host found"):
+            TransportProfiles({"gerrit_hosts": []}).get("https://elsewhere.com")
+
+
+if __name__ == "__main__":
+    unittest.main()